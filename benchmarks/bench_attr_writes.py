@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark: the cost of reporting attribute assignments to the sections counting them (see AttrVersionMixin), for
+making nodes and for assigning node attributes, vs a plain dataclass without the hook.
+
+Usage:
+
+    python benchmarks/bench_attr_writes.py [--nodes 100000] [--repeat 3]
+
+Run from the repository root with candejar installed (or on PYTHONPATH).
+"""
+
+import argparse
+from dataclasses import dataclass
+
+from candejar.candeobj.candeseq import NodesSection
+from candejar.candeobj.parts import Node
+
+from bench_msh_import import best_time
+
+
+@dataclass
+class PlainNode:
+    num: int
+    x: float
+    y: float
+    master: Node = None
+
+
+def assign_x(nodes):
+    for node in nodes:
+        node.x = 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    n = args.nodes
+
+    plain_init = best_time(lambda: [PlainNode(num, 0.0, 0.0) for num in range(n)], args.repeat)
+    node_init = best_time(lambda: [Node(num=num, x=0.0, y=0.0) for num in range(n)], args.repeat)
+    columns = dict(num=range(n), x=[0.0] * n, y=[0.0] * n)
+    bulk = best_time(lambda: NodesSection.from_columns(columns), args.repeat)
+
+    plain = [PlainNode(num, 0.0, 0.0) for num in range(n)]
+    nodes = [Node(num=num, x=0.0, y=0.0) for num in range(n)]
+    plain_write = best_time(lambda: assign_x(plain), args.repeat)
+    free_write = best_time(lambda: assign_x(nodes), args.repeat)
+    section = NodesSection.from_trusted(nodes)
+    start = best_time(lambda: NodesSection.from_trusted(nodes).attr_versions(("x",)), args.repeat)
+    section.attr_versions(("x",))
+    held_write = best_time(lambda: assign_x(section), args.repeat)
+
+    print(f"{n} nodes (per node):")
+    print(f"  plain dataclass init:            {plain_init / n * 1e6:8.2f} us")
+    print(f"  Node init:                       {node_init / n * 1e6:8.2f} us")
+    print(f"  NodesSection.from_columns:       {bulk / n * 1e6:8.2f} us")
+    print(f"  section starts counting:         {start / n * 1e6:8.2f} us")
+    print(f"  plain dataclass write:           {plain_write / n * 1e9:8.0f} ns")
+    print(f"  Node write (no section counting):{free_write / n * 1e9:8.0f} ns")
+    print(f"  Node write (section counting):   {held_write / n * 1e9:8.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
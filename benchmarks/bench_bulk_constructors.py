@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark: making sections one item at a time (the converter) vs the from_records, from_columns and from_trusted
+bulk constructors.
+
+Usage:
+
+    python benchmarks/bench_bulk_constructors.py [--records 100000] [--repeat 3]
+
+Run from the repository root with candejar installed (or on PYTHONPATH).
+"""
+
+import argparse
+
+from candejar.candeobj.candeseq import NodesSection, ElementsSection
+
+from bench_msh_import import best_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    n = args.records
+
+    node_records = [dict(num=num, x=float(num), y=0.0) for num in range(1, n + 1)]
+    element_records = [dict(num=num, i=num, j=num + 1, k=num + 2, l=num + 3, mat=1, step=1) for num in range(1, n + 1)]
+    node_columns = {k: [r[k] for r in node_records] for k in node_records[0]}
+    element_columns = {k: [r[k] for r in element_records] for k in element_records[0]}
+    for name, cls, records, columns in (("nodes", NodesSection, node_records, node_columns),
+                                        ("elements", ElementsSection, element_records, element_columns)):
+        converted = best_time(lambda: cls(records), args.repeat)
+        from_records = best_time(lambda: cls.from_records(records), args.repeat)
+        from_columns = best_time(lambda: cls.from_columns(columns), args.repeat)
+        items = list(cls.from_columns(columns))
+        from_trusted = best_time(lambda: cls.from_trusted(items), args.repeat)
+        print(f"{n} {name}:")
+        print(f"  converter:    {converted:8.3f} s")
+        print(f"  from_records: {from_records:8.3f} s ({converted / from_records:.1f}x)")
+        print(f"  from_columns: {from_columns:8.3f} s ({converted / from_columns:.1f}x)")
+        print(f"  from_trusted: {from_trusted:8.3f} s (items already made)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark: normalizing points to x,y coordinates one at a time with get_xy vs all at once with get_xy_many, and
+drawing a long dxdy chain.
+
+Usage:
+
+    python benchmarks/bench_coords.py [--points 100000] [--repeat 3]
+
+Run from the repository root with candejar installed (or on PYTHONPATH).
+"""
+
+import argparse
+
+import numpy as np
+
+from candejar.candeobj.parts import Node
+from candejar.geometry import draw, get_xy, get_xy_many
+
+from bench_msh_import import best_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    xy = np.random.default_rng(0).uniform(-100.0, 100.0, (args.points, 2))
+    inputs = dict(pairs=[tuple(p) for p in xy.tolist()],
+                  nodes=[Node(num=n, x=x, y=y) for n, (x, y) in enumerate(xy.tolist(), 1)],
+                  mappings=[dict(x=x, y=y) for x, y in xy.tolist()])
+    print(f"{args.points} points:")
+    for name, points in inputs.items():
+        one_by_one = best_time(lambda: np.array([get_xy(p) for p in points]), args.repeat)
+        many = best_time(lambda: get_xy_many(points), args.repeat)
+        assert (get_xy_many(points) == xy).all()
+        print(f"  {name + ':':10} get_xy {one_by_one:8.3f} s, get_xy_many {many:8.3f} s ({one_by_one / many:.1f}x)")
+    drawn = best_time(lambda: list(draw((0.0, 0.0), dxdy=inputs["pairs"])), args.repeat)
+    print(f"  draw with {args.points} steps: {drawn:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark: finding the elements using nodes and the neighbors of elements by scanning the section vs from the
+incidence.
+
+Usage:
+
+    python benchmarks/bench_incidence.py [--nodes 100000] [--queries 100] [--repeat 3]
+
+Run from the repository root with candejar installed (or on PYTHONPATH).
+"""
+
+import argparse
+import random
+
+from candejar import select
+from candejar.candeobj import incidence
+
+from bench_msh_import import best_time
+from bench_section_geometry import grid_sections
+
+
+def scan_by_nodes(elements, nums):
+    nums = set(nums)
+    return [e for e in elements if nums.intersection((e.i, e.j, e.k, e.l))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    elements = grid_sections(args.nodes)
+    rng = random.Random(0)
+    queries = [[rng.randint(1, len(elements.nodes))] for _ in range(args.queries)]
+    scanned = best_time(lambda: [scan_by_nodes(elements, q) for q in queries], 1)
+
+    def build():
+        elements.touch()
+        return incidence.section_incidence(elements)
+
+    built = best_time(build, args.repeat)
+    indexed = best_time(lambda: [list(select.by_nodes(elements, q)) for q in queries], args.repeat)
+    assert [list(select.by_nodes(elements, q)) for q in queries] == [scan_by_nodes(elements, q) for q in queries]
+    neighbors = best_time(lambda: [select.index_by_neighbors(elements, [q[0] % len(elements)]) for q in queries],
+                          args.repeat)
+    print(f"{len(elements)} elements, {args.queries} single node queries:")
+    print(f"  scans:               {scanned:8.3f} s")
+    print(f"  incidence, built:    {built:8.3f} s")
+    print(f"  by_nodes:            {indexed:8.4f} s ({scanned / indexed:.0f}x)")
+    print(f"  index_by_neighbors:  {neighbors:8.4f} s")
+
+
+if __name__ == "__main__":
+    main()
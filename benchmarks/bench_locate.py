@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark: locating the elements containing many points, testing each point against the element polygons with
+shapely vs the cached grid of an elements section.
+
+Usage:
+
+    python benchmarks/bench_locate.py [--nodes 40000] [--points 10000] [--repeat 3] [--skip-shapely]
+
+Run from the repository root with candejar installed (or on PYTHONPATH). The shapely version tests the points against
+an STRtree of the polygons one at a time.
+"""
+
+import argparse
+import warnings
+
+import numpy as np
+import shapely.geometry as geo
+from shapely.strtree import STRtree
+
+from bench_msh_import import best_time
+from bench_section_geometry import grid_sections
+
+
+def locate_shapely(polygons, points):
+    """The index of the first polygon containing each point (or -1), one point at a time."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        tree = STRtree(polygons)
+    index = {id(polygon): n for n, polygon in enumerate(polygons)}
+    result = []
+    for point in map(geo.Point, points):
+        # shapely 2.0 queries give indexes instead of the geometries
+        hits = [int(hit) if isinstance(hit, (int, np.integer)) else index[id(hit)] for hit in tree.query(point)]
+        result.append(min((n for n in hits if polygons[n].intersects(point)), default=-1))
+    return np.array(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--nodes", type=int, default=40_000)
+    parser.add_argument("--points", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-shapely", action="store_true")
+    args = parser.parse_args()
+
+    elements = grid_sections(args.nodes)
+    side = np.sqrt(args.nodes)
+    points = np.random.default_rng(0).uniform(-1.0, side, (args.points, 2))
+
+    def rebuilt():
+        elements.touch()
+        elements.locate(points)
+
+    arrays = best_time(rebuilt, args.repeat)
+    cached = best_time(lambda: elements.locate(points), args.repeat)
+    weights = best_time(lambda: elements.locate(points, weights=True), args.repeat)
+    result = elements.locate(points)
+    print(f"{args.points} points in {len(elements)} elements ({(result >= 0).sum()} located):")
+    print(f"  arrays (faces and grid made):    {arrays:8.3f} s")
+    print(f"  arrays (cached grid):            {cached:8.3f} s")
+    print(f"  with weights:                    {weights:8.3f} s")
+    if not args.skip_shapely:
+        polygons = [geo.Polygon(part) for part in elements.geometry().parts()]
+        shapely_time = best_time(lambda: locate_shapely(polygons, points), 1)
+        assert (locate_shapely(polygons, points) == result).all()
+        print(f"  shapely STRtree:                 {shapely_time:8.3f} s ({shapely_time / cached:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
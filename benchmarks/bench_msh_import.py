@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark: CandeObj.add_from_msh vs the bulk CandeObj.add_msh_sections on a large generated .msh file.
+
+Usage:
+
+    python benchmarks/bench_msh_import.py [--nodes 100000] [--repeat 3]
+
+Run from the repository root with candejar installed (or on PYTHONPATH).
+"""
+
+import argparse
+import math
+import tempfile
+import time
+from pathlib import Path
+
+from candejar.candeobj.candeobj import CandeObj
+
+
+def grid_msh_text(n_nodes: int) -> str:
+    """A .msh file for a square grid of quads with about n_nodes nodes."""
+    side = max(2, int(math.sqrt(n_nodes)))
+    nodes = [f"{r * side + c + 1}    {c:.2f}    {r:.2f}" for r in range(side) for c in range(side)]
+    elements = []
+    for r in range(side - 1):
+        for c in range(side - 1):
+            i = r * side + c + 1
+            elements.append(f"{len(elements) + 1}    {i}    {i + 1}    {i + side + 1}    {i + side}")
+    boundaries = [f"{n + 1}    {n + 1}" for n in range(side)]
+    return "\n".join(["# nodes", str(len(nodes)), *nodes,
+                      "# elements", str(len(elements)), *elements,
+                      "# boundaries", str(len(boundaries)), *boundaries, ""])
+
+
+def best_time(f, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "grid.msh"
+        path.write_text(grid_msh_text(args.nodes))
+        per_item = best_time(lambda: CandeObj().add_from_msh(path, name="grid"), args.repeat)
+        bulk = best_time(lambda: CandeObj().add_msh_sections(path, names=["grid"]), args.repeat)
+        c = CandeObj()
+        c.add_msh_sections(path, names=["grid"])
+        print(f"{len(c.nodes)} nodes, {len(c.elements)} elements, {len(c.boundaries)} boundaries")
+    print(f"add_from_msh:     {per_item:8.3f} s")
+    print(f"add_msh_sections: {bulk:8.3f} s")
+    print(f"speedup:          {per_item / bulk:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark: capturing the points of a layer polyline with the segments of a path (iter_oriented_line_pt_idx), point by
+point with shapely vs the array version.
+
+Usage:
+
+    python benchmarks/bench_orient_line.py [--points 10000] [--repeat 3] [--skip-shapely]
+
+Run from the repository root with candejar installed (or on PYTHONPATH). The shapely version (the original one, kept
+below) checks every point x segment pair in Python; it takes minutes for 10k points.
+"""
+
+import argparse
+from typing import DefaultDict, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+import shapely.geometry as geo
+
+from candejar.geometry import ops
+from candejar.geometry.exc import GeometryError
+from candejar.geometry.ops import String_or_Ring
+
+from bench_msh_import import best_time
+
+
+def iter_oriented_line_pt_idx_shapely(to_orient: String_or_Ring, path: String_or_Ring,
+                                      buffer: Optional[float] = None) -> Iterator[int]:
+    """The original point by point (shapely) version of iter_oriented_line_pt_idx, to compare against."""
+    if buffer is None:
+        buffer = 0
+    else:
+        buffer = float(buffer)
+    if isinstance(to_orient, (geo.LineString, geo.LinearRing)):
+        if not to_orient.is_simple:
+            raise GeometryError("simple linear objects are required for orientation")
+    else:
+        raise GeometryError("a line like geometry object is required")
+
+    # the path will decide the resulting line index order
+    coords_to_orient = list(to_orient.coords)
+    points_to_orient = geo.MultiPoint(coords_to_orient)
+    path_segments = geo.MultiLineString(list(ops.iter_segments(path)))
+    if len(path_segments)==0:
+        raise GeometryError("failed to break path into segments")
+
+    # sorting dictionaries
+    lpdx_to_sdx_dict: DefaultDict[int,Set[int]] = DefaultDict(set)
+    lpdx_to_min_dist_dict: Dict[int,float] = dict()
+    sdx_to_lpdx_dict: Dict[int, List[int]] = DefaultDict(list)
+
+    if to_orient.is_closed:
+        # handle ring-like line
+        repeated_point = points_to_orient[0]
+        # get the capturing segment
+        min_distance_to_repeated_point = min(repeated_point.distance(seg) for seg in path_segments)
+        # if the repeated ring end point is NOT captured, ignore; otherwise this needs handling
+        if min_distance_to_repeated_point<=buffer:
+            # repeated point is captured - needs handling
+            p_second, p_second_to_last = points_to_orient[1], points_to_orient[-2]
+            # get min distances for second and second-to-last points (are separate points since the line is simple)
+            d_second = min(p_second.distance(seg) for seg in path_segments)
+            d_second_to_last = min(p_second_to_last.distance(seg) for seg in path_segments)
+            # at least one of the two neighboring points to the repeated ring end point must be captured
+            captured_dict = {1: d_second<=buffer, -2: d_second_to_last<=buffer}
+            if True in captured_dict.values():
+                if captured_dict[1] and captured_dict[-2]:
+                    # both neighbors captured; discard both ring end points (they aren't needed)
+                    points_to_orient = geo.MultiPoint(points_to_orient[1:-1])
+                elif captured_dict[1]:
+                    # only pdx==1 captured, discard last line point
+                    points_to_orient = geo.MultiPoint(points_to_orient[:-1])
+                elif captured_dict[-2]:
+                    # only pdx==-2 captured, discard first line point
+                    points_to_orient = geo.MultiPoint(points_to_orient[1:])
+            else:
+                raise GeometryError("invalid path given to orient the ring-like line; path must capture a neighbor "
+                                    "of the repeated ring end points")
+
+    # for adjusting final index results later
+    try:
+        lpdx_adjustment: int = {True:1,False:0}[captured_dict[-2]]
+    except NameError:
+        lpdx_adjustment = 0
+
+    # point capture algorithm
+    lpdx: int
+    lp: geo.Point
+    for (lpdx,lp) in enumerate(points_to_orient):
+        seg: geo.LineString
+        # match line point indexes with path segment indexes
+        for sdx, seg in enumerate(path_segments):
+            d: float = lp.distance(seg)
+            # associate each line point index with path segment indexes within the buffer
+            if d<=lpdx_to_min_dist_dict.get(lpdx,buffer):
+                if d<lpdx_to_min_dist_dict.get(lpdx, buffer):
+                    # keep only the closest path segment
+                    lpdx_to_sdx_dict[lpdx].clear()
+                lpdx_to_min_dist_dict[lpdx]=d
+                lpdx_to_sdx_dict[lpdx].add(sdx)
+        # point may fall on multiple segments
+        try:
+            # the Jacqueline Rule: the first segment in the series captures the point
+            closest_sdx = min(lpdx_to_sdx_dict[lpdx])
+        except ValueError:
+            # un-captured lp (lp not within buffer for any segments)
+            pass
+        else:
+            # captured lp
+            sdx_to_lpdx_dict[closest_sdx].append(lpdx)
+    del lpdx,lp
+    sdx_to_lpdx_sorted = dict(sorted(sdx_to_lpdx_dict.items()))
+    # now have a 1 to 1 relationship for segments and points (but may be multiple points per segment)
+    lpdx_bag: List[int]
+    if all(len(lpdx_bag)==1 for lpdx_bag in sdx_to_lpdx_sorted.values()):
+        # ALL 1 to 1
+        yield from (lpdx for (lpdx,) in sdx_to_lpdx_sorted.values())
+    else:
+        # some not 1 to 1
+        sdx: int
+        for sdx, lpdx_bag in sdx_to_lpdx_sorted.items():
+            if len(lpdx_bag)==1:
+                # 1 to 1
+                yield lpdx_bag[0]+lpdx_adjustment
+            else:
+                # not 1 to 1; iterate based on distance to first segment point
+                dist_lpdx_sub_list: List[Tuple[float,int]] = []
+                seg_point = geo.Point(path_segments[sdx].coords[0])
+                lpdx: int
+                for lpdx in lpdx_bag:
+                    d = seg_point.distance(points_to_orient[lpdx])
+                    dist_lpdx_sub_list.append((d,lpdx))
+                dist_lpdx_sub_list_sorted = sorted(dist_lpdx_sub_list)
+                yield from (lpdx+lpdx_adjustment for _,lpdx in dist_lpdx_sub_list_sorted)
+
+
+def layer_polylines(n_points: int):
+    """A wavy layer polyline with n_points points, and a path along it with about half as many (different) points."""
+    x = np.linspace(0.0, 1000.0, n_points)
+    y = 10.0 * np.sin(x / 50.0)
+    line = geo.LineString(np.column_stack((x, y)))
+    path_x = np.linspace(-1.0, 1001.0, n_points // 2)
+    path = geo.LineString(np.column_stack((path_x, 10.0 * np.sin(path_x / 50.0))))
+    return line, path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--points", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-shapely", action="store_true")
+    args = parser.parse_args()
+
+    line, path = layer_polylines(args.points)
+    buffer = 0.05
+    arrays = best_time(lambda: list(ops.iter_oriented_line_pt_idx(line, path, buffer)), args.repeat)
+    result = list(ops.iter_oriented_line_pt_idx(line, path, buffer))
+    print(f"{args.points} line points, {len(path.coords) - 1} path segments ({len(result)} captured):")
+    print(f"  arrays:  {arrays:8.3f} s")
+    if not args.skip_shapely:
+        shapely_time = best_time(lambda: list(iter_oriented_line_pt_idx_shapely(line, path, buffer)), 1)
+        assert list(iter_oriented_line_pt_idx_shapely(line, path, buffer)) == result
+        print(f"  shapely: {shapely_time:8.3f} s ({shapely_time / arrays:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
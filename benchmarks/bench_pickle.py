@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark: pickling a large CandeObj per member object vs in packed form (protocol 4 and protocol 5 out-of-band).
+
+Usage:
+
+    python benchmarks/bench_pickle.py [--nodes 100000] [--repeat 3]
+
+Run from the repository root with candejar installed (or on PYTHONPATH).
+"""
+
+import argparse
+import pickle
+import tempfile
+from pathlib import Path
+
+from candejar.candeobj import packing
+from candejar.candeobj.candeobj import CandeObj, SECTION_KINDS
+
+from bench_msh_import import grid_msh_text, best_time
+
+
+def per_object(c: CandeObj):
+    """The sections as plain lists of member objects (how they were pickled before packing)."""
+    return {kind: {k: list(list.__iter__(s)) for k, s in getattr(c, kind).seq_map.items()} for kind in SECTION_KINDS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "grid.msh"
+        path.write_text(grid_msh_text(args.nodes))
+        c = CandeObj()
+        c.add_msh_sections(path, names=["grid"])
+    c.prepare()
+    print(f"{len(c.nodes)} nodes, {len(c.elements)} elements, {len(c.boundaries)} boundaries")
+
+    plain = per_object(c)
+    results = dict()
+    data = pickle.dumps(plain, protocol=4)
+    results["per object"] = (best_time(lambda: pickle.dumps(plain, protocol=4), args.repeat),
+                             best_time(lambda: pickle.loads(data), args.repeat), len(data))
+    data = pickle.dumps(c, protocol=4)
+    results["packed (protocol 4)"] = (best_time(lambda: pickle.dumps(c, protocol=4), args.repeat),
+                                      best_time(lambda: pickle.loads(data), args.repeat), len(data))
+    data, buffers = packing.dumps(c)
+    results["packed (protocol 5, out-of-band)"] = (best_time(lambda: packing.dumps(c), args.repeat),
+                                                   best_time(lambda: packing.loads(data, buffers), args.repeat),
+                                                   len(data) + sum(b.raw().nbytes for b in buffers))
+    print(f"{'':34}{'dump s':>10}{'load s':>10}{'MB':>10}")
+    for name, (dump, load, size) in results.items():
+        print(f"{name:34}{dump:10.3f}{load:10.3f}{size / 1e6:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark: the shapely geometry of an elements section made item by item vs from the array based section geometry.
+
+Usage:
+
+    python benchmarks/bench_section_geometry.py [--nodes 40000] [--repeat 3]
+
+Run from the repository root with candejar installed (or on PYTHONPATH).
+"""
+
+import argparse
+import math
+
+import shapely.geometry as geo
+
+from candejar.candeobj import meshgeo
+from candejar.candeobj.candeseq import NodesSection, ElementsSection
+from candejar.utilities.mixins import GeoInterface
+
+from bench_msh_import import best_time
+
+
+def grid_sections(n_nodes: int) -> ElementsSection:
+    """An elements section for a square grid of quads with about n_nodes nodes."""
+    side = max(2, int(math.sqrt(n_nodes)))
+    nodes = NodesSection.from_columns(dict(num=list(range(1, side * side + 1)),
+                                           x=[float(n % side) for n in range(side * side)],
+                                           y=[float(n // side) for n in range(side * side)]))
+    corners = [r * side + c + 1 for r in range(side - 1) for c in range(side - 1)]
+    elements = ElementsSection.from_columns(dict(num=list(range(1, len(corners) + 1)), i=corners,
+                                                 j=[i + 1 for i in corners], k=[i + side + 1 for i in corners],
+                                                 l=[i + side for i in corners]))
+    elements.nodes = nodes
+    return elements
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--nodes", type=int, default=40_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    elements = grid_sections(args.nodes)
+    legacy = GeoInterface("MultiPolygon")
+    item_by_item = best_time(lambda: geo.shape(legacy.__get__(elements, ElementsSection)), args.repeat)
+
+    def rebuilt():
+        elements.touch()
+        meshgeo.shape(elements)
+
+    arrays = best_time(rebuilt, args.repeat)
+    cached = best_time(lambda: meshgeo.shape(elements), args.repeat)
+    print(f"{len(elements)} elements:")
+    print(f"  item by item: {item_by_item:8.3f} s")
+    print(f"  arrays:       {arrays:8.3f} s ({item_by_item / arrays:.1f}x)")
+    print(f"  cached:       {cached:8.6f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark: selecting elements by step and material with a scan of the section for each value vs the cached attribute
+indexes.
+
+Usage:
+
+    python benchmarks/bench_select_attr.py [--elements 100000] [--repeat 3]
+
+Run from the repository root with candejar installed (or on PYTHONPATH).
+"""
+
+import argparse
+import random
+
+from candejar import select
+from candejar.candeobj.candeseq import ElementsSection
+
+from bench_msh_import import best_time
+
+
+def scan(elements, x, attr):
+    """The way by_sliceable_attr used to work: a scan of the section for each value."""
+    values = [x] if isinstance(x, int) else range(len(elements) + 1)[x]
+    return [e for v in values for e in select.by_filter(elements, function=lambda e: select.by_equal_attr(e, attr, v))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--elements", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    elements = ElementsSection.from_columns(dict(num=list(range(1, args.elements + 1)), i=[1] * args.elements,
+                                                 j=[2] * args.elements, k=[3] * args.elements,
+                                                 mat=[rng.randint(1, 10) for _ in range(args.elements)],
+                                                 step=[rng.randint(1, 40) for _ in range(args.elements)]))
+    print(f"{len(elements)} elements:")
+    for name, f, x, attr in (("steps 1-20", select.by_step, slice(1, 21), "step"),
+                             ("material 3", select.by_material, 3, "mat")):
+        scanned = best_time(lambda: scan(elements, x, attr), 1)
+
+        def first():
+            elements.touch()
+            return list(f(elements, x))
+
+        first_time = best_time(first, args.repeat)
+        repeated = best_time(lambda: list(f(elements, x)), args.repeat)
+        assert list(f(elements, x)) == scan(elements, x, attr)
+        print(f"  {name}: scan {scanned:8.3f} s, first {first_time:8.3f} s, repeated {repeated:8.4f} s "
+              f"({scanned / repeated:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark: selecting elements by material, step range, and zone with chained select functions vs a query.
+
+Usage:
+
+    python benchmarks/bench_select_query.py [--elements 100000] [--repeat 3]
+
+Run from the repository root with candejar installed (or on PYTHONPATH).
+"""
+
+import argparse
+import random
+
+import shapely.geometry as geo
+
+from candejar import select
+from candejar.candeobj import meshgeo
+
+from bench_msh_import import best_time
+from bench_section_geometry import grid_sections
+
+
+def chained(elements, zone):
+    """The select functions one after the other, each making a copy."""
+    selection = select.copy(elements, select.by_material, 3)
+    selection = select.copy(selection, select.by_step, slice(1, 5))
+    return list(select.by_shape(selection, zone))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--elements", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    elements = grid_sections(args.elements)
+    rng = random.Random(0)
+    for e in elements:
+        e.mat, e.step = rng.randint(1, 5), rng.randint(1, 10)
+    side = geo.MultiPoint(meshgeo.node_xy(elements.nodes)).bounds[2]
+    zone = geo.Point(side / 2, side / 2).buffer(side / 4)
+    query = select.query(elements).where(mat=3, step=slice(1, 5)).within(zone)
+    chain_time = best_time(lambda: chained(elements, zone), args.repeat)
+
+    def first():
+        elements.touch()
+        return list(query)
+
+    first_time = best_time(first, args.repeat)
+    repeated = best_time(lambda: list(query), args.repeat)
+    # by_step groups the selection by step; the query keeps the section order
+    assert list(query) == sorted(chained(elements, zone), key=lambda e: e.num)
+    print(f"{len(elements)} elements ({query.count()} selected):")
+    print(f"  chained select functions: {chain_time:8.3f} s")
+    print(f"  query, first:             {first_time:8.3f} s ({chain_time / first_time:.1f}x)")
+    print(f"  query, repeated:          {repeated:8.4f} s ({chain_time / repeated:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark: selecting the elements of a section inside of a zone polygon with select.by_shape, checking each element
+polygon with shapely vs the cached representative points and their index.
+
+Usage:
+
+    python benchmarks/bench_select_shape.py [--elements 100000] [--repeat 3]
+
+Run from the repository root with candejar installed (or on PYTHONPATH).
+"""
+
+import argparse
+
+import shapely.geometry as geo
+
+from candejar import select
+from candejar.candeobj import meshgeo
+
+from bench_msh_import import best_time
+from bench_section_geometry import grid_sections
+
+
+def shapely_by_shape(elements, zone):
+    """The way by_shape used to work: the representative point of each element polygon checked with shapely."""
+    shapes = meshgeo.shape(elements).geoms
+    return [e for e, e_geo in zip(elements, shapes) if zone.contains(e_geo.representative_point())]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--elements", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    elements = grid_sections(args.elements)
+    side = geo.MultiPoint(meshgeo.node_xy(elements.nodes)).bounds[2]
+    zone = geo.Point(side / 2, side / 2).buffer(side / 4)
+    one_by_one = best_time(lambda: shapely_by_shape(elements, zone), 1)
+
+    def first():
+        elements.touch()
+        return list(select.by_shape(elements, zone))
+
+    first_time = best_time(first, args.repeat)
+    repeated = best_time(lambda: list(select.by_shape(elements, zone)), args.repeat)
+    indexes = best_time(lambda: select.index_by_shape(elements, zone), args.repeat)
+    selection = list(select.by_shape(elements, zone))
+    assert selection == shapely_by_shape(elements, zone)
+    print(f"{len(elements)} elements ({len(selection)} selected):")
+    print(f"  shapely, element by element: {one_by_one:8.3f} s")
+    print(f"  by_shape, first selection:   {first_time:8.3f} s ({one_by_one / first_time:.0f}x)")
+    print(f"  by_shape, repeated:          {repeated:8.3f} s ({one_by_one / repeated:.0f}x)")
+    print(f"  index_by_shape, repeated:    {indexes:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
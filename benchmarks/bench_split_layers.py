@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark: splitting a soil region into layer bands with split_layers vs calling splitLR for each layer and piece.
+
+Usage:
+
+    python benchmarks/bench_split_layers.py [--layers 30] [--points 40] [--repeat 3]
+
+Run from the repository root with candejar installed (or on PYTHONPATH).
+"""
+
+import argparse
+from typing import List
+
+import numpy as np
+import shapely.geometry as geo
+import shapely.ops as ops
+
+from candejar.geometry import splitLR, split_layers
+
+from bench_msh_import import best_time
+
+
+def layer_lines(n_layers: int, n_points: int) -> List[geo.LineString]:
+    """Wavy, non-crossing layer lines across a 200 x (12 * n_layers) region, ordered bottom to top."""
+    # the lines have vertices where they cross the sides of the region (as drawn layers usually do)
+    x = np.concatenate(([-150.0], np.linspace(-100.0, 100.0, n_points - 2), [150.0]))
+    return [geo.LineString(np.column_stack((x, np.round(12.0 * (k + 1) + 3.0 * np.sin(x / 20.0 + k), 2))))
+            for k in range(n_layers)]
+
+
+def split_loop(region: geo.Polygon, layers: List[geo.LineString]) -> List[geo.MultiPolygon]:
+    """The iterative way: split the pieces above the previous layer with each layer."""
+    pieces = [region]
+    bands = []
+    for layer in layers:
+        lhs, rhs = [], []
+        for piece in pieces:
+            layer = ops.snap(layer, piece, 0.1)
+            left, right = splitLR(piece, layer)
+            lhs.extend(left.geoms)
+            rhs.extend(right.geoms)
+        pieces = lhs
+        bands.append(geo.MultiPolygon(rhs))
+    bands.append(geo.MultiPolygon(pieces))
+    return bands
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--layers", type=int, default=30)
+    parser.add_argument("--points", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    region = geo.box(-100.0, 0.0, 100.0, 12.0 * (args.layers + 1))
+    layers = layer_lines(args.layers, args.points)
+    loop = best_time(lambda: split_loop(region, layers), args.repeat)
+    sweep = best_time(lambda: split_layers(region, layers, snap_tolerance=0.1), args.repeat)
+    for a, b in zip(split_loop(region, layers), split_layers(region, layers, snap_tolerance=0.1)):
+        assert a.symmetric_difference(b).area < 1e-6
+    print(f"{args.layers} layers of {args.points} points:")
+    print(f"  splitLR loop: {loop:8.3f} s")
+    print(f"  split_layers: {sweep:8.3f} s ({loop / sweep:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
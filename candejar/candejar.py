@@ -1,3 +1,200 @@
 # -*- coding: utf-8 -*-
 
-"""Main cande object module"""
+"""Main cande object module
+
+Also provides the `candejar` command line interface. Usage example:
+
+    candejar batch prepare ./models/*.cid --workers 8 --output-dir ./prepared --report timings.json
+
+Each input (.cid or .cidl3) is opened, optionally assembled with .msh files (--msh, added as sections named for the
+file stems), prepared, and saved as a .cid file. The files are processed in a process pool; a failure only affects its
+own file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Optional, Sequence, List, Dict, Any, Iterable, Callable, TextIO
+
+from . import cande
+
+
+@dataclass
+class BatchResult:
+    """The outcome of processing a single input file."""
+    path: str
+    output: Optional[str] = None
+    ok: bool = False
+    error: Optional[str] = None
+    traceback: Optional[str] = None
+    seconds: float = 0.0
+    timings: Dict[str, float] = field(default_factory=dict)  # seconds for each step (open, assemble, prepare, save)
+    stages: Dict[str, float] = field(default_factory=dict)  # seconds for each prepare stage
+
+
+def output_path(path: Path, output_dir: Optional[Path] = None, suffix: str = "_prepared") -> Path:
+    """The .cid path the prepared model is saved to."""
+    return (output_dir if output_dir is not None else path.parent) / f"{path.stem}{suffix}.cid"
+
+
+def prepare_file(path: str, output: str, msh_files: Sequence[str] = (), overwrite: bool = False) -> BatchResult:
+    """Open → assemble → prepare → save a single model. Errors are recorded on the result instead of raised."""
+    result = BatchResult(path=path, output=output)
+    start = time.perf_counter()
+    step = "open"
+    try:
+        step_start = time.perf_counter()
+        cande_obj = cande.open(path)
+        result.timings[step] = time.perf_counter() - step_start
+
+        if msh_files:
+            step = "assemble"
+            step_start = time.perf_counter()
+            cande_obj.add_msh_sections(*msh_files, names=[Path(f).stem for f in msh_files])
+            result.timings[step] = time.perf_counter() - step_start
+
+        step = "prepare"
+        step_start = time.perf_counter()
+        with cande_obj.instrument() as recorder:
+            cande_obj.prepare()
+        result.timings[step] = time.perf_counter() - step_start
+        result.stages = recorder.totals()
+
+        step = "save"
+        step_start = time.perf_counter()
+        cande_obj.save(output, mode="w" if overwrite else "x")
+        result.timings[step] = time.perf_counter() - step_start
+    except Exception as e:
+        result.error = f"{step} failed: {type(e).__qualname__}: {e!s}"
+        result.traceback = traceback.format_exc()
+    else:
+        result.ok = True
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def expand_inputs(patterns: Iterable[str]) -> List[str]:
+    """Expands glob patterns (for shells that don't), keeping the order and dropping repeats."""
+    paths: Dict[str, None] = dict()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        paths.update(dict.fromkeys(matches))
+    return list(paths)
+
+
+def run_batch(paths: Sequence[str], *, workers: Optional[int] = None, output_dir: Optional[Path] = None,
+              suffix: str = "_prepared", msh_files: Sequence[str] = (), overwrite: bool = False,
+              progress: Optional[Callable[[int, int, BatchResult], Any]] = None) -> List[BatchResult]:
+    """Prepare all of the model files, using a process pool when more than one worker is requested.
+
+    The progress callable is called with (completed count, total count, result) as each file completes. The results
+    are returned in the order of the paths.
+    """
+    jobs = [(path, str(output_path(Path(path), output_dir, suffix)), tuple(msh_files), overwrite) for path in paths]
+    results: Dict[int, BatchResult] = dict()
+
+    def completed(idx: int, result: BatchResult):
+        results[idx] = result
+        if progress is not None:
+            progress(len(results), len(jobs), result)
+
+    if workers == 1:
+        for idx, job in enumerate(jobs):
+            completed(idx, prepare_file(*job))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(prepare_file, *job): idx for idx, job in enumerate(jobs)}
+            for future in as_completed(futures):
+                idx = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # the worker process itself failed (e.g. it was killed)
+                    result = BatchResult(path=jobs[idx][0], output=jobs[idx][1],
+                                         error=f"worker failed: {type(e).__qualname__}: {e!s}")
+                completed(idx, result)
+    return [results[idx] for idx in range(len(jobs))]
+
+
+def batch_report(results: Sequence[BatchResult], seconds: float, workers: Optional[int]) -> Dict[str, Any]:
+    """A JSON compatible report of the batch results and timings."""
+    ok = [result for result in results if result.ok]
+    totals: Dict[str, float] = dict()
+    for result in ok:
+        for step, step_seconds in result.timings.items():
+            totals[step] = totals.get(step, 0.0) + step_seconds
+    return dict(files=len(results), ok=len(ok), failed=len(results) - len(ok), workers=workers,
+                wall_seconds=seconds, total_seconds=sum(result.seconds for result in results), step_totals=totals,
+                results=[asdict(result) for result in results])
+
+
+def print_progress(stream: TextIO) -> Callable[[int, int, BatchResult], None]:
+    def progress(done: int, total: int, result: BatchResult) -> None:
+        status = "ok" if result.ok else "FAILED"
+        detail = f" ({result.error})" if result.error else ""
+        print(f"[{done}/{total}] {status} {result.path} {result.seconds:.2f} s{detail}", file=stream)
+    return progress
+
+
+def batch_prepare(args: argparse.Namespace) -> int:
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("no input files", file=sys.stderr)
+        return 2
+    if args.output_dir is not None:
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+    progress = None if args.quiet else print_progress(sys.stderr)
+    start = time.perf_counter()
+    results = run_batch(paths, workers=args.workers, output_dir=args.output_dir, suffix=args.suffix,
+                        msh_files=args.msh, overwrite=args.overwrite, progress=progress)
+    report = batch_report(results, time.perf_counter() - start, args.workers)
+    print(f"{report['ok']} of {report['files']} files prepared, {report['failed']} failed, "
+          f"{report['wall_seconds']:.2f} s", file=sys.stderr)
+    if args.report is not None:
+        args.report.write_text(json.dumps(report, indent=2))
+    return 1 if report["failed"] else 0
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="candejar", description="Tools for working with CANDE (.cid) files.")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+    batch = commands.add_parser("batch", help="process many model files")
+    batch_commands = batch.add_subparsers(dest="batch_command", metavar="batch_command")
+    batch_commands.required = True
+
+    prepare = batch_commands.add_parser("prepare", help="open, prepare, and save many models")
+    prepare.add_argument("inputs", nargs="+", help=".cid or .cidl3 files (glob patterns allowed)")
+    prepare.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                         help="number of worker processes (default: number of CPUs; 1 runs in this process)")
+    prepare.add_argument("-o", "--output-dir", type=Path, default=None,
+                         help="directory for the prepared .cid files (default: next to each input)")
+    prepare.add_argument("--suffix", default="_prepared", help="added to the input file stem for the output name")
+    prepare.add_argument("--msh", action="append", default=[], metavar="MSH_FILE",
+                         help="add the .msh file to every model as a section named for the file stem (repeatable)")
+    prepare.add_argument("--overwrite", action="store_true", help="overwrite existing output files")
+    prepare.add_argument("--report", type=Path, default=None, help="write a JSON report of the timings to this file")
+    prepare.add_argument("-q", "--quiet", action="store_true", help="don't print progress for each file")
+    prepare.set_defaults(func=batch_prepare)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = make_parser().parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        print("workers must be at least 1", file=sys.stderr)
+        return 2
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
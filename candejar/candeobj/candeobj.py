@@ -4,27 +4,35 @@
 
 from __future__ import annotations
 
-import operator
-from dataclasses import dataclass, InitVar, field
+import contextlib
+import copy
+from dataclasses import dataclass, InitVar, field, fields
 from pathlib import Path
 from typing import Union, Type, Optional, Iterable, ClassVar, MutableMapping, Sequence, TypeVar, NamedTuple, Dict, List, \
-    Counter, Any
+    Counter, Any, Callable, Iterator, Tuple
 import itertools
-import shapely.geometry as geo
+import numpy as np
 
-from . import exc
+from . import exc, meshgeo
 from .. import msh
 from .candeseq import cande_seq_dict, PipeGroups, Nodes, Elements, PipeElements, SoilElements, InterfElements, \
     Boundaries, Materials, SoilMaterials, InterfMaterials, CompositeMaterials, Factors, NodesSection, ElementsSection, BoundariesSection
 from .connections import MergedConnection, InterfaceConnection, LinkConnection, CompositeConnection, Connection, Connections, Tolerance
-from .nummap import NumMapsManager
+from .incidence import MeshIncidence, mesh_incidence
+from .instrumentation import NULL_RECORDER, NullRecorder, PrepareRecorder, StageRecord
+from .nummap import NumMapsManager, NumMap
+from .packing import pack_cande_obj, unpack_cande_obj
+from .prepared import PreparedState
 from ..cid import CidLine
 from ..cidrw import CidLineStr
+from ..geometry.coords import get_xy_many
+from ..geometry.mesh import drop_repeats, outer_edges
 from .parts import Node
+from .parts.level3 import ElementCategory
 from ..cidobjrw.cidrwabc import CidRW
 from ..cidobjrw.cidobj import CidObj
 from ..utilities.mapping_tools import shallow_mapify
-from ..utilities.skip import skippable_len, SkipInt
+from ..utilities.skip import skippable_len, iter_skippable, SkipInt, skip_version_key
 
 T = TypeVar("T", bound="TotalDef")
 
@@ -108,8 +116,63 @@ class SectionNameSet:
         return name
 
 
+def section_attr_max(seq: Sequence, attrs: Sequence[str]) -> int:
+    """The maximum value of the attributes over the members of a section (0 for empty sections); cached when possible."""
+    attrs = tuple(attrs)
+
+    def compute(section):
+        return max(itertools.chain([0], (getattr(obj, attr) for obj in section for attr in attrs)))
+
+    try:
+        cached = seq.cached
+    except AttributeError:
+        return compute(seq)
+    # iteration skips members with a Skip num
+    return cached(("max", attrs), compute, attrs=(*attrs, skip_version_key("num")))
+
+
+def section_attr_counts(seq: Sequence, attr: str) -> Counter[Any]:
+    """A count of the attribute values over the members of a section; cached when possible."""
+
+    def compute(section):
+        return Counter[Any](getattr(obj, attr) for obj in section)
+
+    try:
+        cached = seq.cached
+    except AttributeError:
+        return compute(seq)
+    return cached(("counts", attr), compute, attrs=(attr, skip_version_key("num")))
+
+
 CandeObjChild = TypeVar("CandeObjChild", bound="CandeObj")
 
+# the CandeObj map sequences holding sections that can be shared between forks
+SECTION_KINDS = ("nodes", "elements", "boundaries")
+# the small CandeObj lists that are copied by snapshots
+SNAPSHOT_LISTS = ("pipegroups", "soilmaterials", "interfmaterials", "compositematerials", "factors")
+SNAPSHOT_COPIED = (*SECTION_KINDS, *SNAPSHOT_LISTS, "connections")
+
+
+def share_section(section: Sequence, holder: Any) -> None:
+    """Register a model or snapshot holding a shared section (see ConvertingList.share)."""
+    share = getattr(section, "share", None)
+    if share is not None:
+        share(holder)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """The state of a CandeObj recorded by CandeObj.snapshot()."""
+    values: Dict[str, Any]  # the top level field values
+    sections: Dict[str, Dict[Any, Sequence]]  # the section maps of the nodes, elements, and boundaries
+    lists: Dict[str, Any]  # copies of the pipe groups, materials and factors
+    connections: List[Tuple[Connection, Sequence[Node]]]
+    prepared_state: Optional[PreparedState]
+
+    def holds(self, section: Sequence) -> bool:
+        """Whether the section is one of the recorded sections (see ConvertingList.share)."""
+        return any(s is section for seq_map in self.sections.values() for s in seq_map.values())
+
 
 @dataclass
 class CandeObj(CidRW):
@@ -152,6 +215,9 @@ class CandeObj(CidRW):
     name: InitVar[Optional[str]] = None
     section_names: ClassVar[set] = SectionNameSet()
 
+    # records the prepare stages; replaced by a PrepareRecorder inside of the instrument context
+    _recorder: ClassVar[Union[NullRecorder, PrepareRecorder]] = NULL_RECORDER
+
     # additional sub object iterable properties
     @property
     def pipeelements(self):
@@ -177,7 +243,7 @@ class CandeObj(CidRW):
                                      factors=self.factors)
 
         for k, v in cande_list_seq_kwargs.items():
-            cande_sub_seq = v if isinstance(v, cande_seq_dict[k]) else cande_seq_dict[k](v)
+            cande_sub_seq = v if isinstance(v, cande_seq_dict[k]) else cande_seq_dict[k].from_records(v)
             setattr(self, k, cande_sub_seq)
 
         cande_map_seq_kwargs = dict(nodes=self.nodes, elements=self.elements, boundaries=self.boundaries)
@@ -233,14 +299,69 @@ class CandeObj(CidRW):
                 if new_nodes_seq:
                     seq_obj[section_name].nodes = self.nodes[section_name]
 
-    def add_standard_boundaries(self, name: Optional[str] = None, nodes: Optional[Iterable] = None, *, step: int = 1):
+    def add_msh_sections(self, *files: Union[str, Path], names: Optional[Sequence[Optional[str]]] = None,
+                         transform: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+                         node_offset: int = 0) -> List[str]:
+        """Adds the nodes, elements and boundaries of each .msh file as a new section, returning the section names.
+
+        Unlike add_from_msh, the file text is read straight into arrays and the section items are made in bulk.
+
+        The optional transform is called with the (n, 2) array of the node coordinates of each file and returns the
+        transformed (n, 2) array. The node_offset is added to the node numbers, and all references to them, in each
+        file. Section names can be provided for each file (None for an auto name).
+        """
+        if names is None:
+            names = [None] * len(files)
+        if len(names) != len(files):
+            raise ValueError(f"{len(names)!s} section names were provided for {len(files)!s} files")
+        section_names = []
+        for file, name in zip(files, names):
+            section_name = type(self).section_names.handle_section_name(self, name)
+            msh_arrays = msh.open_arrays(file)
+            nodes_arr, elements_arr, boundaries_arr = (getattr(msh_arrays, attr) for attr in
+                                                       "nodes elements boundaries".split())
+            new_nodes = None
+            if len(nodes_arr):
+                xy = nodes_arr[:, 1:]
+                if transform is not None:
+                    xy = np.asarray(transform(xy), dtype=float)
+                    if xy.shape != (len(nodes_arr), 2):
+                        raise exc.CandeValueError(f"transform must return a ({len(nodes_arr)!s}, 2) array, not "
+                                                  f"{xy.shape!r}")
+                num = nodes_arr[:, 0].astype(np.int64) + node_offset
+                self.nodes[section_name] = NodesSection.from_columns(dict(num=num.tolist(), x=xy[:, 0].tolist(),
+                                                                          y=xy[:, 1].tolist()))
+                new_nodes = self.nodes[section_name]
+            if len(elements_arr):
+                refs = elements_arr[:, 1:]
+                refs = np.where(refs != 0, refs + node_offset, 0)
+                columns = dict(num=elements_arr[:, 0].tolist(), **dict(zip("ijkl", refs.T.tolist())))
+                self.elements[section_name] = ElementsSection.from_columns(columns)
+                if new_nodes is not None:
+                    self.elements[section_name].nodes = new_nodes
+            if len(boundaries_arr):
+                columns = dict(num=boundaries_arr[:, 0].tolist(), node=(boundaries_arr[:, 1] + node_offset).tolist())
+                self.boundaries[section_name] = BoundariesSection.from_columns(columns)
+                if new_nodes is not None:
+                    self.boundaries[section_name].nodes = new_nodes
+            section_names.append(section_name)
+        return section_names
+
+    def add_standard_boundaries(self, name: Optional[str] = None, nodes: Optional[Iterable] = None, *, step: int = 1,
+                                tol: Optional[Union[float, Tolerance]] = None, extents: str = "box"):
         """Creates a new section of standard boundaries. The nodes section can either be provided, or an existing nodes
         section referenced by name (the same name as the new boundaries section). However it is not required that the
         new boundaries section name match the nodes section name (pass a reference to an existing nodes section name
         to the nodes argument in this case).
 
-        The problem boundary extents are assumed to be rectangular. The max and min X coordinates, and the min Y
-        coordinate, define the boundaries.
+        The extents argument decides how the problem boundary extents are found:
+
+            "box": the extents are assumed to be rectangular. The max and min X coordinates, and the min Y coordinate,
+                   define the boundaries. Nodes within the tolerance (in model units) of these coordinates
+                   are restrained; without a tolerance the coordinates must match exactly.
+            "outline": the extents are the outer boundary edges of the soil elements referencing the nodes section.
+                   Nodes on edges facing sideways are restrained in X, and nodes on edges facing downward in Y. Edges
+                   facing upward (and around holes in the mesh) are free.
 
         NOTE: if a new nodes section is created it is NOT added to the nodes sections automatically! This needs to be
         done separately. Might change this later?
@@ -248,6 +369,8 @@ class CandeObj(CidRW):
 
         if name is not None and nodes is None:
             raise TypeError("bad argument combination")
+        if extents not in ("box", "outline"):
+            raise ValueError(f"extents must be 'box' or 'outline', not {extents!r}")
 
         # resolve the node section to be referenced by new boundaries section
         existing_nodes = None
@@ -273,26 +396,53 @@ class CandeObj(CidRW):
         else:
             section_nodes = nodes
 
-        # add new boundaries section
-        self.boundaries[section_name] = list()
+        # build the defining boundaries info
+        node_list = list(section_nodes)
+        if extents == "box":
+            xcode, ycode = self._box_extents_codes(node_list, tol)
+        else:
+            xcode, ycode = self._outline_extents_codes(node_list, section_nodes)
+
+        # add the correct nodes to the new boundary section
+        node_idx, = np.nonzero(xcode | ycode)
+        records = [dict(node=node, xcode=x, ycode=y, step=step)
+                   for node, x, y in zip((node_idx + 1).tolist(), xcode[node_idx].tolist(), ycode[node_idx].tolist())]
+        self.boundaries[section_name] = records
         self.boundaries[section_name].nodes = section_nodes
 
-        # build the defining boundaries info
-        node_seq = self.boundaries[section_name].nodes
-        y_min = min(node_seq, key=operator.attrgetter("y")).y
-        x_min = min(node_seq, key=operator.attrgetter("x")).x
-        x_max = max(node_seq, key=operator.attrgetter("x")).x
-
-        # find and add the correct nodes to the new boundary section
-        for num, n in enumerate(node_seq, 1):
-            d = dict()
-            if n.x in (x_max, x_min):
-                d.update(node=num, xcode=1)
-            if n.y in (y_min,):
-                d.update(node=num, ycode=1)
-            if d:
-                d.update(step=step)
-                self.boundaries[section_name].append(d)
+    @staticmethod
+    def _box_extents_codes(node_list: Sequence[Node], tol: Optional[Union[float, Tolerance]]) -> Tuple[np.ndarray, np.ndarray]:
+        """The x and y restraint codes (as arrays) for nodes on the max/min X and min Y extents."""
+        # exact matching unless a tolerance is given
+        tol = 0.0 if tol is None else float(tol)
+        x, y = get_xy_many(node_list).T
+        if not len(node_list):
+            return x.astype(int), y.astype(int)
+        xcode = (np.abs(x - x.min()) <= tol) | (np.abs(x - x.max()) <= tol)
+        ycode = np.abs(y - y.min()) <= tol
+        return xcode.astype(int), ycode.astype(int)
+
+    def _outline_extents_codes(self, node_list: Sequence[Node], section_nodes: Sequence[Node]
+                               ) -> Tuple[np.ndarray, np.ndarray]:
+        """The x and y restraint codes (as arrays) for nodes on the outer boundary edges of the soil elements."""
+        node_idx = {n.num: idx for idx, n in enumerate(node_list)}
+        faces = [[node_idx[num] if num else -1 for num in (e.i, e.j, e.k, e.l)]
+                 for seq in self.elements.seq_map.values() if seq.nodes is section_nodes
+                 for e in seq if e.category is ElementCategory.SOIL]
+        # triangles can be stored with repeated node numbers (e.g. k == l); their zero length edges have no normal
+        faces = drop_repeats(np.array(faces, dtype=np.intp).reshape(-1, 4))
+        faces = faces[faces[:, 2] >= 0]
+        if not len(faces):
+            raise ValueError("no soil elements reference the nodes section")
+        xy = get_xy_many(node_list)
+        edges, normals = outer_edges(faces, xy)
+        nx, ny = np.abs(normals[:, 0]), normals[:, 1]
+        side, bottom = nx > np.abs(ny), (ny < 0) & (-ny >= nx)
+        xcode = np.zeros(len(node_list), dtype=int)
+        ycode = np.zeros(len(node_list), dtype=int)
+        xcode[edges[side].ravel()] = 1
+        ycode[edges[bottom].ravel()] = 1
+        return xcode, ycode
 
     def update_totals(self):
         """Computes the total number of relevant objects for all object types contained in CandeObj. The length of the
@@ -308,6 +458,8 @@ class CandeObj(CidRW):
             - interfmaterials: referenced in interfelements
             - steps*: referenced in elements and boundaries
         * steps is unique; if not in LRFD method, then the length of the factors sequence is ignored for computation
+
+        Per-section results are cached until the section changes (see `ConvertingList.cached`).
         """
         # top level totals
         total_def: TotalDef
@@ -317,24 +469,34 @@ class CandeObj(CidRW):
             attr_max = 0
             for seq_obj, sub_attrs in ((getattr(self, ch), [sub] if isinstance(sub, str) else sub)
                                          for ch, sub in total_def.attr_dict.items()):
-                attr_max = max(itertools.chain([attr_max], (getattr(sub_obj, sub_attr) for sub_obj in seq_obj for sub_attr in sub_attrs)))
+                attr_max = max(itertools.chain([attr_max], (section_attr_max(seq, sub_attrs)
+                                                            for seq in seq_obj.seq_map.values())))
             setattr(self, total_def.total_name, max(attr_len, attr_max))
 
         # pipe group totals
-        num_ctr = Counter[int](e.mat for e in self.pipeelements)
+        num_ctr = Counter[int]()
+        for seq in self.pipeelements.seq_map.values():
+            num_ctr.update(section_attr_counts(seq, "mat"))
         for group_num, group in enumerate(self.pipegroups, 1):
             group.num = num_ctr[group_num]
 
     def merge_nodes(self, *nodes, converter: Dict[int, int]):
         pass
 
-    def globalize_node_references(self, converter: NumMapsManager):
+    def globalize_node_references(self, converter: Union[NumMapsManager, Dict[int, NumMap]],
+                                  sections: Optional[Iterable[Union[ElementsSection, BoundariesSection]]] = None):
         """Re-numbers all node numbers, and references to them, based on current global node order.
 
         Repeated node numbers in element k and l fields are removed.
+
+        Optionally, only the element and boundary sections provided are re-numbered.
         """
+        section_ids = None if sections is None else {id(seq) for seq in sections}
+
         # remove repeats and reassign i,j,k,l numbers
         for seq in self.elements.seq_map.values():
+            if section_ids is not None and id(seq) not in section_ids:
+                continue
             nodes_id = id(seq.nodes)
             sub_map = converter[nodes_id]
             for element in seq:
@@ -345,17 +507,21 @@ class CandeObj(CidRW):
                     # skip zero entries
                     if old:
                         new = sub_map[old].num
-                        setattr(element, attr, new)
+                        if new != old:
+                            setattr(element, attr, new)
 
         # reassign boundary.node numbers
         for seq in self.boundaries.seq_map.values():
+            if section_ids is not None and id(seq) not in section_ids:
+                continue
             nodes_id = id(seq.nodes)
             sub_map = converter[nodes_id]
             for boundary in seq:
                 # TODO: relocate below routine to method on Boundary class
                 old = boundary.node
                 new = sub_map[old].num
-                boundary.node = new
+                if new != old:
+                    boundary.node = new
 
     def globalize_node_nums(self):
         """Re-numbers node num attributes based on master/slave relationships."""
@@ -364,15 +530,191 @@ class CandeObj(CidRW):
             if node.master:
                 node.num = node.master.num
 
-    def globalize_element_nums(self):
-        """Re-numbers all element numbers based on current global element order."""
+    def globalize_element_nums(self, sections: Optional[Iterable[ElementsSection]] = None):
+        """Re-numbers all element numbers based on current global element order.
+
+        Optionally, only the element sections provided are re-numbered (the other sections are still counted).
+        """
         start = 1
+        section_ids = None if sections is None else {id(seq) for seq in sections}
 
         # reset element.num attribute
-        element_ctr = itertools.count(start)
         for seq in self.elements.seq_map.values():
-            for element, num in zip(seq, element_ctr):
-                element.num = num
+            if section_ids is None or id(seq) in section_ids:
+                for element, num in zip(seq, itertools.count(start)):
+                    if element.num != num:
+                        element.num = num
+            start += skippable_len(seq)
+
+    def _own_renumbered_elements(self) -> None:
+        """Replace the shared element sections whose global element numbers change with private copies (see
+        globalize_element_nums); the others stay shared."""
+        shared = self.__dict__.get("_shared_sections")
+        if not shared:
+            return
+        names = []
+        start = 1
+        for key, seq in self.elements.seq_map.items():
+            if id(seq) in shared and any(element.num != num for element, num in zip(seq, itertools.count(start))):
+                names.append(key)
+            start += skippable_len(seq)
+        if names:
+            self._own_shared("elements", names=names)
+
+    def __reduce_ex__(self, protocol):
+        """Pickled in packed form: one array per member attribute of each section (see the packing module).
+
+        Sharing with forks and snapshots is not pickled; the unpickled object owns all of its sections.
+        """
+        return unpack_cande_obj, (pack_cande_obj(self, SECTION_KINDS, excluded=("_shared_sections", "_recorder")),)
+
+    def __copy__(self: CandeObjChild) -> CandeObjChild:
+        # a shallow copy; the packed form used for pickling would copy everything
+        new = object.__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        return new
+
+    def holds(self, section: Sequence) -> bool:
+        """Whether the section is one of the nodes, elements or boundaries sections (see ConvertingList.share)."""
+        return any(s is section for kind in SECTION_KINDS for s in getattr(self, kind).seq_map.values())
+
+    def fork(self: CandeObjChild) -> CandeObjChild:
+        """A new CandeObj sharing the nodes, elements and boundaries sections of this one. Everything else is copied.
+
+        Shared sections can't be changed in place (list mutations or changes to the members raise an error while both
+        objects hold the section); use own_section() first, in either object. Adding, removing or replacing whole
+        sections needs no special care. prepare() makes private copies of any shared sections it would change.
+        """
+        new = copy.copy(self)
+        new.__dict__.pop("_recorder", None)
+        sections = {id(section): section for kind in SECTION_KINDS for section in getattr(self, kind).seq_map.values()}
+        self.__dict__.setdefault("_shared_sections", dict()).update(sections)
+        new._shared_sections = sections
+        for kind in SECTION_KINDS:
+            seq_obj = getattr(self, kind)
+            setattr(new, kind, type(seq_obj)(dict(seq_obj.seq_map)))
+        for name in SNAPSHOT_LISTS:
+            setattr(new, name, copy.deepcopy(getattr(self, name)))
+        new.connections = type(self.connections)(copy.copy(conn) for conn in self.connections)
+        for section in sections.values():
+            share_section(section, self)
+            share_section(section, new)
+        return new
+
+    def own_section(self, kind: str, name: Any) -> Union[NodesSection, ElementsSection, BoundariesSection]:
+        """Make the named nodes, elements or boundaries section private to this object (copying it if it is shared with
+        a fork or a snapshot), and return it.
+
+        Owning a shared nodes section also copies the shared element and boundary sections that reference it. Members
+        taken from the section before it was copied still belong to the shared section.
+        """
+        if kind not in SECTION_KINDS:
+            raise exc.CandeValueError(f"kind must be one of {', '.join(SECTION_KINDS)}, not {kind!r}")
+        section = getattr(self, kind)[name]
+        if id(section) in self.__dict__.get("_shared_sections", ()):
+            self._own_shared(kind, names=[name])
+            section = getattr(self, kind)[name]
+        return section
+
+    def _own_shared(self, *kinds: str, names: Optional[Iterable[Any]] = None) -> None:
+        """Replace shared sections of the kinds (all kinds by default) with private copies; optionally only the named
+        sections. Shared element and boundary sections referencing copied nodes sections are also copied."""
+        shared = self.__dict__.get("_shared_sections")
+        if not shared:
+            return
+        kinds = kinds or SECTION_KINDS
+        names = None if names is None else set(names)
+        node_map: Dict[int, Node] = dict()
+        nodes_map: Dict[int, NodesSection] = dict()
+        for kind in SECTION_KINDS:
+            seq_map = getattr(self, kind).seq_map
+            for key, section in list(seq_map.items()):
+                old_nodes = getattr(section, "nodes", None)
+                remap_nodes = id(old_nodes) in nodes_map
+                if not remap_nodes and (kind not in kinds or names is not None and key not in names):
+                    continue
+                if id(section) in shared:
+                    new = type(section)(copy.copy(item) for item in iter_skippable(section))
+                    new.__dict__.update(getattr(section, "__dict__", dict()))
+                    if kind == "nodes":
+                        nodes_map[id(section)] = new
+                        node_map.update(zip(map(id, iter_skippable(section)), iter_skippable(new)))
+                    seq_map[key] = new
+                    del shared[id(section)]
+                    section = new
+                if remap_nodes:
+                    section.nodes = nodes_map[id(old_nodes)]
+        if node_map:
+            for node in node_map.values():
+                # the copies are new, so bypass attribute version counting
+                node_dict = vars(node)
+                if node.master is not None:
+                    node_dict["master"] = node_map.get(id(node.master), node.master)
+                if "slaves" in node_dict:
+                    node_dict["slaves"] = [node_map.get(id(slave), slave) for slave in node_dict["slaves"]]
+            for conn in self.connections:
+                conn.items = [node_map.get(id(item), item) for item in conn.items]
+
+    def snapshot(self) -> Snapshot:
+        """Record the current state so it can be brought back with restore().
+
+        The sections are not copied: they become shared with the snapshot (see fork()) and can't be changed in place
+        while the snapshot is alive; they are copied one at a time when they are first owned for changing. The small
+        pipe group, materials, factors and connections lists are copied.
+        """
+        shared = self.__dict__.setdefault("_shared_sections", dict())
+        sections = {kind: dict(getattr(self, kind).seq_map) for kind in SECTION_KINDS}
+        for seq_map in sections.values():
+            shared.update((id(section), section) for section in seq_map.values())
+        snapshot = Snapshot(values={f.name: getattr(self, f.name) for f in fields(self) if f.name not in SNAPSHOT_COPIED},
+                            sections=sections,
+                            lists={name: copy.deepcopy(getattr(self, name)) for name in SNAPSHOT_LISTS},
+                            connections=[(conn, conn.items) for conn in self.connections],
+                            prepared_state=self.__dict__.get("_prepared_state"))
+        for seq_map in sections.values():
+            for section in seq_map.values():
+                share_section(section, self)
+                share_section(section, snapshot)
+        return snapshot
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """Return to the state recorded by snapshot(), by swapping the recorded sections back in. A snapshot can be
+        restored more than once."""
+        self._shared_sections = dict()
+        for kind, seq_map in snapshot.sections.items():
+            setattr(self, kind, type(getattr(self, kind))(dict(seq_map)))
+            self._shared_sections.update((id(section), section) for section in seq_map.values())
+            for section in seq_map.values():
+                share_section(section, self)
+        for name, value in snapshot.values.items():
+            setattr(self, name, value)
+        for name, value in snapshot.lists.items():
+            setattr(self, name, copy.deepcopy(value))
+        connections = type(self.connections)()
+        for conn, items in snapshot.connections:
+            conn = copy.copy(conn)
+            conn.items = items
+            connections.append(conn)
+        self.connections = connections
+        if snapshot.prepared_state is None:
+            self.__dict__.pop("_prepared_state", None)
+        else:
+            # the state stamps hold the section versions (and attribute counts), so any change is still detected
+            self._prepared_state = snapshot.prepared_state
+
+    def mark_dirty(self, *names: str) -> None:
+        """Mark the named nodes, elements and boundaries sections as changed so the next prepare() call handles them.
+
+        Changes to section membership are detected automatically. Use this after changing the members of a section in
+        place (e.g. reassigning element materials).
+        """
+        for name in names:
+            kinds = [kind for kind in SECTION_KINDS if name in getattr(self, kind).seq_map]
+            if not kinds:
+                raise exc.CandeKeyError(f"section name {name!r} does not exist")
+            for kind in kinds:
+                # shared sections are copied instead of changed
+                self.own_section(kind, name).touch()
 
     def mate_sections(self, *sections: ElementsSection, tol: Optional[Union[float, Tolerance]] = None):
         """Automatically populates the connections sequence with node merges when nodes from the sections are within the
@@ -387,21 +729,22 @@ class CandeObj(CidRW):
         buffer = tol if tol is not None else MergedConnection.tol
 
         nodes_sections: List[NodesSection]
-        nodes_sections = [s.nodes.copy() for s in sections]
+        nodes_sections = [s.nodes for s in sections]
 
         for curr_section_idx, curr_section in enumerate(nodes_sections):
-            curr_mp = geo.shape(curr_section)
+            # the section shapes are cached (see the meshgeo module)
+            curr_mp = meshgeo.shape(curr_section)
             # compare against the other sections
             compare_sections = (s for idx, s in enumerate(nodes_sections) if idx>curr_section_idx)
             for compare_section in compare_sections:
-                compare_mp = geo.shape(compare_section)
+                compare_mp = meshgeo.shape(compare_section)
                 for polygon in curr_mp.buffer(buffer).intersection(compare_mp.buffer(buffer)):
                     curr_nodes = list()
                     compare_nodes = list()
                     polygon_intersects = lambda point_node: polygon.intersects(point_node[0])
-                    for _, curr_node in filter(polygon_intersects, zip(curr_mp, curr_section)):
+                    for _, curr_node in filter(polygon_intersects, zip(curr_mp.geoms, curr_section)):
                         curr_nodes.append(curr_node)
-                    for _, compare_node in filter(polygon_intersects, zip(compare_mp, compare_section)):
+                    for _, compare_node in filter(polygon_intersects, zip(compare_mp.geoms, compare_section)):
                         compare_nodes.append(compare_node)
                     # only add a connection if nodes from both sides fell in the polygon
                     if curr_nodes and compare_nodes:
@@ -452,7 +795,28 @@ class CandeObj(CidRW):
                         raise exc.CandeValueError(f"Mat number {conn.mat!s} was not found in the {materials_attr} list: {str(mat_nums)[1:-1]}")
                 connection_elements.append(element_ns)
 
-    def prepare(self):
+    @contextlib.contextmanager
+    def instrument(self, *, allocations: bool = False,
+                   callback: Optional[Callable[[StageRecord], Any]] = None) -> Iterator[PrepareRecorder]:
+        """Record the stages of every prepare() call made inside of the context.
+
+        Each stage records wall time and the number of items handled. Set allocations to True to also record memory
+        allocation deltas (uses tracemalloc; much slower). The callback is called with each completed stage record.
+        """
+        recorder = PrepareRecorder(allocations=allocations, callback=callback)
+        previous = self.__dict__.get("_recorder")
+        self._recorder = recorder
+        recorder.start()
+        try:
+            yield recorder
+        finally:
+            recorder.stop()
+            if previous is None:
+                del self._recorder
+            else:
+                self._recorder = previous
+
+    def prepare(self, *, full: bool = False):
         """Make CANDE problem ready for saving. Affects all elements AND all boundaries.
 
             1. Moves interface sections to the back of the nodes map
@@ -461,17 +825,116 @@ class CandeObj(CidRW):
             4. Updates node numbers to global values
             5. Moves beam sections to the front of the elements map
             6. Updates all totals (nodes, elements, boundaries, soil/interf materials, pipe groups, steps)
+
+        After the first call, only the work affected by changes since the previous call is repeated: the node
+        numbering is kept unless the nodes sections or connections change (see the `prepared` module), and only the
+        changed element and boundary sections are re-numbered. Use full=True to force a complete pass.
+
+        Use the instrument() context manager to measure the individual stages.
         """
+        recorder = self._recorder
+        recorder.begin_run()
+
+        state: Optional[PreparedState] = None if full else self.__dict__.get("_prepared_state")
+        if state is None or not state.same_node_numbering(self):
+            # the full pass changes every section
+            self._own_shared()
+        if state is not None and state.same_node_numbering(self):
+            dirty_sections = [*state.dirty_elements(self), *state.dirty_boundaries(self)]
+            # node numbers are still global; only the changed sections need their node references globalized
+            with recorder.stage("globalize_node_references", count=lambda: sum(len(seq) for seq in dirty_sections)):
+                node_convert_map = {id(nodes): NumMap(nodes)
+                                    for nodes in {id(seq.nodes): seq.nodes for seq in dirty_sections}.values()}
+                self.globalize_node_references(node_convert_map, dirty_sections)
+        else:
+            state = None
+            self._prepare_nodes(recorder)
+
+        # move pipe element sequences to front of seq_map
+        with recorder.stage("order_pipe_sections", count=lambda: len(self.elements.seq_map)):
+            if self.elements:
+                seq_map_copy = self.elements.seq_map.copy()
+                self.elements.seq_map.clear()
+                tuple_map = dict(pipes = [], others = [])
+                for section_key, seq in seq_map_copy.items():
+                    key = "others"
+                    # if the first element is PIPE, assume all are
+                    if seq and seq[0].category.name=="PIPE":
+                        key = "pipes"
+                    tuple_map[key].append((section_key, seq))
+                self.elements.seq_map.update(itertools.chain(*tuple_map.values()))
+
+        # globalize element numbering
+        renumber_sections = None
+        if state is not None and state.same_element_layout(self):
+            renumber_sections = state.dirty_elements(self)
+        else:
+            self._own_renumbered_elements()
+        with recorder.stage("globalize_element_nums", count=lambda: len(self.elements)):
+            self.globalize_element_nums(renumber_sections)
+
+        # calculate and set the totals for all CANDE items
+        with recorder.stage("update_totals"):
+            self.update_totals()
+
+        self._prepared_state = PreparedState.capture(self)
+
+    def incidence(self) -> MeshIncidence:
+        """The incidence of the nodes with the elements and boundaries, and of the elements with the elements sharing
+        their edges, in global numbering (see the `incidence` module): node rows are node numbers less one, element and
+        boundary columns are indexes in the elements and boundaries sequences.
+
+        Requires a prepare() call after the last change to the node numbering or node references.
+        """
+        state: Optional[PreparedState] = self.__dict__.get("_prepared_state")
+        if state is None or not state.same_node_numbering(self) or state.dirty_elements(self) or \
+                state.dirty_boundaries(self):
+            raise exc.CandeValueError("the global incidence requires a prepared problem; call prepare() first")
+        cached = self.__dict__.get("_incidence")
+        if cached is not None and cached[0] is state:
+            return cached[1]
+        result = mesh_incidence(self.elements.seq_map.values(), self.boundaries.seq_map.values(), self.nnodes)
+        self._incidence = state, result
+        return result
+
+    def locate(self, points: Iterable, weights: bool = False) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """The index in the elements sequence of the element containing each of the points, or -1 for points outside of
+        the mesh; where elements overlap, the first one wins. Two node (e.g. pipe) elements are passed over, including
+        those in sections with soil elements.
+
+        If weights is true the (n, 4) interpolation weights of the i, j, k, and l nodes of the elements are returned too
+        (see ElementFaces.locate).
+        """
+        points = get_xy_many(points)
+        index = np.full(len(points), -1, dtype=np.intp)
+        result = np.full((len(points), 4), np.nan)
+        start = 0
+        for section in self.elements.seq_map.values():
+            remaining = np.flatnonzero(index < 0)
+            if len(remaining):
+                found = section.locate(points[remaining], weights)
+                if weights:
+                    found, found_weights = found
+                    result[remaining] = found_weights
+                index[remaining] = np.where(found >= 0, found + start, -1)
+            start += skippable_len(section)
+        return (index, result) if weights else index
+
+    def _prepare_nodes(self, recorder: Union[NullRecorder, PrepareRecorder]):
+        """The full node numbering part of prepare()."""
         # init conversion map: for keeps a copy of the original num attribute values in each section so original
         # values can be referred to later
-        node_convert_map = NumMapsManager(self.nodes)
+        with recorder.stage("num_maps", count=lambda: len(self.nodes)):
+            node_convert_map = NumMapsManager(self.nodes)
 
         # resolve CANDE problem node connections (merges, interfaces, links)
-        self.make_connections()
+        with recorder.stage("make_connections", count=lambda: len(self.connections)):
+            self.make_connections()
 
         if any(not conn.category.value for conn in self.connections):
             # re-number nodes after handling of merged nodes
-            node_convert_map.renumber()
+            with recorder.stage("renumber", count=lambda: len(self.nodes)):
+                node_convert_map.renumber()
 
         if any(conn.category.value for conn in self.connections):
             # incorporate connection elements into problem
@@ -481,26 +944,9 @@ class CandeObj(CidRW):
             self.elements[self.connections_key] = connection_elements
 
         # globalize node numbering
-        self.globalize_node_nums()
+        with recorder.stage("globalize_node_nums", count=lambda: len(self.nodes)):
+            self.globalize_node_nums()
 
         # globalize node references for elements and boundaries AND remove node num repeats from element k,l fields
-        self.globalize_node_references(node_convert_map)
-
-        # move pipe element sequences to front of seq_map
-        if self.elements:
-            seq_map_copy = self.elements.seq_map.copy()
-            self.elements.seq_map.clear()
-            tuple_map = dict(pipes = [], others = [])
-            for section_key, seq in seq_map_copy.items():
-                key = "others"
-                # if the first element is PIPE, assume all are
-                if seq and seq[0].category.name=="PIPE":
-                    key = "pipes"
-                tuple_map[key].append((section_key, seq))
-            self.elements.seq_map.update(itertools.chain(*tuple_map.values()))
-
-        # globalize element numbering
-        self.globalize_element_nums()
-
-        # calculate and set the totals for all CANDE items
-        self.update_totals()
+        with recorder.stage("globalize_node_references", count=lambda: len(self.elements) + len(self.boundaries)):
+            self.globalize_node_references(node_convert_map)
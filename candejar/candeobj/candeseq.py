@@ -2,6 +2,7 @@
 
 """All the top level Cande sequence objects"""
 
+from . import meshgeo
 from .candeseqbase import CandeSection, CandeList, CandeMapSequence
 from .parts import PipeGroup, Node, Element, Boundary, Material, Factor
 from ..utilities.mixins import GeoMixin
@@ -19,18 +20,34 @@ geo_type_lookup = dict(nodes="MultiPoint",
 
 
 class NodesSection(GeoMixin, SkipAttrIterMixin[Node], CandeSection[Node],
-                   converter=Node, geo_type=geo_type_lookup["nodes"]):
+                   converter=Node, geo_type=geo_type_lookup["nodes"], geo_builder=meshgeo.geo_interface):
     skippable_attr = "num"
 
+    def geometry(self) -> meshgeo.SectionGeometry:
+        """The cached array based geometry of the section (see the meshgeo module)."""
+        return meshgeo.nodes_geometry(self)
+
 
 class ElementsSection(GeoMixin, SkipAttrIterMixin[Element], CandeSection[Element],
-                      converter=Element, geo_type=geo_type_lookup["elements"]):
+                      converter=Element, geo_type=geo_type_lookup["elements"], geo_builder=meshgeo.geo_interface):
     skippable_attr = "num"
 
+    def geometry(self) -> meshgeo.SectionGeometry:
+        """The cached array based geometry of the section (see the meshgeo module)."""
+        return meshgeo.elements_geometry(self)
+
+    def locate(self, points, weights: bool = False):
+        """The index (in iteration order) of the element containing each of the points, or -1; optionally with the
+        interpolation weights of the element nodes (see ElementFaces.locate). Two node elements are passed over."""
+        return meshgeo.element_faces(self).locate(points, weights)
+
 
 class BoundariesSection(GeoMixin, CandeSection[Boundary], converter=Boundary,
-                        geo_type=geo_type_lookup["boundaries"]):
-    pass
+                        geo_type=geo_type_lookup["boundaries"], geo_builder=meshgeo.geo_interface):
+
+    def geometry(self) -> meshgeo.SectionGeometry:
+        """The cached array based geometry of the section (see the meshgeo module)."""
+        return meshgeo.boundaries_geometry(self)
 
 
 class MaterialsSection(SkipAttrIterMixin[Material], CandeList[Material],
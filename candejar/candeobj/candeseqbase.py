@@ -2,11 +2,14 @@
 
 """The interface for Cande sequence objects expected by the candeobj module."""
 
+import dataclasses
 import functools
 from typing import Callable, Any, Optional, TypeVar, overload, Iterable, \
     Sequence, Mapping
 
 from . import exc
+from .packing import packable, reduce_section
+from .parts.level3 import make_many
 from ..utilities.mapping_tools import shallow_mapify
 from ..utilities.collections import KeyedChainView, ConvertingList
 
@@ -36,11 +39,76 @@ class CandeList(ConvertingList[T]):
     def __repr__(self) -> str:
         return f"{type(self).__qualname__}({super().__repr__()})"
 
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, Sequence[Any]]):
+        """A new list with items made in bulk from columns of field values (see `make_many`), skipping the converter.
+
+        The columns are checked as a whole: they must all be the same length and include every required field. Any
+        other columns become extra item attributes.
+        """
+        item_type = cls.item_type
+        if not bulk_type(item_type):
+            raise exc.CandeTypeError(f"{cls.__qualname__} items can't be made in bulk")
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise exc.CandeValueError(f"{cls.__qualname__} columns must all be the same length")
+        return cls.from_trusted(make_many(item_type, columns))
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any]):
+        """A new list with items made in bulk from records (mappings, or objects that can be mapified).
+
+        Records are made in bulk with from_columns when the keys missing from any of them are fields with default
+        values; items that are all already of the item type are used as-is. Anything else is converted one item at a
+        time.
+        """
+        records = list(records)
+        item_type = cls.item_type
+        if item_type is not None and all(type(record) is item_type for record in records):
+            return cls.from_trusted(records)
+        if records and bulk_type(item_type):
+            maps = [shallow_mapify(record) for record in records]
+            keys = maps[0].keys()
+            if all(m.keys() == keys for m in maps):
+                return cls.from_columns({k: [m[k] for m in maps] for k in keys})
+            defaults = {f.name: f.default for f in dataclasses.fields(item_type) if f.default is not dataclasses.MISSING}
+            all_keys = dict.fromkeys(k for m in maps for k in m)
+            if all(k in defaults or all(k in m for m in maps) for k in all_keys):
+                return cls.from_columns({k: [m.get(k, defaults.get(k)) for m in maps] for k in all_keys})
+        return cls(records)
+
+
+def bulk_type(item_type: Optional[type]) -> bool:
+    """Whether items of the type can be made in bulk: dataclasses without a __post_init__."""
+    return item_type is not None and dataclasses.is_dataclass(item_type) and not hasattr(item_type, "__post_init__")
+
 
 class CandeSection(CandeList[T]):
-    """Parent class for all CANDE section objects"""
+    """Parent class for all CANDE section objects
+
+    Sections are pickled in packed form (one array per member attribute; see the packing module).
+    """
     __slots__ = ()
 
+    def __reduce_ex__(self, protocol):
+        if packable(self):
+            return reduce_section(self)
+        return super().__reduce_ex__(protocol)
+
+    def __copy__(self):
+        # a shallow copy; the packed form used for pickling would copy the members too
+        new = type(self).from_trusted(list.__iter__(self))
+        state, slots = self.__getstate__()
+        if state:
+            new.__dict__.update(state)
+        new._version = slots["_version"]
+        return new
+
+
+def make_seq(seq_type: type, v: Iterable[Any]) -> Sequence[Any]:
+    """Make a sub-sequence, in bulk when the sequence type supports it."""
+    return getattr(seq_type, "from_records", seq_type)(v)
+
 
 class CandeMapSequence(KeyedChainView[T]):
     """Extends KeyedChainView to utilize a specified type for the sub-sequences.
@@ -68,8 +136,9 @@ class CandeMapSequence(KeyedChainView[T]):
         if seq_map is None:
             seq_map = {}
         for k, v in seq_map.copy().items():
-            seq_map[k] = self.seq_type(v) if not isinstance(v, self.seq_type) else v
-        seq_map.update((k, v if isinstance(v, self.seq_type) else self.seq_type(v)) for k,v in kwargs.items())
+            seq_map[k] = make_seq(self.seq_type, v) if not isinstance(v, self.seq_type) else v
+        seq_map.update((k, v if isinstance(v, self.seq_type) else make_seq(self.seq_type, v))
+                       for k, v in kwargs.items())
         super().__init__(seq_map)
 
     @overload
@@ -86,5 +155,5 @@ class CandeMapSequence(KeyedChainView[T]):
 
     def __setitem__(self, x, v):
         if not (isinstance(x, slice) or isinstance(x, int)):
-            v = v if isinstance(v, self.seq_type) else self.seq_type(v)
+            v = v if isinstance(v, self.seq_type) else make_seq(self.seq_type, v)
         super().__setitem__(x, v)
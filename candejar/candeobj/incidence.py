@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+"""The node, element, and boundary incidence of the mesh sections as compressed sparse rows (see
+`geometry.mesh.Incidence`).
+
+Node rows are the node numbers less one: the positions in the nodes section of an elements or boundaries section
+(skipped nodes included), or the global node numbers less one after `CandeObj.prepare()`. Element and boundary columns
+are indexes in iteration order (skipped elements not counted).
+
+The incidence of a section is made in one pass over arrays of its node numbers, and is cached per section; it is made
+again after the section, or the node references or skip state of its members, change.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+import numpy as np
+
+from . import exc
+from ..geometry.exc import GeometryError
+from ..geometry.mesh import Incidence, incidence, face_neighbors
+from ..utilities.skip import skip_version_key
+
+
+class MeshIncidence(NamedTuple):
+    """The incidence of nodes with elements and boundaries, and of elements with the elements sharing their edges."""
+    node_elements: Incidence
+    node_boundaries: Incidence
+    element_neighbors: Incidence
+
+
+def _cached(section: Any, key: str, compute: Callable[[Any], Any], attrs: Iterable[str], extra: Any = None) -> Any:
+    """compute(section), cached by the section when it can detect changes to the named attributes of its members."""
+    cached = getattr(section, "cached", None)
+    if cached is None or not getattr(section, "tracks_attrs", False):
+        return compute(section)
+    return cached(("incidence", key), compute, attrs=attrs, extra=extra)
+
+
+def element_nodes(elements: Any) -> np.ndarray:
+    """The read-only (m, 4) array of the i, j, k, and l node numbers of an elements section (skipped elements
+    excluded)."""
+
+    def compute(section):
+        nums = np.array([(e.i, e.j, e.k, e.l) for e in section], dtype=np.intp).reshape(-1, 4)
+        nums.flags.writeable = False
+        return nums
+
+    skippable_attr = getattr(elements, "skippable_attr", "num")
+    return _cached(elements, "nodes", compute, ("i", "j", "k", "l", skip_version_key(skippable_attr)))
+
+
+def boundary_nodes(boundaries: Any) -> np.ndarray:
+    """The read-only array of the node numbers of a boundaries section."""
+
+    def compute(section):
+        nums = np.fromiter((b.node for b in section), dtype=np.intp)
+        nums.flags.writeable = False
+        return nums
+
+    return _cached(boundaries, "nodes", compute, ("node",))
+
+
+def _node_incidence(nums: np.ndarray, n_nodes: int) -> Incidence:
+    """The incidence of the nodes with the rows of an array of node numbers (0 for none)."""
+    nums = nums[:, None] if nums.ndim == 1 else nums
+    owners = np.broadcast_to(np.arange(len(nums))[:, None], nums.shape)
+    used = nums != 0
+    try:
+        return incidence(nums[used] - 1, owners[used], n_nodes)
+    except GeometryError as e:
+        raise exc.CandeValueError(f"node number out of range for {n_nodes} nodes") from e
+
+
+def _neighbors(nums: np.ndarray) -> Incidence:
+    # no k or l: a line with a single edge
+    try:
+        return face_neighbors(nums - 1)
+    except GeometryError as e:
+        raise exc.CandeValueError("elements require i and j node numbers, followed by any zero ones") from e
+
+
+def node_elements(elements: Any) -> Incidence:
+    """The incidence of the nodes of an elements section with its elements."""
+    n_nodes = len(elements.nodes)
+
+    def compute(section):
+        return _node_incidence(element_nodes(section), n_nodes)
+
+    skippable_attr = getattr(elements, "skippable_attr", "num")
+    return _cached(elements, "node_elements", compute, ("i", "j", "k", "l", skip_version_key(skippable_attr)),
+                   extra=n_nodes)
+
+
+def node_boundaries(boundaries: Any) -> Incidence:
+    """The incidence of the nodes of a boundaries section with its boundaries."""
+    n_nodes = len(boundaries.nodes)
+
+    def compute(section):
+        return _node_incidence(boundary_nodes(section), n_nodes)
+
+    return _cached(boundaries, "node_boundaries", compute, ("node",), extra=n_nodes)
+
+
+def element_neighbors(elements: Any) -> Incidence:
+    """The incidence of the elements of an elements section with the other elements sharing any of their edges."""
+
+    def compute(section):
+        return _neighbors(element_nodes(section))
+
+    skippable_attr = getattr(elements, "skippable_attr", "num")
+    return _cached(elements, "element_neighbors", compute, ("i", "j", "k", "l", skip_version_key(skippable_attr)))
+
+
+def section_incidence(elements: Any, boundaries: Optional[Any] = None) -> MeshIncidence:
+    """The incidence of an elements section (and of a boundaries section of the same nodes) in section numbering."""
+    if boundaries is None:
+        node_bounds = _node_incidence(np.empty(0, dtype=np.intp), len(elements.nodes))
+    elif boundaries.nodes is not elements.nodes:
+        raise exc.CandeValueError("the boundaries section must refer to the nodes section of the elements section")
+    else:
+        node_bounds = node_boundaries(boundaries)
+    return MeshIncidence(node_elements(elements), node_bounds, element_neighbors(elements))
+
+
+def mesh_incidence(elements_sections: Iterable[Any], boundaries_sections: Iterable[Any], n_nodes: int
+                   ) -> MeshIncidence:
+    """The incidence of all of the elements and boundaries sections of a problem in global numbering (the node
+    references of the sections must be global node numbers)."""
+    element_nums = [element_nodes(section) for section in elements_sections]
+    boundary_nums = [boundary_nodes(section) for section in boundaries_sections]
+    element_nums = np.concatenate(element_nums) if element_nums else np.empty((0, 4), dtype=np.intp)
+    boundary_nums = np.concatenate(boundary_nums) if boundary_nums else np.empty(0, dtype=np.intp)
+    return MeshIncidence(_node_incidence(element_nums, n_nodes), _node_incidence(boundary_nums, n_nodes),
+                         _neighbors(element_nums))
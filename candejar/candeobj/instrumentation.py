@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+"""Opt-in instrumentation of the `CandeObj.prepare` stages.
+
+Usage example:
+
+    with cande_obj.instrument(allocations=True) as recorder:
+        cande_obj.prepare()
+    print(recorder.to_json(indent=2))
+
+When no recorder is active the prepare stages run under the `NULL_RECORDER`, which does no timing and no counting.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Optional, Callable, List, Dict, Any
+
+
+@dataclass
+class StageRecord:
+    """Measurements for a single stage of a single prepare run."""
+    name: str
+    run: int = 0
+    seconds: float = 0.0
+    items: Optional[int] = None  # number of items processed by the stage
+    alloc_bytes: Optional[int] = None  # net change in traced memory (allocations enabled only)
+    peak_bytes: Optional[int] = None  # peak traced memory during the stage (allocations enabled only)
+
+
+class _StageContext:
+    """Times a stage and records it to the recorder on exit."""
+    __slots__ = ("recorder", "record", "count", "start", "mem_start")
+
+    def __init__(self, recorder: PrepareRecorder, record: StageRecord, count: Optional[Callable[[], int]]) -> None:
+        self.recorder = recorder
+        self.record = record
+        self.count = count
+
+    def __enter__(self) -> StageRecord:
+        if self.recorder.allocations:
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            self.mem_start = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+        return self.record
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        record = self.record
+        record.seconds = time.perf_counter() - self.start
+        if self.recorder.allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            record.alloc_bytes = current - self.mem_start
+            record.peak_bytes = peak
+        if self.count is not None and exc_type is None:
+            record.items = self.count()
+        self.recorder.add(record)
+
+
+class _NullStageContext:
+    """Does nothing; shared by all stages when instrumentation is disabled."""
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        return None
+
+
+_NULL_STAGE_CONTEXT = _NullStageContext()
+
+
+class NullRecorder:
+    """The default recorder: stages are not measured."""
+    enabled = False
+
+    def begin_run(self) -> None:
+        pass
+
+    def stage(self, name: str, count: Optional[Callable[[], int]] = None) -> _NullStageContext:
+        return _NULL_STAGE_CONTEXT
+
+
+NULL_RECORDER = NullRecorder()
+
+
+class PrepareRecorder:
+    """Records wall time, item counts and (optionally) allocation deltas for each prepare stage.
+
+    The optional callback is called with each `StageRecord` as soon as its stage completes. Allocation tracking uses
+    `tracemalloc`, which is started for the lifetime of the recorder if it isn't already tracing.
+    """
+    enabled = True
+
+    def __init__(self, *, allocations: bool = False, callback: Optional[Callable[[StageRecord], Any]] = None) -> None:
+        self.allocations = allocations
+        self.callback = callback
+        self.stages: List[StageRecord] = []
+        self.runs = 0
+        self._started_tracing = False
+
+    def start(self) -> None:
+        if self.allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def begin_run(self) -> None:
+        """Called at the start of each prepare run."""
+        self.runs += 1
+
+    def stage(self, name: str, count: Optional[Callable[[], int]] = None) -> _StageContext:
+        """Context manager for measuring a stage. The count callable is only called if the stage succeeds."""
+        return _StageContext(self, StageRecord(name, self.runs), count)
+
+    def add(self, record: StageRecord) -> None:
+        self.stages.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def totals(self) -> Dict[str, float]:
+        """Total seconds spent in each stage over all runs (in stage order)."""
+        result: Dict[str, float] = dict()
+        for record in self.stages:
+            result[record.name] = result.get(record.name, 0.0) + record.seconds
+        return result
+
+    def report(self) -> Dict[str, Any]:
+        """A JSON compatible report of all recorded stages."""
+        return dict(runs=self.runs,
+                    total_seconds=sum(record.seconds for record in self.stages),
+                    totals=self.totals(),
+                    stages=[asdict(record) for record in self.stages])
+
+    def to_json(self, **kwargs: Any) -> str:
+        return json.dumps(self.report(), **kwargs)
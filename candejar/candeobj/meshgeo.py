@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+
+"""Array based geometry of the mesh sections (nodes, elements, and boundaries).
+
+The coordinates of all of the members of a section are gathered at once from the (n, 2) coordinates array of its nodes
+section. The geometry is cached per section (along with the shapely geometry made from it) and is rebuilt after the
+section, its nodes section, or the coordinates or connectivity of their members change.
+
+Shapely geometries are made in bulk when shapely supports it (shapely 2.0 and later).
+
+The representative points of the parts of a section (the same points shapely gives) are found with arrays too, and are
+indexed by x coordinate so the parts inside of a shape can be found without making any shapely geometry for them.
+
+The elements containing points are located the same way: the bounding boxes of the triangle and quadrilateral elements
+of a section (the two node elements of a mixed section are left out) are indexed with a uniform grid, cached like the
+geometry, and the candidates are tested exactly with arrays.
+"""
+
+from __future__ import annotations
+
+import itertools
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import shapely
+import shapely.geometry as geo
+
+from ..geometry.coords import get_xy_many
+from ..geometry.mesh import interior_points, box_grid, face_boxes, face_weights, locate_points
+from ..utilities.mixins import GeoInterfaceError
+from ..utilities.skip import iter_skippable, skip_version_key
+
+# shapely 2.0 makes geometries from arrays in bulk
+BULK_SHAPES = hasattr(shapely, "polygons")
+
+try:
+    from shapely import contains_xy  # shapely 2.0
+except ImportError:
+    from shapely.vectorized import contains as contains_xy
+
+
+class SectionGeometry:
+    """The geometry of a section as arrays.
+
+    type: MultiPoint, MultiPolygon, or MultiLineString
+    coords: (n, 2) array of the point coordinates of all of the parts, in order
+    offsets: for polygons and lines, the (m + 1,) array of the start of each part in coords (and the end of the last)
+    """
+    __slots__ = ("type", "coords", "offsets", "_shape", "_points", "_x_index")
+
+    def __init__(self, type: str, coords: np.ndarray, offsets: Optional[np.ndarray] = None) -> None:
+        self.type = type
+        self.coords = coords
+        self.offsets = offsets
+        self._shape = None
+        self._points = None
+        self._x_index = None
+        for array in (coords, offsets):
+            if array is not None:
+                array.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.coords) if self.offsets is None else len(self.offsets) - 1
+
+    def parts(self) -> List[np.ndarray]:
+        """The coordinates of each of the points, polygons, or lines."""
+        if self.offsets is None:
+            return list(self.coords)
+        bounds = self.offsets.tolist()
+        return [self.coords[a:b] for a, b in zip(bounds, bounds[1:])]
+
+    def geo_interface(self) -> Dict[str, Any]:
+        """A new __geo_interface__ mapping of the geometry."""
+        coords = self.coords.tolist()
+        if self.offsets is None:
+            return dict(type=self.type, coordinates=coords)
+        bounds = self.offsets.tolist()
+        parts = [coords[a:b] for a, b in zip(bounds, bounds[1:])]
+        if self.type == "MultiPolygon":
+            # polygons are nested in a list (first item is exterior ring; no holes)
+            parts = [[part] for part in parts]
+        return dict(type=self.type, coordinates=parts)
+
+    def shape(self) -> geo.base.BaseGeometry:
+        """The shapely geometry; made once."""
+        if self._shape is None:
+            self._shape = _make_shape(self)
+        return self._shape
+
+    def representative_points(self) -> np.ndarray:
+        """The read-only (m, 2) array of the representative point of each part (as shapely gives it); found once."""
+        if self._points is None:
+            if self.type == "MultiPoint":
+                points = self.coords
+            elif self.type == "MultiPolygon":
+                points = interior_points(self.coords, self.offsets)
+            else:
+                points = _shape_points(self.shape())
+            points.flags.writeable = False
+            self._points = points
+        return self._points
+
+    def within(self, shape: geo.base.BaseGeometry, index: Optional[np.ndarray] = None) -> np.ndarray:
+        """The sorted array of the indexes of the parts with representative points contained by the shape. If a (sorted)
+        index is given, only the parts at those indexes are considered."""
+        if index is not None:
+            return index[_points_within(self.representative_points()[index], shape)]
+        if self._x_index is None:
+            order = np.argsort(self.representative_points()[:, 0], kind="stable")
+            self._x_index = order, self.representative_points()[order, 0]
+        order, x = self._x_index
+        return _points_within(self.representative_points(), shape, order, x)
+
+
+def _make_shape(geometry: SectionGeometry) -> geo.base.BaseGeometry:
+    coords, offsets = geometry.coords, geometry.offsets
+    if not len(geometry):
+        return geo.shape(geometry.geo_interface())
+    if geometry.type == "MultiPoint":
+        return shapely.multipoints(coords) if BULK_SHAPES else geo.MultiPoint(coords)
+    if not BULK_SHAPES:
+        # the fastest way to make many polygons or lines before shapely 2.0
+        return geo.shape(geometry.geo_interface())
+    if geometry.type == "MultiLineString":
+        return shapely.multilinestrings(shapely.linestrings(coords.reshape(-1, 2, 2)))
+    # polygons with the same number of points are made together
+    counts = np.diff(offsets)
+    polygons = np.empty(len(counts), dtype=object)
+    for count in np.unique(counts).tolist():
+        rows = np.flatnonzero(counts == count)
+        polygons[rows] = shapely.polygons(coords[offsets[rows][:, None] + np.arange(count)])
+    return shapely.multipolygons(polygons)
+
+
+def _shape_points(shape: geo.base.BaseGeometry) -> np.ndarray:
+    """The (m, 2) array of the representative points of the parts of a shapely geometry."""
+    points = [g.representative_point().coords[0] for g in getattr(shape, "geoms", [shape])]
+    return np.array(points, dtype=float).reshape(-1, 2)
+
+
+def _points_within(points: np.ndarray, shape: geo.base.BaseGeometry, order: Optional[np.ndarray] = None,
+                   x: Optional[np.ndarray] = None) -> np.ndarray:
+    """The sorted indexes of the points contained by the shape. The order and x arrays (the point indexes sorted by x
+    coordinate, and the sorted x coordinates) narrow the points down to those in the shape bounds."""
+    if shape.is_empty or not len(points):
+        return np.empty(0, dtype=np.intp)
+    x_min, y_min, x_max, y_max = shape.bounds
+    if order is None:
+        candidates = np.flatnonzero((points[:, 0] >= x_min) & (points[:, 0] <= x_max))
+    else:
+        candidates = order[np.searchsorted(x, x_min, "left"):np.searchsorted(x, x_max, "right")]
+    y = points[candidates, 1]
+    candidates = candidates[(y >= y_min) & (y <= y_max)]
+    if not len(candidates):
+        return np.empty(0, dtype=np.intp)
+    inside = contains_xy(shape, np.ascontiguousarray(points[candidates, 0]), np.ascontiguousarray(points[candidates, 1]))
+    return np.sort(candidates[np.asarray(inside, dtype=bool)])
+
+
+# an extra stamp for results that can't be cached
+_UNCACHEABLE = object()
+
+
+def _cached(section: Any, key: str, compute: Callable[[Any], Any], attrs: Iterable[str], extra: Any = None) -> Any:
+    """compute(section), cached by the section when it can detect changes to the named attributes of its members."""
+    cached = getattr(section, "cached", None)
+    if cached is None or extra is _UNCACHEABLE or not getattr(section, "tracks_attrs", False):
+        return compute(section)
+    return cached(("meshgeo", key), compute, attrs=attrs, extra=extra)
+
+
+def _nodes_stamp(nodes: Any) -> Any:
+    """Detects changes to a nodes section and its node coordinates."""
+    if getattr(nodes, "cached", None) is None or not getattr(nodes, "tracks_attrs", False):
+        return _UNCACHEABLE
+    return id(nodes), nodes.version, nodes.attr_versions(("x", "y"))
+
+
+def node_xy(nodes: Any) -> np.ndarray:
+    """The read-only (n, 2) coordinates array of all of the nodes of a nodes section (skipped nodes included)."""
+
+    def compute(section):
+        items = list(iter_skippable(section))
+        xy = np.fromiter(itertools.chain.from_iterable((n.x, n.y) for n in items), dtype=float,
+                         count=2 * len(items)).reshape(-1, 2)
+        xy.flags.writeable = False
+        return xy
+
+    return _cached(nodes, "xy", compute, ("x", "y"))
+
+
+def _gather(xy: np.ndarray, node_nums: np.ndarray) -> np.ndarray:
+    """The coordinates of the node numbers (indexed starting at 1)."""
+    try:
+        return xy[node_nums - 1]
+    except IndexError as e:
+        raise GeoInterfaceError(f"node number out of range for {len(xy)} nodes") from e
+
+
+def nodes_geometry(nodes: Any) -> SectionGeometry:
+    """The MultiPoint geometry of a nodes section (skipped nodes excluded)."""
+
+    def compute(section):
+        xy = node_xy(section)
+        skip_state = getattr(section, "skip_state", None)
+        if skip_state is not None and skip_state().count:
+            xy = xy[~skip_state().mask]
+        return SectionGeometry("MultiPoint", xy.copy())
+
+    skippable_attr = getattr(nodes, "skippable_attr", None)
+    attrs = ("x", "y") if skippable_attr is None else ("x", "y", skip_version_key(skippable_attr))
+    return _cached(nodes, "geometry", compute, attrs)
+
+
+def elements_geometry(elements: Any) -> SectionGeometry:
+    """The MultiPolygon geometry of an elements section (skipped elements excluded).
+
+    Polygons are made from the i, j, k, and l node numbers that aren't zero. If any element has only two of them, the
+    geometry is a MultiLineString of the i and j nodes of every element instead.
+    """
+    nodes = elements.nodes
+
+    def compute(section):
+        xy = node_xy(nodes)
+        nums = np.array([(e.i, e.j, e.k, e.l) for e in section], dtype=np.intp).reshape(-1, 4)
+        used = nums != 0
+        counts = used.sum(axis=1)
+        if (counts > 2).all():
+            offsets = np.concatenate(([0], np.cumsum(counts)))
+            return nodes, SectionGeometry("MultiPolygon", _gather(xy, nums[used]), offsets)
+        if used[:, :2].all():
+            offsets = np.arange(0, 2 * len(nums) + 1, 2)
+            return nodes, SectionGeometry("MultiLineString", _gather(xy, nums[:, :2].ravel()), offsets)
+        bad = nums[~used[:, :2].all(axis=1)][0]
+        raise GeoInterfaceError("Invalid Polygon node numbering: (i={:d}, j={:d}, k={:d}, l={:d})".format(*bad))
+
+    skippable_attr = getattr(elements, "skippable_attr", "num")
+    # the cached result refers to the nodes section so its id can't be reused while it is cached
+    _, geometry = _cached(elements, "geometry", compute, ("i", "j", "k", "l", skip_version_key(skippable_attr)),
+                          extra=_nodes_stamp(nodes))
+    return geometry
+
+
+class ElementFaces:
+    """The triangles and quadrilaterals of an elements section as arrays, for locating points.
+
+    index: the (m,) indexes (in iteration order) of the elements with three or four different nodes
+    columns: (m, 4) the i, j, k, and l columns (0 to 3) of the vertexes of the faces, followed by the columns of the
+        nodes left out (missing or repeated ones, e.g. l for a triangle stored with k == l)
+    vertices: (m, 4, 2) the vertexes of the faces, padded with the last vertex
+    counts: (m,) the number of vertexes (3 or 4)
+    grid: the grid of the face bounding boxes
+    """
+    __slots__ = ("index", "columns", "vertices", "counts", "grid")
+
+    def __init__(self, index: np.ndarray, columns: np.ndarray, vertices: np.ndarray, counts: np.ndarray) -> None:
+        self.index = index
+        self.columns = columns
+        self.vertices = vertices
+        self.counts = counts
+        self.grid = box_grid(face_boxes(vertices, counts))
+
+    def locate(self, points: Any, weights: bool = False) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """The index of the (first) element containing each of the points (-1 for points outside of all of them).
+
+        If weights is true the (n, 4) interpolation weights of the i, j, k, and l nodes of the element for each point
+        are returned too: barycentric for triangles, bilinear for quadrilaterals, 0 for the nodes left out, and NaN for
+        points not located.
+        """
+        points = get_xy_many(points)
+        face = locate_points(points, self.vertices, self.counts, self.grid)
+        found = np.flatnonzero(face >= 0)
+        index = np.full(len(points), -1, dtype=np.intp)
+        index[found] = self.index[face[found]]
+        if not weights:
+            return index
+        result = np.full((len(points), 4), np.nan)
+        face = face[found]
+        # the padding vertexes have no weight; they go to the columns of the nodes left out
+        result[found[:, None], self.columns[face]] = face_weights(points[found], self.vertices[face], self.counts[face])
+        return index, result
+
+
+def element_faces(elements: Any) -> ElementFaces:
+    """The faces of the triangle and quadrilateral elements of an elements section (skipped elements excluded)."""
+    nodes = elements.nodes
+
+    def compute(section):
+        nums = np.array([(e.i, e.j, e.k, e.l) for e in section], dtype=np.intp).reshape(-1, 4)
+        left_out = nums == 0
+        for c in range(1, 4):
+            left_out[:, c] |= (nums[:, :c] == nums[:, c:c + 1]).any(axis=1)
+        counts = 4 - left_out.sum(axis=1)
+        index = np.flatnonzero(counts > 2)
+        counts = counts[index]
+        # the columns of the nodes kept, in order, then the ones left out
+        columns = np.argsort(left_out[index], axis=1, kind="stable")
+        padded = np.take_along_axis(columns, np.minimum(np.arange(4), counts[:, None] - 1), axis=1)
+        vertices = _gather(node_xy(nodes), np.take_along_axis(nums[index], padded, axis=1))
+        return nodes, ElementFaces(index, columns, vertices.reshape(-1, 4, 2), counts)
+
+    skippable_attr = getattr(elements, "skippable_attr", "num")
+    _, faces = _cached(elements, "faces", compute, ("i", "j", "k", "l", skip_version_key(skippable_attr)),
+                       extra=_nodes_stamp(nodes))
+    return faces
+
+
+def boundaries_geometry(boundaries: Any) -> SectionGeometry:
+    """The MultiPoint geometry of the nodes of a boundaries section."""
+    nodes = boundaries.nodes
+
+    def compute(section):
+        nums = np.fromiter((b.node for b in section), dtype=np.intp)
+        return nodes, SectionGeometry("MultiPoint", _gather(node_xy(nodes), nums))
+
+    _, geometry = _cached(boundaries, "geometry", compute, ("node",), extra=_nodes_stamp(nodes))
+    return geometry
+
+
+def geo_interface(section: Any) -> Dict[str, Any]:
+    """The __geo_interface__ mapping of a section made from its cached geometry."""
+    return section.geometry().geo_interface()
+
+
+def shape_index(obj: Any, shape: geo.base.BaseGeometry, index: Optional[np.ndarray] = None) -> np.ndarray:
+    """The sorted indexes (in iteration order) of the members of a section, or of the parts of any other object with a
+    __geo_interface__, with representative points contained by the shape. If a (sorted) index is given, only the members
+    at those indexes are considered."""
+    geometry = getattr(obj, "geometry", None)
+    if callable(geometry):
+        return geometry().within(shape, index)
+    points = _shape_points(geo.shape(obj))
+    if index is not None:
+        return index[_points_within(points[index], shape)]
+    return _points_within(points, shape)
+
+
+def shape(obj: Any) -> geo.base.BaseGeometry:
+    """The shapely geometry of a section (cached), or of any other object with a __geo_interface__."""
+    geometry = getattr(obj, "geometry", None)
+    if callable(geometry):
+        return geometry().shape()
+    return geo.shape(obj)
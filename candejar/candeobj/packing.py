@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+
+"""Compact pickling of `CandeObj` instances and their sections.
+
+Each section is serialized as one packed column per item attribute plus a small metadata header, instead of one object
+(and one attribute dict) per node, element and boundary:
+
+    - attributes with the same value for every member -> the value
+    - int attributes -> the smallest int arrays that fit (plus a skip mask when some of the values are `SkipInt`)
+    - float attributes -> float64 arrays (plus an int mask for a mix of int and float values)
+    - references to nodes (e.g. Node.master) -> int arrays of node positions (-1 for None)
+    - anything else -> lists pickled as usual
+
+Use pickle protocol 5 with a buffer_callback (see `dumps` and `loads`) to send the arrays out-of-band without copying.
+"""
+
+from __future__ import annotations
+
+import pickle
+from dataclasses import dataclass, fields, is_dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple, Sequence, NamedTuple, Iterable, Callable
+
+import numpy as np
+
+from .parts import Node
+from .parts.level3 import make_many
+from .prepared import PreparedState, connections_stamp
+from ..utilities.skip import SkipInt
+
+# (kind, data, mask) - kind is one of: constant, int, float, number, node, nodes, object
+Column = Tuple[str, Any, Optional[np.ndarray]]
+
+# section instance attributes that are caches and aren't pickled
+SECTION_CACHE_ATTRS = ("_skip_f",)
+
+
+class SectionRef(NamedTuple):
+    """Refers to a section of a packed CandeObj by kind and position."""
+    kind: str
+    idx: int
+
+
+# the attribute types that are packed as a single value when it's the same for all the members
+CONSTANT_TYPES = (int, str, type(None))
+
+
+def smallest_int(data: np.ndarray) -> np.ndarray:
+    """The int array using the smallest int dtype that holds its values."""
+    if not len(data):
+        return data
+    low, high = data.min(), data.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return data.astype(dtype)
+    return data
+
+
+def pack_values(values: Sequence[Any], node_index: Optional[Dict[int, int]] = None) -> Column:
+    """Pack the values of a single item attribute as compactly as possible."""
+    types = {type(v) for v in values}
+    if len(types) == 1 and types <= set(CONSTANT_TYPES) and len(set(values)) == 1:
+        return "constant", values[0], None
+    if types and types <= {int, SkipInt}:
+        try:
+            data = np.array(values, dtype=np.int64)
+        except OverflowError:
+            pass
+        else:
+            skip = None
+            if SkipInt in types:
+                skip = np.fromiter((type(v) is SkipInt for v in values), dtype=bool, count=len(values))
+            return "int", smallest_int(data), skip
+    if types == {float}:
+        return "float", np.array(values, dtype=float), None
+    if types == {int, float} and all(abs(v) <= 2 ** 53 for v in values if type(v) is int):
+        # the int positions are recorded so the values are restored with their original types
+        return "number", np.array(values, dtype=float), np.fromiter((type(v) is int for v in values), dtype=bool,
+                                                                     count=len(values))
+    if node_index is not None and types:
+        if types <= {Node, type(None)} and all(v is None or id(v) in node_index for v in values):
+            return "node", smallest_int(np.fromiter((-1 if v is None else node_index[id(v)] for v in values),
+                                                    dtype=np.int64, count=len(values))), None
+        if types == {list} and all(type(n) is Node and id(n) in node_index for v in values for n in v):
+            return "nodes", [[node_index[id(n)] for n in v] for v in values], None
+    return "object", list(values), None
+
+
+def unpack_values(column: Column, length: int, node_list: Optional[Sequence[Node]] = None) -> List[Any]:
+    """The values of a packed column of the length. Node references require the list of nodes in position order."""
+    kind, data, mask = column
+    if kind == "constant":
+        return [data] * length
+    if kind in ("int", "float"):
+        values = data.tolist()
+        if mask is not None:
+            values = [SkipInt(v) if skip else v for v, skip in zip(values, mask.tolist())]
+        return values
+    if kind == "number":
+        return [int(v) if is_int else v for v, is_int in zip(data.tolist(), mask.tolist())]
+    if kind == "node":
+        return [None if idx < 0 else node_list[idx] for idx in data.tolist()]
+    if kind == "nodes":
+        return [[node_list[idx] for idx in v] for v in data]
+    return list(data)
+
+
+NODE_KINDS = ("node", "nodes")
+
+
+@dataclass
+class PackedSection:
+    """The packed members and metadata of a section."""
+    cls: type
+    item_type: type
+    length: int
+    columns: Dict[str, Column]  # dataclass fields and the extra attributes every member has
+    sparse: Dict[str, Tuple[np.ndarray, Column]]  # member indexes and values of the other extra attributes
+    attrs: Dict[str, Any]  # the section instance attributes
+    version: int
+
+
+def packable(section: Any) -> bool:
+    """Whether the section members can be packed (they are all instances of a dataclass item type)."""
+    item_type = getattr(section, "item_type", None)
+    return item_type is not None and is_dataclass(item_type) and all(type(item) is item_type
+                                                                      for item in list.__iter__(section))
+
+
+def pack_section(section: Any, node_index: Optional[Dict[int, int]] = None) -> PackedSection:
+    """Pack a section. Node references are packed as positions in the node_index (positions in the section itself when
+    no node_index is given)."""
+    items = list(list.__iter__(section))
+    if node_index is None:
+        node_index = {id(item): idx for idx, item in enumerate(items)}
+    dicts = [vars(item) for item in items]
+    names = [f.name for f in fields(section.item_type)]
+    columns = {name: pack_values([getattr(item, name) for item in items], node_index) for name in names}
+    sparse: Dict[str, Tuple[np.ndarray, Column]] = dict()
+    for name in dict.fromkeys(k for d in dicts for k in d if k not in columns):
+        idxs = [idx for idx, d in enumerate(dicts) if name in d]
+        if len(idxs) == len(dicts):
+            columns[name] = pack_values([d[name] for d in dicts], node_index)
+        else:
+            sparse[name] = np.array(idxs, dtype=np.int64), pack_values([dicts[idx][name] for idx in idxs], node_index)
+    attrs = {k: v for k, v in getattr(section, "__dict__", dict()).items() if k not in SECTION_CACHE_ATTRS}
+    return PackedSection(type(section), section.item_type, len(items), columns, sparse, attrs, section.version)
+
+
+def unpack_section(packed: PackedSection, set_nodes: bool = True) -> Any:
+    """Rebuild a packed section. Node references are resolved to the section members themselves, or left as None when
+    set_nodes is False (see `set_node_refs`)."""
+    columns = {name: [None] * packed.length if column[0] in NODE_KINDS else unpack_values(column, packed.length)
+               for name, column in packed.columns.items()}
+    items = make_many(packed.item_type, columns)
+    for name, (idxs, column) in packed.sparse.items():
+        if column[0] not in NODE_KINDS:
+            for idx, value in zip(idxs.tolist(), unpack_values(column, len(idxs))):
+                vars(items[idx])[name] = value
+    section = packed.cls.from_trusted(items)
+    if set_nodes:
+        set_node_refs(items, packed, items)
+    section.__dict__.update(packed.attrs)
+    section._version = packed.version
+    return section
+
+
+def set_node_refs(items: Sequence[Any], packed: PackedSection, node_list: Sequence[Node]) -> None:
+    """Set the node reference attributes of the unpacked section members using the list of nodes in position order."""
+    # new objects; bypass the attribute version counts
+    for name, column in packed.columns.items():
+        if column[0] in NODE_KINDS:
+            for item, value in zip(items, unpack_values(column, packed.length, node_list)):
+                vars(item)[name] = value
+    for name, (idxs, column) in packed.sparse.items():
+        if column[0] in NODE_KINDS:
+            for idx, value in zip(idxs.tolist(), unpack_values(column, len(idxs), node_list)):
+                vars(items[idx])[name] = value
+
+
+def reduce_section(section: Any) -> Tuple[Any, ...]:
+    """The __reduce__ value for a section."""
+    return unpack_section, (pack_section(section),)
+
+
+@dataclass
+class PackedCandeObj:
+    """The packed state of a CandeObj."""
+    cls: type
+    values: Dict[str, Any]  # the instance __dict__ except for the packed parts
+    sections: Dict[str, Tuple[type, List[Tuple[Any, PackedSection]]]]  # map type and (key, section) pairs by kind
+    connections: Tuple[type, List[Tuple[Any, Tuple[int, Column]]]]  # list type and (connection, (length, items))
+    prepared_state: Optional[PreparedState]  # sections replaced by SectionRefs
+
+
+def pack_cande_obj(cande_obj: Any, section_kinds: Sequence[str], excluded: Iterable[str] = ()) -> PackedCandeObj:
+    """Pack a CandeObj. The instance attributes named in excluded are not pickled.
+
+    Node references anywhere in the model (e.g. Node.master, connection items) are packed as positions in the chain of
+    all nodes sections, and section references (e.g. the elements section nodes attribute) as SectionRefs.
+    """
+    section_ids: Dict[int, SectionRef] = dict()
+    for kind in section_kinds:
+        for idx, section in enumerate(getattr(cande_obj, kind).seq_map.values()):
+            section_ids.setdefault(id(section), SectionRef(kind, idx))
+    node_index = {id(node): idx for idx, node in enumerate(node for section in cande_obj.nodes.seq_map.values()
+                                                           for node in list.__iter__(section))}
+
+    sections: Dict[str, Tuple[type, List[Tuple[Any, PackedSection]]]] = dict()
+    for kind in section_kinds:
+        map_seq = getattr(cande_obj, kind)
+        packed_sections = []
+        for key, section in map_seq.seq_map.items():
+            packed = pack_section(section, node_index)
+            packed.attrs = {k: section_ids.get(id(v), v) for k, v in packed.attrs.items()}
+            packed_sections.append((key, packed))
+        sections[kind] = type(map_seq), packed_sections
+
+    connections = type(cande_obj.connections), [(replace_items(conn, []),
+                                                 (len(conn.items), pack_values(list(conn.items), node_index)))
+                                                for conn in cande_obj.connections]
+
+    state: Optional[PreparedState] = cande_obj.__dict__.get("_prepared_state")
+    if state is not None:
+        state = pack_prepared_state(state, section_ids, state.connections == connections_stamp(cande_obj.connections))
+
+    values = {k: v for k, v in cande_obj.__dict__.items()
+              if k not in (*section_kinds, "connections", "_prepared_state", *excluded)}
+    return PackedCandeObj(type(cande_obj), values, sections, connections, state)
+
+
+def unpack_cande_obj(packed: PackedCandeObj) -> Any:
+    """Rebuild a packed CandeObj (without calling __init__)."""
+    cande_obj = packed.cls.__new__(packed.cls)
+    cande_obj.__dict__.update(packed.values)
+    section_lists = {kind: [unpack_section(packed_section, set_nodes=False) for _, packed_section in packed_sections]
+                     for kind, (_, packed_sections) in packed.sections.items()}
+
+    def resolve(obj):
+        return section_lists[obj.kind][obj.idx] if isinstance(obj, SectionRef) else obj
+
+    node_list = [node for section in section_lists["nodes"] for node in list.__iter__(section)]
+    for kind, (map_type, packed_sections) in packed.sections.items():
+        for (_, packed_section), section in zip(packed_sections, section_lists[kind]):
+            set_node_refs(list(list.__iter__(section)), packed_section, node_list)
+            for k, v in packed_section.attrs.items():
+                if isinstance(v, SectionRef):
+                    setattr(section, k, resolve(v))
+        setattr(cande_obj, kind, map_type({key: section for (key, _), section in zip(packed_sections,
+                                                                                       section_lists[kind])}))
+    connections_type, packed_connections = packed.connections
+    cande_obj.connections = connections_type(replace_items(conn, unpack_values(items, length, node_list))
+                                             for conn, (length, items) in packed_connections)
+    if packed.prepared_state is not None:
+        cande_obj._prepared_state = unpack_prepared_state(packed.prepared_state, resolve, cande_obj.connections)
+    return cande_obj
+
+
+def replace_items(conn: Any, items: List[Any]) -> Any:
+    """A copy of the connection with different items."""
+    new = conn.__class__.__new__(conn.__class__)
+    new.__dict__.update(conn.__dict__)
+    new.items = items
+    return new
+
+
+def pack_prepared_state(state: PreparedState, section_ids: Dict[int, SectionRef],
+                        same_connections: bool) -> Optional[PreparedState]:
+    """The state with the sections replaced by SectionRefs, or None if it refers to sections that are gone or the
+    watched attributes have changed since it was captured (i.e. it can't be reused anyway).
+
+    The connections stamp (made of member ids) is replaced by whether it matched the connections."""
+    if not state.same_attrs():
+        return None
+
+    def pack_stamps(stamps):
+        return tuple((key, section_ids[id(section)], length, version, None,
+                      None if nodes is None else section_ids.get(id(nodes), None))
+                     for key, section, length, version, _, nodes in stamps)
+
+    try:
+        return replace(state, nodes=pack_stamps(state.nodes), elements=pack_stamps(state.elements),
+                       boundaries=pack_stamps(state.boundaries), connections=same_connections)
+    except KeyError:
+        return None
+
+
+def unpack_prepared_state(state: PreparedState, resolve: Callable[[Any], Any], connections: Any) -> PreparedState:
+    def unpack_stamps(stamps):
+        return tuple((key, resolve(section), length, version, None, None if nodes is None else resolve(nodes))
+                     for key, section, length, version, _, nodes in stamps)
+
+    # the rebuilt sections count attribute assignments from scratch
+    return replace(state, nodes=unpack_stamps(state.nodes), elements=unpack_stamps(state.elements),
+                   boundaries=unpack_stamps(state.boundaries),
+                   connections=connections_stamp(connections) if state.connections else None).refreshed()
+
+
+def dumps(obj: Any) -> Tuple[bytes, List[pickle.PickleBuffer]]:
+    """Pickle with protocol 5, returning the large arrays as out-of-band buffers (not copied)."""
+    buffers: List[pickle.PickleBuffer] = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    return data, buffers
+
+
+def loads(data: bytes, buffers: Iterable[Any] = ()) -> Any:
+    """Unpickle data made by dumps."""
+    return pickle.loads(data, buffers=buffers)
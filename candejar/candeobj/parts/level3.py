@@ -4,17 +4,46 @@
 
 from __future__ import annotations
 import enum
-from dataclasses import dataclass
-from typing import ClassVar, Iterable
+from dataclasses import dataclass, fields, MISSING
+from typing import ClassVar, Iterable, Mapping, Any, List, Type, TypeVar
 
 from .. import exc
 from ...utilities.decorators import init_kwargs
-from ...utilities.mixins import GeoMixin, WithKwargsMixin
+from ...utilities.mixins import GeoMixin, WithKwargsMixin, AttrVersionMixin
+
+T = TypeVar("T")
+
+
+def make_many(cls: Type[T], columns: Mapping[str, Iterable[Any]]) -> List[T]:
+    """Make instances from columns of field values without calling __init__; the values are trusted as-is.
+
+    Fields missing from the columns get their default values. Any other columns become extra attributes (the same as
+    extra keyword arguments to __init__).
+    """
+    defaults = {f.name: f.default for f in fields(cls) if f.default is not MISSING}
+    missing = [f.name for f in fields(cls) if f.name not in columns and f.name not in defaults]
+    if missing:
+        raise exc.CandeTypeError(f"{cls.__qualname__} columns missing required fields: {', '.join(missing)}")
+    names = tuple(columns)
+    new = object.__new__
+    # the holders slot of instances reporting attribute assignments (see AttrVersionMixin); normally set by __new__
+    set_holders = getattr(getattr(cls, "_attr_holders", None), "__set__", None)
+    result = []
+    for values in zip(*columns.values()):
+        obj = new(cls)
+        if set_holders is not None:
+            set_holders(obj, None)
+        # bypass __setattr__; new objects aren't held by anything watching their attributes yet
+        obj_dict = obj.__dict__
+        obj_dict.update(defaults)
+        obj_dict.update(zip(names, values))
+        result.append(obj)
+    return result
 
 
 @init_kwargs
 @dataclass(init=False)
-class Node(WithKwargsMixin, GeoMixin, geo_type="Point"):
+class Node(WithKwargsMixin, AttrVersionMixin, GeoMixin, geo_type="Point"):
     num: int
     x: float
     y: float
@@ -38,7 +67,7 @@ class ElementCategory(enum.Enum):
 
 @init_kwargs
 @dataclass(init=False)
-class Element(WithKwargsMixin, GeoMixin, geo_type="Polygon"):
+class Element(WithKwargsMixin, AttrVersionMixin, GeoMixin, geo_type="Polygon"):
     num: int
     i: int
     j: int
@@ -76,7 +105,7 @@ class Element(WithKwargsMixin, GeoMixin, geo_type="Polygon"):
 
 @init_kwargs
 @dataclass(init=False)
-class Boundary(WithKwargsMixin, GeoMixin, geo_type="Node"):
+class Boundary(WithKwargsMixin, AttrVersionMixin, GeoMixin, geo_type="Node"):
     node: int
     xcode: int = 0
     xvalue: float = 0.0
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+"""Records the state of a `CandeObj` at the end of a prepare() call so the next call can skip the unchanged work.
+
+A section is considered changed (dirty) since the last prepare when:
+
+    - it was added or replaced
+    - its version changed (any list mutation; see `ConvertingList.version`), e.g. after `CandeObj.mark_dirty`
+    - its nodes reference changed (element and boundary sections only)
+    - a node reference attribute (i, j, k, l or node) was assigned on one of its members (element and boundary
+      sections only; see `ConvertingList.attr_versions`)
+
+The node numbering is only reused if the nodes sections (order, identity, lengths and versions), the num/master
+attributes of their members, and the connections are all unchanged. Otherwise a full prepare is required. The element
+numbers are only reused if the element sections are in the same order with the same lengths.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Tuple, Any, List, Sequence, Optional
+
+# the node attributes that decide node numbering
+NODE_NUMBERING_ATTRS = ("num", "master")
+# the element/boundary attributes that refer to node numbers
+ELEMENT_NODE_ATTRS = tuple("ijkl")
+BOUNDARY_NODE_ATTRS = ("node",)
+
+SectionStamp = Tuple[Any, Sequence, int, int, Optional[Tuple[int, ...]], Optional[Sequence]]
+
+
+def section_stamp(key: Any, section: Sequence, attrs: Tuple[str, ...]) -> SectionStamp:
+    """The key, section, length, version, watched attribute versions (see `ConvertingList.attr_versions`), and nodes
+    reference of a section."""
+    return (key, section, len(section), getattr(section, "version", None), section_attr_versions(section, attrs),
+            getattr(section, "nodes", None))
+
+
+def section_attr_versions(section: Sequence, attrs: Tuple[str, ...]) -> Optional[Tuple[int, ...]]:
+    versions = getattr(section, "attr_versions", None)
+    return None if versions is None else versions(attrs)
+
+
+def map_stamps(map_seq, attrs: Tuple[str, ...]) -> Tuple[SectionStamp, ...]:
+    return tuple(section_stamp(k, s, attrs) for k, s in map_seq.seq_map.items())
+
+
+def connections_stamp(connections) -> Tuple[Tuple[type, Tuple[int, ...]], ...]:
+    # connections are compared by type and items only so copies of the connections (e.g. in forks) are the same
+    return tuple((type(conn), tuple(id(item) for item in conn.items)) for conn in connections)
+
+
+def same_stamps(a: Sequence[SectionStamp], b: Sequence[SectionStamp]) -> bool:
+    """Section stamps are compared by identity for the section objects, and equality for everything else."""
+    return len(a) == len(b) and all(x[0] == y[0] and x[1] is y[1] and x[2:5] == y[2:5] and x[5] is y[5]
+                                    for x, y in zip(a, b))
+
+
+def refreshed_stamps(stamps: Sequence[SectionStamp], attrs: Tuple[str, ...]) -> Tuple[SectionStamp, ...]:
+    return tuple((*stamp[:4], section_attr_versions(stamp[1], attrs), stamp[5]) for stamp in stamps)
+
+
+def same_stamp_attrs(stamps: Sequence[SectionStamp], attrs: Tuple[str, ...]) -> bool:
+    return all(stamp[4] == section_attr_versions(stamp[1], attrs) for stamp in stamps)
+
+
+@dataclass
+class PreparedState:
+    """Snapshot of the information that decides what work a prepare() call needs to do."""
+    # NOTE: the section objects are held (not just their ids) so ids can't be reused by new sections
+    nodes: Tuple[SectionStamp, ...]
+    connections: Tuple[Tuple[type, Tuple[int, ...]], ...]
+    elements: Tuple[SectionStamp, ...]
+    boundaries: Tuple[SectionStamp, ...]
+
+    @classmethod
+    def capture(cls, cande_obj) -> PreparedState:
+        return cls(nodes=map_stamps(cande_obj.nodes, NODE_NUMBERING_ATTRS),
+                   connections=connections_stamp(cande_obj.connections),
+                   elements=map_stamps(cande_obj.elements, ELEMENT_NODE_ATTRS),
+                   boundaries=map_stamps(cande_obj.boundaries, BOUNDARY_NODE_ATTRS))
+
+    def refreshed(self) -> PreparedState:
+        """A copy with the current attribute versions of the recorded sections.
+
+        Only valid when the watched attributes of the recorded members haven't been assigned since the capture (e.g.
+        for sections rebuilt from a packed model, which start counting again).
+        """
+        return replace(self, nodes=refreshed_stamps(self.nodes, NODE_NUMBERING_ATTRS),
+                       elements=refreshed_stamps(self.elements, ELEMENT_NODE_ATTRS),
+                       boundaries=refreshed_stamps(self.boundaries, BOUNDARY_NODE_ATTRS))
+
+    def same_attrs(self) -> bool:
+        """Whether none of the watched attributes of the recorded sections have been assigned since the capture."""
+        return (same_stamp_attrs(self.nodes, NODE_NUMBERING_ATTRS)
+                and same_stamp_attrs(self.elements, ELEMENT_NODE_ATTRS)
+                and same_stamp_attrs(self.boundaries, BOUNDARY_NODE_ATTRS))
+
+    def same_node_numbering(self, cande_obj) -> bool:
+        """Whether the node numbering from the last prepare is still valid."""
+        return (same_stamps(self.nodes, map_stamps(cande_obj.nodes, NODE_NUMBERING_ATTRS))
+                and self.connections == connections_stamp(cande_obj.connections))
+
+    def same_element_layout(self, cande_obj) -> bool:
+        """Whether the element sections are in the same order with the same lengths."""
+        old = [(stamp[1], stamp[2]) for stamp in self.elements]
+        new = [(s, len(s)) for s in cande_obj.elements.seq_map.values()]
+        return len(old) == len(new) and all(a is c and b == d for (a, b), (c, d) in zip(old, new))
+
+    @staticmethod
+    def _dirty(old: Sequence[SectionStamp], new: Sequence[SectionStamp]) -> List[Sequence]:
+        old_by_id = {id(stamp[1]): stamp for stamp in old}
+        return [stamp[1] for stamp in new if not same_stamps([old_by_id.get(id(stamp[1]), (None,) * 6)], [stamp])]
+
+    def dirty_elements(self, cande_obj) -> List[Sequence]:
+        """The element sections changed since the last prepare."""
+        return self._dirty(self.elements, map_stamps(cande_obj.elements, ELEMENT_NODE_ATTRS))
+
+    def dirty_boundaries(self, cande_obj) -> List[Sequence]:
+        """The boundary sections changed since the last prepare."""
+        return self._dirty(self.boundaries, map_stamps(cande_obj.boundaries, BOUNDARY_NODE_ATTRS))
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+
+"""Sharing a prepared `CandeObj` with worker processes through `multiprocessing.shared_memory`.
+
+Usage example:
+
+    with SharedMesh(base) as shared:
+        executor = ProcessPoolExecutor(initializer=init_worker, initargs=(shared.handle,))
+        ...
+
+    # in each worker
+    with attach(handle) as model:
+        model.set("elements", "SOIL", "mat", 2)
+        cande_obj = model.to_cande_obj()
+
+The model is packed (see the packing module) and the packed arrays are copied once into a single shared memory block.
+The handle is small: the block name, the array offsets, and the pickled packing header. Attaching does no parsing and
+no copying; the arrays of the attached model are read-only views of the shared block.
+
+Scope: only the SharedModel itself (keys, column, set) is flat in memory. It reads the shared arrays and keeps the
+edits as overlays, so a process using it holds no per-member objects. to_cande_obj() is NOT flat: it makes a Python
+object for every member of every section, so each process that calls it (e.g. each sweep worker) holds a full private
+copy of the model, and the total memory grows with the number of such processes. What it saves is the parsing and
+unpickling. A CandeObj backed by the shared arrays (sections that make their members on access) is not provided: the
+.cid writer, the edits and CandeObj.prepare all work on the member objects.
+
+Edits are recorded as overlays local to the attached model and applied when a CandeObj is made from it. The sections
+with overlays get a new version so the prepared state of the model only skips the work for the unchanged sections.
+"""
+
+from __future__ import annotations
+
+import pickle
+from dataclasses import dataclass, replace
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple, Union, Sequence, Iterable
+
+import numpy as np
+
+from . import exc
+from .candeobj import CandeObj, SECTION_KINDS
+from .packing import PackedCandeObj, PackedSection, Column, pack_cande_obj, unpack_cande_obj, pack_values, \
+    unpack_values, NODE_KINDS
+
+# array offsets in the shared block are aligned to this many bytes
+ALIGNMENT = 64
+
+Index = Union[int, slice, Sequence[int]]
+
+
+@dataclass(frozen=True)
+class SharedHandle:
+    """Everything a process needs to attach to a shared model; small enough to send to every worker."""
+    name: str  # the shared memory block
+    buffers: Tuple[Tuple[int, int], ...]  # (offset, size) of each of the packed arrays in the block
+    header: bytes  # the pickled packing header
+
+
+class SharedMesh:
+    """Publishes a CandeObj to a shared memory block, which is released by close() (or at the end of a with block)."""
+
+    def __init__(self, cande_obj: CandeObj, *, prepare: bool = True) -> None:
+        if prepare:
+            cande_obj.prepare()
+        buffers: List[pickle.PickleBuffer] = []
+        header = pickle.dumps(pack_cande_obj(cande_obj, SECTION_KINDS, excluded=("_shared_sections", "_recorder")),
+                              protocol=5, buffer_callback=buffers.append)
+        offsets = []
+        offset = 0
+        for buffer in buffers:
+            offsets.append((offset, buffer.raw().nbytes))
+            offset += -(-buffer.raw().nbytes // ALIGNMENT) * ALIGNMENT
+        self._shm: Optional[shared_memory.SharedMemory] = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for buffer, (start, size) in zip(buffers, offsets):
+            self._shm.buf[start:start + size] = buffer.raw()
+        self.handle = SharedHandle(self._shm.name, tuple(offsets), header)
+
+    @property
+    def nbytes(self) -> int:
+        """The size of the shared block."""
+        return self._shm.size
+
+    def close(self) -> None:
+        """Release the shared block. Processes already attached keep their views until they close them."""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self) -> SharedMesh:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SharedModel:
+    """A read-only view of a shared CandeObj, with local edits recorded as overlays (see the module docs).
+
+    Sections are identified by their kind (nodes, elements or boundaries) and key. The views must not be used after
+    close(); close() fails with BufferError while arrays from column() are still referenced.
+    """
+
+    def __init__(self, handle: SharedHandle) -> None:
+        self.handle = handle
+        self._shm: Optional[shared_memory.SharedMemory] = shared_memory.SharedMemory(name=handle.name)
+        buf = self._shm.buf.toreadonly()
+        self._packed: Optional[PackedCandeObj] = pickle.loads(
+            handle.header, buffers=[buf[start:start + size] for start, size in handle.buffers])
+        self._overlays: Dict[Tuple[str, Any], Dict[str, List[Any]]] = dict()
+
+    def keys(self, kind: str) -> List[Any]:
+        """The section keys of the kind, in order."""
+        return [key for key, _ in self._sections(kind)]
+
+    def _sections(self, kind: str) -> List[Tuple[Any, PackedSection]]:
+        if self._packed is None:
+            raise exc.CandeValueError("the shared model is closed")
+        try:
+            return self._packed.sections[kind][1]
+        except KeyError:
+            raise exc.CandeValueError(f"kind must be one of {', '.join(SECTION_KINDS)}, not {kind!r}")
+
+    def _section(self, kind: str, key: Any) -> PackedSection:
+        for section_key, section in self._sections(kind):
+            if section_key == key:
+                return section
+        raise exc.CandeKeyError(f"no {kind} section named {key!r}")
+
+    def _column(self, kind: str, key: Any, attr: str) -> Column:
+        section = self._section(kind, key)
+        try:
+            return section.columns[attr]
+        except KeyError:
+            raise exc.CandeAttributeError(f"{kind} section {key!r} has no {attr!r} column")
+
+    def column(self, kind: str, key: Any, attr: str) -> np.ndarray:
+        """The values of a member attribute of a section, including the overlay edits.
+
+        Unedited int and float columns are read-only views of the shared block; node references are node positions
+        in the chain of all of the nodes sections (-1 for None).
+        """
+        overlay = self._overlays.get((kind, key), dict()).get(attr)
+        if overlay is not None:
+            return np.array(overlay)
+        column = self._column(kind, key, attr)
+        data_kind, data, _ = column
+        if data_kind in ("int", "float", "node"):
+            return data
+        if data_kind == "nodes":
+            return np.array(data, dtype=object)
+        return np.array(unpack_values(column, self._section(kind, key).length))
+
+    def set(self, kind: str, key: Any, attr: str, value: Any, index: Optional[Index] = None) -> None:
+        """Record an edit of a member attribute of a section: all of the members, or the members at the index.
+
+        An iterable value is assigned member by member; anything else is assigned to every member.
+        """
+        column = self._column(kind, key, attr)
+        if column[0] in NODE_KINDS:
+            raise exc.CandeTypeError(f"node references ({kind} {attr!r}) can't be edited in a shared model")
+        section_overlays = self._overlays.setdefault((kind, key), dict())
+        values = section_overlays.get(attr)
+        if values is None:
+            values = section_overlays[attr] = unpack_values(column, self._section(kind, key).length)
+        if index is None:
+            positions: Iterable[int] = range(len(values))
+        elif isinstance(index, slice):
+            positions = range(*index.indices(len(values)))
+        elif isinstance(index, int):
+            positions = [index]
+        else:
+            positions = index
+        positions = list(positions)
+        if isinstance(value, Iterable) and not isinstance(value, str):
+            value = list(value)
+            if len(value) != len(positions):
+                raise exc.CandeValueError(f"{len(value)} values for {len(positions)} members")
+        else:
+            value = [value] * len(positions)
+        for position, v in zip(positions, value):
+            values[position] = v
+
+    def clear(self) -> None:
+        """Discard the overlay edits."""
+        self._overlays.clear()
+
+    def to_cande_obj(self) -> CandeObj:
+        """A new CandeObj made from the shared model with the overlay edits applied.
+
+        The CandeObj is a full private copy of the model in this process (see the module docs); only the unpacking
+        reads the shared arrays.
+        """
+        if self._packed is None:
+            raise exc.CandeValueError("the shared model is closed")
+        sections = dict()
+        for kind, (map_type, packed_sections) in self._packed.sections.items():
+            new_sections = []
+            for key, section in packed_sections:
+                overlays = self._overlays.get((kind, key))
+                if overlays:
+                    columns = dict(section.columns)
+                    columns.update((attr, pack_values(values)) for attr, values in overlays.items())
+                    section = replace(section, columns=columns, version=section.version + 1)
+                new_sections.append((key, section))
+            sections[kind] = map_type, new_sections
+        return unpack_cande_obj(replace(self._packed, sections=sections))
+
+    def close(self) -> None:
+        if self._shm is not None:
+            self._packed = None
+            self._shm.close()
+            self._shm = None
+
+    def __enter__(self) -> SharedModel:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def attach(handle: SharedHandle) -> SharedModel:
+    """Attach to a model published by SharedMesh (in any process)."""
+    return SharedModel(handle)
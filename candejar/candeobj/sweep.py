@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+"""Parameter sweeps: many `CandeObj` variants generated from one base model.
+
+Usage example:
+
+    sweep = Sweep(base, grid=dict(soil=[1, 2, 3], step=[1, 2]),
+                  edits=dict(soil=SetSectionAttr("elements", "SOIL", "mat"),
+                             step=SetSectionAttr("elements", "SOIL", "step")))
+    manifest = sweep.write("./variants", workers=4)
+
+The base model is prepared once. Each variant is a fork of the base (see `CandeObj.fork`) so the nodes, elements and
+boundaries sections are shared until an edit takes its own copy (see `CandeObj.own_section`), and the variant prepare
+only repeats the work for the changed sections.
+
+The edits are called in the order of the grid keys with the variant and its parameter value. To use more than one
+worker process the grid values and the edits must be picklable (e.g. the edit classes below, or module level
+functions); the base model is sent to the workers through shared memory (see the shared module), and each worker makes
+its own copy of it once, without parsing or unpickling the model.
+
+Worker memory is NOT flat: every worker holds a full copy of the base model (plus the variant it is building), so the
+total memory grows with the model size times the number of workers. The shared block only saves the startup work.
+
+Variants are numbered in `itertools.product` order of the grid and named "<prefix>_<number>". The manifest lists the
+name, file and parameters of every variant.
+"""
+
+from __future__ import annotations
+
+import copy
+import functools
+import itertools
+import json
+import math
+import operator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+from . import exc
+from .candeobj import CandeObj
+from .shared import SharedMesh, SharedHandle, attach
+
+Edit = Callable[[CandeObj, Any], Any]
+
+
+@dataclass(frozen=True)
+class SetAttr:
+    """An edit that sets a top level CandeObj attribute (e.g. heading or method) to the parameter value."""
+    attr: str
+
+    def __call__(self, cande_obj: CandeObj, value: Any) -> None:
+        setattr(cande_obj, self.attr, value)
+
+
+@dataclass(frozen=True)
+class SetSectionAttr:
+    """An edit that sets an attribute (e.g. mat or step) of every member of a section to the parameter value."""
+    kind: str
+    name: Any
+    attr: str
+
+    def __call__(self, cande_obj: CandeObj, value: Any) -> None:
+        for item in cande_obj.own_section(self.kind, self.name):
+            setattr(item, self.attr, value)
+
+
+@dataclass(frozen=True)
+class SetPipeGroupAttr:
+    """An edit that sets an attribute of a pipe group (by group number, starting at 1) to the parameter value."""
+    group: int
+    attr: str
+
+    def __call__(self, cande_obj: CandeObj, value: Any) -> None:
+        setattr(cande_obj.pipegroups[self.group - 1], self.attr, value)
+
+
+@dataclass
+class Variant:
+    """A single variant of the sweep."""
+    index: int
+    name: str
+    params: Dict[str, Any]
+    cande_obj: Optional[CandeObj] = field(default=None, repr=False)
+
+
+class Sweep:
+    """Generates CandeObj variants of a base model over a grid of parameter values."""
+
+    def __init__(self, base: CandeObj, grid: Mapping[str, Iterable[Any]], edits: Mapping[str, Edit], *,
+                 prefix: str = "variant", prepare: bool = True) -> None:
+        missing = [key for key in grid if key not in edits]
+        if missing:
+            raise exc.CandeKeyError(f"no edits provided for parameters: {', '.join(map(str, missing))}")
+        self.base = base
+        self.grid: Dict[str, List[Any]] = {key: list(values) for key, values in grid.items()}
+        self.edits: Dict[str, Edit] = {key: edits[key] for key in self.grid}
+        self.prefix = prefix
+        self.prepare = prepare
+        if prepare:
+            base.prepare()
+
+    def __len__(self) -> int:
+        return functools.reduce(operator.mul, (len(values) for values in self.grid.values()), 1)
+
+    def __iter__(self) -> Iterator[Variant]:
+        """Builds the variants one at a time."""
+        return (self.build(index) for index in range(len(self)))
+
+    def name(self, index: int) -> str:
+        width = len(str(max(len(self) - 1, 0)))
+        return f"{self.prefix}_{index:0{width}d}"
+
+    def params(self, index: int) -> Dict[str, Any]:
+        """The parameters of the variant at the index (in itertools.product order of the grid)."""
+        if not 0 <= index < len(self):
+            raise exc.CandeIndexError(f"variant index {index!s} out of range")
+        result = dict()
+        for key, values in reversed(self.grid.items()):
+            index, value_idx = divmod(index, len(values))
+            result[key] = values[value_idx]
+        return {key: result[key] for key in self.grid}
+
+    def build(self, index: int) -> Variant:
+        """Make the variant at the index: fork the base, apply the edits, and prepare."""
+        params = self.params(index)
+        cande_obj = self.base.fork()
+        state = self.base.__dict__.get("_prepared_state")
+        if state is not None:
+            # the base sections can't have been changed by the forks; see CandeObj.fork
+            cande_obj._prepared_state = state.refreshed()
+        for key, value in params.items():
+            self.edits[key](cande_obj, value)
+        if self.prepare:
+            cande_obj.prepare()
+        return Variant(index, self.name(index), params, cande_obj)
+
+    def write(self, directory: Union[str, Path], *, workers: int = 1, mode: str = "x",
+              manifest: Optional[str] = "manifest.json") -> Dict[str, Any]:
+        """Build and write every variant to a .cid file in the directory, returning the manifest.
+
+        Each variant is written line by line as it is built and then discarded. With more than one worker the variants
+        are built in a process pool (in contiguous chunks of indexes). The manifest is also written to the directory
+        unless its file name is None.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        indexes = range(len(self))
+        if workers == 1:
+            entries = write_variants(self, indexes, directory, mode)
+        else:
+            chunk_size = max(1, math.ceil(len(indexes) / (workers * 4)))
+            chunks = [indexes[i:i + chunk_size] for i in range(0, len(indexes), chunk_size)]
+            # the workers make their copies of the base model from shared memory instead of each unpickling one
+            worker_sweep = copy.copy(self)
+            worker_sweep.base = None
+            with SharedMesh(self.base, prepare=False) as shared, \
+                    ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                        initargs=(worker_sweep, shared.handle)) as executor:
+                entries = [entry for chunk_entries in executor.map(_write_chunk, chunks, itertools.repeat(directory),
+                                                                  itertools.repeat(mode))
+                           for entry in chunk_entries]
+        result = dict(prefix=self.prefix, parameters=list(self.grid), grid=self.grid, variants=entries)
+        if manifest is not None:
+            (directory / manifest).write_text(json.dumps(result, indent=2, default=repr))
+        return result
+
+
+def write_variant(variant: Variant, path: Path, mode: str = "x") -> None:
+    """Stream the .cid lines of the variant to the path."""
+    with path.open(mode) as f:
+        for line_num, line in enumerate(variant.cande_obj.iter_line_strings()):
+            if line_num:
+                f.write("\n")
+            f.write(line)
+
+
+def write_variants(sweep: Sweep, indexes: Sequence[int], directory: Path, mode: str = "x") -> List[Dict[str, Any]]:
+    entries = []
+    for index in indexes:
+        variant = sweep.build(index)
+        path = directory / f"{variant.name}.cid"
+        write_variant(variant, path, mode)
+        entries.append(dict(index=index, name=variant.name, file=path.name, params=variant.params))
+    return entries
+
+
+# the sweep in each worker process (sent once per worker instead of once per chunk)
+_worker_sweep: Optional[Sweep] = None
+
+
+def _init_worker(sweep: Sweep, handle: SharedHandle) -> None:
+    global _worker_sweep
+    # a full private copy of the base model for this worker (see the module docs)
+    with attach(handle) as model:
+        sweep.base = model.to_cande_obj()
+    _worker_sweep = sweep
+
+
+def _write_chunk(indexes: Sequence[int], directory: Path, mode: str) -> List[Dict[str, Any]]:
+    return write_variants(_worker_sweep, indexes, directory, mode)
@@ -33,7 +33,8 @@ class CidSubObj(ChildRegistryMixin, Generic[CidObj, CidSeq, CidSubLine]):
         self.__dict__.update(kwargs)
 
     def _asdict(self) -> Dict[str, CidData]:
-        return {k:v for k,v in vars(self).items() if k not in "_container _idx".split()}
+        # __orig_class__ is set by typing when instantiated from a subscripted generic; it isn't data
+        return {k:v for k,v in vars(self).items() if k not in "_container _idx __orig_class__".split()}
 
     def __repr__(self) -> str:
         items = ("{}={!r}".format(k, v) for k,v in vars(self).items() if k not in "_container _idx".split())
@@ -2,5 +2,7 @@
 
 """Sub package for working with geometry."""
 
-from .coords import box, draw, get_xy
+from .coords import box, draw, get_xy, get_xy_many
 from .ops import splitLR, iter_segments
+from .mesh import outer_edges
+from .layers import split_layers
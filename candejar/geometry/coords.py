@@ -2,8 +2,11 @@
 
 """For working with x,y coordinate pairs."""
 
+import itertools
 from typing import Sequence, Mapping, Iterator, Union, TypeVar, Tuple, Any, Generic, Callable, Type, Optional, Iterable
 
+import numpy as np
+
 from .exc import GeometryError
 
 class XYCoordMeta(type):
@@ -64,54 +67,123 @@ _xy_getter_types: Sequence[Type[PointType]] = (XYCoords, Sequence, Mapping)
 _xy_getters: Sequence[Callable[[PointType],CoordPair]] = (_xy_attrs_case_insensitive, _xy_sequence, _xy_keys_case_insensitive)
 
 
-def get_xy(p: PointType) -> CoordPair:
-    getter_keys = (isinstance(p, T) for T in _xy_getter_types)
-    try:
-        xy_getter = dict(zip(getter_keys, _xy_getters))[True]
-    except KeyError:
-        if isinstance(p, Iterator):
-            raise CoordinatesError(
-                f"{type(p).__qualname__} object detected; iterators should not be passed to get_xy function")
-        if isinstance(p, str):
-            raise CoordinatesError(
-                f"{type(p).__qualname__} object detected; str objects should not be passed to get_xy function")
-        # not an iterator or string, safe to try unpacking without exhausting
-        try:
-            x,y = p
-        except TypeError:
-            raise CoordinatesError(f"{type(p).__qualname__} object detected")
-    else:
+def _resolving(xy_getter: Callable[[PointType],CoordPair]) -> Callable[[PointType],CoordPair]:
+    def resolve(p: PointType) -> CoordPair:
         try:
-            x, y = xy_getter(p)
+            return xy_getter(p)
         except CoordinatesError as e:
             raise CoordinatesError(f"Unable to resolve x,y coordinates from {type(p).__qualname__} object") from e
+    return resolve
+
+
+def _xy_unpack(p: Any) -> CoordPair:
+    try:
+        x, y = p
+    except TypeError:
+        raise CoordinatesError(f"{type(p).__qualname__} object detected")
+    return x, y
+
+
+# the last matching type wins (a Mapping is also an XYCoords if it has x,y attributes, etc.)
+_xy_resolvers = tuple(zip(reversed(_xy_getter_types), (_resolving(g) for g in reversed(_xy_getters))))
+
+
+def _xy_getter(p: PointType) -> Callable[[PointType],CoordPair]:
+    """The function that gets the (unconverted) x,y pair from the point p (and from points of the same type)."""
+    for T, xy_getter in _xy_resolvers:
+        if isinstance(p, T):
+            return xy_getter
+    if isinstance(p, Iterator):
+        raise CoordinatesError(
+            f"{type(p).__qualname__} object detected; iterators should not be passed to get_xy function")
+    if isinstance(p, str):
+        raise CoordinatesError(
+            f"{type(p).__qualname__} object detected; str objects should not be passed to get_xy function")
+    # not an iterator or string, safe to try unpacking without exhausting
+    return _xy_unpack
+
+
+def _float_pair(x: Any, y: Any) -> CoordPair:
     try:
         return float(x), float(y)
     except (TypeError, ValueError) as e:
         raise CoordinatesError(f"({type(x).__qualname__!r},{type(y).__qualname__!r}) "
                                f"is not a valid coordinate type pair") from e
 
+
+def get_xy(p: PointType) -> CoordPair:
+    return _float_pair(*_xy_getter(p)(p))
+
+
+def get_xy_many(points: Iterable[PointType]) -> np.ndarray:
+    """The (n, 2) float array of the x,y coordinates of any number of points of the types accepted by get_xy.
+
+    An (n, 2) array, or a sequence of coordinate pair sequences, is converted in one go; otherwise the way to get the
+    x,y pair is looked up once per point type rather than once per point.
+    """
+    if isinstance(points, np.ndarray) and points.ndim == 2 and points.shape[1] == 2:
+        try:
+            return points.astype(float)
+        except (TypeError, ValueError):
+            pass
+    if isinstance(points, str):
+        raise CoordinatesError(f"{type(points).__qualname__} object detected; str objects should not be passed to "
+                               f"get_xy_many function")
+    try:
+        points = points if isinstance(points, (Sequence, np.ndarray)) else list(points)
+    except TypeError:
+        raise CoordinatesError(f"{type(points).__qualname__} object detected") from None
+    if not len(points):
+        return np.empty((0, 2), dtype=float)
+    # homogeneous coordinate pair sequences (tuples, lists, arrays)
+    if isinstance(points[0], (tuple, list, np.ndarray)):
+        try:
+            xy = np.array(points, dtype=float)
+        except (TypeError, ValueError):
+            pass
+        else:
+            if xy.ndim == 2 and xy.shape[1] == 2:
+                return xy
+    xy_getters = {}
+
+    def pairs():
+        for p in points:
+            try:
+                xy_getter = xy_getters[type(p)]
+            except KeyError:
+                xy_getter = xy_getters[type(p)] = _xy_getter(p)
+            yield xy_getter(p)
+
+    try:
+        return np.fromiter(itertools.chain.from_iterable(pairs()), dtype=float, count=2 * len(points)).reshape(-1, 2)
+    except (TypeError, ValueError):
+        # report the offending point the same way get_xy does
+        return np.array([get_xy(p) for p in points], dtype=float).reshape(-1, 2)
+
+
 def box(p1:PointType, p2:PointType) -> Sequence[CoordPair]:
-    x1, y1, x2, y2 = get_xy(p1) + get_xy(p2)
+    (x1, y1), (x2, y2) = get_xy_many((p1, p2)).tolist()
     points = (x1, y1), (x2, y1), (x2, y2), (x1, y2)
     return points
 
 class DrawError(GeometryError): ...
 
-def draw(start: PointType, *, dxdy: Optional[Union[PointType, Iterable[PointType]]]=None):
+def draw(start: PointType, *, dxdy: Optional[Union[PointType, Iterable[PointType]]]=None) -> Iterator[CoordPair]:
     x, y = get_xy(start)
     yield x, y
-    if dxdy:
+    if isinstance(dxdy, np.ndarray) and dxdy.ndim == 2:
+        steps = get_xy_many(dxdy)
+    elif isinstance(dxdy, np.ndarray) or dxdy:
         try:
-            dx, dy = get_xy(dxdy)
+            steps = np.array([get_xy(dxdy)])
         except CoordinatesError:
             try:
-                idxdy = iter(dxdy)
+                iter(dxdy)
             except TypeError:
                 raise DrawError(f"{type(dxdy).__qualname__} dxdy argument detected") from None
-            dxs, dys = zip(*(get_xy(p) for p in idxdy))
-        else:
-            dxs, dys = [dx], [dy]
-        for dx, dy in zip(dxs, dys):
-            yield from draw((x + dx, y + dy))
-            x, y = x + dx, y + dy
+            steps = get_xy_many(dxdy)
+    else:
+        return
+    # adding the steps one at a time from the start point, as a running sum
+    path = np.cumsum(np.concatenate(([[x, y]], steps)), axis=0)
+    yield from (tuple(xy) for xy in path[1:].tolist())
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+"""Splitting a region into the bands between layer lines."""
+
+from typing import Iterable, List, Optional
+
+import numpy as np
+import shapely.geometry as geo
+import shapely.ops as ops
+
+from .exc import GeometryError
+from .ops import point_sides
+
+
+def split_layers(region: geo.base.BaseGeometry, layers: Iterable[geo.LineString], *,
+                 snap_tolerance: Optional[float] = None) -> List[geo.MultiPolygon]:
+    """The bands of a region between layer lines, all at once.
+
+    The layers are ordered non-crossing lines running across the region, all oriented the same way; the first band is
+    on the right of the first layer, each following band is on the left of the one layer and on the right of the next,
+    and the last band is on the left of the last layer. (For layers drawn left to right and ordered bottom to top, the
+    bands are ordered bottom to top.) This gives the same bands as splitting the region with splitLR one layer at a time
+    and splitting the left side again with the next layer.
+
+    The region boundary and the layers are combined and polygonized once; each of the resulting faces is assigned to a
+    band by the number of layers it is on the left of. If a snap_tolerance is given the layers are first snapped to the
+    region boundary (e.g. to close small gaps where layers end on the boundary).
+    """
+    layers = [geo.LineString(layer) for layer in layers]
+    if snap_tolerance is not None:
+        layers = [ops.snap(layer, region, snap_tolerance) for layer in layers]
+    faces = [face for face in ops.polygonize(ops.unary_union([region.boundary, *layers]))
+             if region.contains(face.representative_point())]
+    bands: List[List[geo.Polygon]] = [[] for _ in range(len(layers) + 1)]
+    if not faces:
+        return [geo.MultiPolygon(band) for band in bands]
+    points = np.array([face.representative_point().coords[0] for face in faces], dtype=float)
+    # (layers, faces) array of sides: 1 for left, -1 for right
+    sides = np.array([point_sides(points, layer) for layer in layers]).reshape(len(layers), len(faces))
+    if (sides == 0).any():
+        raise GeometryError("a layer band face is not on either side of a layer")
+    left = sides > 0
+    # the faces on the left of a layer are also on the left of the layers before it
+    if (left[1:] & ~left[:-1]).any():
+        raise GeometryError("layers must be ordered, oriented the same way, and must not cross")
+    for face, band in zip(faces, left.sum(axis=0).tolist()):
+        bands[band].append(face)
+    return [geo.MultiPolygon(band) for band in bands]
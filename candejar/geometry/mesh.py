@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+
+"""Array based operations for working with meshes of triangle and quadrilateral faces."""
+
+from typing import NamedTuple, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .exc import GeometryError
+
+
+class OuterEdges(NamedTuple):
+    """The edges of the outer boundary of a mesh.
+
+    edges: (n, 2) array of node indexes
+    normals: (n, 2) array of unit normals pointing away from the mesh
+    """
+    edges: np.ndarray
+    normals: np.ndarray
+
+
+class Incidence(NamedTuple):
+    """A compressed sparse row (CSR) incidence structure: row r is incident to the sorted columns
+    indices[indptr[r]:indptr[r + 1]]."""
+    indptr: np.ndarray
+    indices: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def row(self, r: int) -> np.ndarray:
+        """The columns of a row."""
+        return self.indices[self.indptr[r]:self.indptr[r + 1]]
+
+    def counts(self) -> np.ndarray:
+        """The number of columns of each row."""
+        return np.diff(self.indptr)
+
+    def rows(self, rows: np.ndarray) -> np.ndarray:
+        """The sorted columns of any of the rows (each column once)."""
+        rows = np.asarray(rows, dtype=np.intp).reshape(-1)
+        if (rows < 0).any() or (rows >= len(self)).any():
+            raise GeometryError(f"row out of range for {len(self)} rows")
+        starts, stops = self.indptr[rows], self.indptr[rows + 1]
+        lengths = stops - starts
+        # the positions in indices of all of the columns of the rows
+        positions = np.repeat(stops - np.cumsum(lengths), lengths) + np.arange(lengths.sum())
+        return np.unique(self.indices[positions])
+
+
+def incidence(rows: np.ndarray, columns: np.ndarray, n_rows: int) -> Incidence:
+    """The incidence of n_rows rows made from (row, column) pairs; repeated pairs are kept once."""
+    rows = np.asarray(rows, dtype=np.intp).reshape(-1)
+    columns = np.asarray(columns, dtype=np.intp).reshape(-1)
+    if len(rows) != len(columns):
+        raise GeometryError("rows and columns must be the same length")
+    if len(rows) and (rows.min() < 0 or rows.max() >= n_rows):
+        raise GeometryError(f"row out of range for {n_rows} rows")
+    order = np.lexsort((columns, rows))
+    rows, columns = rows[order], columns[order]
+    if len(rows):
+        new = np.concatenate(([True], (rows[1:] != rows[:-1]) | (columns[1:] != columns[:-1])))
+        rows, columns = rows[new], columns[new]
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n_rows)))).astype(np.intp)
+    return Incidence(indptr, columns)
+
+
+def face_edges(faces: np.ndarray) -> np.ndarray:
+    """The (n, 3) array of (node index, node index, face index) rows for all of the edges of the faces.
+
+    The faces argument is a (m, 4) array of node indexes; triangles have -1 for the last entry.
+    """
+    faces = np.asarray(faces, dtype=np.intp)
+    if faces.ndim != 2 or faces.shape[1] != 4:
+        raise GeometryError("faces must be a (m, 4) array of node indexes")
+    face_idx = np.arange(len(faces), dtype=np.intp)
+    is_tri = faces[:, 3] < 0
+    parts = []
+    for mask, corners in ((~is_tri, (0, 1, 2, 3)), (is_tri, (0, 1, 2))):
+        sub = faces[mask]
+        for a, b in zip(corners, corners[1:] + corners[:1]):
+            parts.append(np.column_stack((sub[:, a], sub[:, b], face_idx[mask])))
+    return np.concatenate(parts) if parts else np.empty((0, 3), dtype=np.intp)
+
+
+def drop_repeats(faces: np.ndarray) -> np.ndarray:
+    """A copy of a (m, 4) array of faces (node indexes, -1 for missing nodes) with repeated node indexes dropped, e.g. a
+    triangle stored as a quadrilateral with k == l. The remaining node indexes keep their order and the missing ones
+    are moved to the end."""
+    faces = np.array(faces, dtype=np.intp).reshape(-1, 4)
+    repeated = np.zeros(faces.shape, dtype=bool)
+    for c in range(1, 4):
+        repeated[:, c] = (faces[:, :c] == faces[:, c:c + 1]).any(axis=1)
+    faces[repeated] = -1
+    return np.take_along_axis(faces, np.argsort(faces < 0, axis=1, kind="stable"), axis=1)
+
+
+def boundary_edges(faces: np.ndarray) -> np.ndarray:
+    """The (n, 3) array of (node index, node index, face index) rows for the edges used by only one face."""
+    edges = face_edges(faces)
+    keys = np.sort(edges[:, :2], axis=1)
+    _, inverse, counts = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+    return edges[counts[inverse.ravel()] == 1]
+
+
+def outer_edges(faces: np.ndarray, xy: np.ndarray) -> OuterEdges:
+    """The edges of the outer boundary of a mesh, with their outward normals.
+
+    The outer boundary is the chain of boundary edges that includes the left-most node of the mesh; boundary edges
+    around holes in the mesh are excluded.
+    """
+    xy = np.asarray(xy, dtype=float)
+    faces = np.asarray(faces, dtype=np.intp)
+    edges = boundary_edges(faces)
+    if not len(edges):
+        raise GeometryError("mesh has no boundary edges")
+
+    # walk the boundary edges connected to the left-most boundary node
+    adjacent: Dict[int, List[int]] = dict()
+    for a, b in edges[:, :2].tolist():
+        adjacent.setdefault(a, []).append(b)
+        adjacent.setdefault(b, []).append(a)
+    boundary_nodes = np.fromiter(adjacent, dtype=np.intp, count=len(adjacent))
+    start = int(boundary_nodes[np.lexsort((xy[boundary_nodes, 1], xy[boundary_nodes, 0]))[0]])
+    outer: Set[int] = {start}
+    stack = [start]
+    while stack:
+        for other in adjacent[stack.pop()]:
+            if other not in outer:
+                outer.add(other)
+                stack.append(other)
+    edges = edges[np.isin(edges[:, 0], np.fromiter(outer, dtype=np.intp, count=len(outer)))]
+
+    # unit normals, flipped to point away from the centroid of the face each edge belongs to
+    a, b = xy[edges[:, 0]], xy[edges[:, 1]]
+    d = b - a
+    normals = np.column_stack((d[:, 1], -d[:, 0]))
+    normals /= np.hypot(normals[:, 0], normals[:, 1])[:, None]
+    face_nodes = faces[edges[:, 2]]
+    valid = face_nodes >= 0
+    centroids = (xy[np.where(valid, face_nodes, 0)] * valid[..., None]).sum(axis=1) / valid.sum(axis=1)[:, None]
+    inward = np.einsum("ij,ij->i", normals, centroids - (a + b) / 2) > 0
+    normals[inward] *= -1
+    return OuterEdges(edges[:, :2], normals)
+
+
+def interior_points(coords: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """The (m, 2) array of the representative (interior) points of polygons, the same points shapely/GEOS gives.
+
+    The polygons (without holes and not closed) are the coords[offsets[i]:offsets[i + 1]] rows of an (n, 2) coordinates
+    array. Like GEOS, the point is the middle of the widest section of the polygon along a horizontal scan line, placed
+    between the vertex y values nearest the middle of the polygon's y extents. Polygons with no area get their first
+    point.
+    """
+    coords = np.asarray(coords, dtype=float)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    counts = np.diff(offsets)
+    if (counts < 1).any():
+        raise GeometryError("polygons require at least one point")
+    result = np.empty((len(counts), 2), dtype=float)
+    # polygons with the same number of points are done together
+    for count in np.unique(counts).tolist():
+        rows = np.flatnonzero(counts == count)
+        p0 = coords[offsets[rows][:, None] + np.arange(count)]
+        p1 = np.roll(p0, -1, axis=1)
+        y = p0[..., 1]
+        y_min, y_max = y.min(axis=1, keepdims=True), y.max(axis=1, keepdims=True)
+        centre = (y_min + y_max) / 2.0
+        lo = np.where(y <= centre, y, -np.inf).max(axis=1, keepdims=True)
+        hi = np.where(y > centre, y, y_max).min(axis=1, keepdims=True)
+        scan_y = (hi + lo) / 2.0
+        # edges crossing the scan line (which passes through no vertexes unless the polygon is flat)
+        y0, y1, x0, x1 = p0[..., 1], p1[..., 1], p0[..., 0], p1[..., 0]
+        crossing = ((y0 < scan_y) != (y1 < scan_y)) & (y0 != y1) & (lo != hi)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = np.where(x0 == x1, x0, x0 + (scan_y - y0) / ((y1 - y0) / (x1 - x0)))
+        x = np.sort(np.where(crossing, x, np.inf), axis=1)
+        if count % 2:
+            x = np.concatenate((x, np.full((len(rows), 1), np.inf)), axis=1)
+        left, right = x[:, 0::2], x[:, 1::2]
+        with np.errstate(invalid="ignore"):
+            widths = np.where(np.isfinite(right), right - left, 0.0)
+        best = widths.argmax(axis=1)
+        has_width = widths[np.arange(len(rows)), best] > 0
+        mid = (left[np.arange(len(rows)), best] + right[np.arange(len(rows)), best]) / 2.0
+        result[rows] = np.where(has_width[:, None], np.column_stack((mid, scan_y[:, 0])), p0[:, 0])
+    return result
+
+
+def face_neighbors(faces: np.ndarray) -> Incidence:
+    """The incidence of each face with the other faces sharing any of its edges.
+
+    The faces argument is a (m, 4) array of node indexes with -1 for the missing nodes: -1 for the last entry of
+    triangles, and for the last two entries of lines (faces with a single edge). Repeated node indexes (e.g. triangles
+    stored with k == l) are dropped, so faces sharing only a corner are not neighbors.
+    """
+    faces = np.asarray(faces, dtype=np.intp)
+    if faces.ndim != 2 or faces.shape[1] != 4:
+        raise GeometryError("faces must be a (m, 4) array of node indexes")
+    counts = (faces >= 0).sum(axis=1)
+    if (counts < 2).any() or ((faces < 0) & (np.arange(4) < counts[:, None])).any():
+        raise GeometryError("faces require at least two node indexes, followed by any missing (-1) ones")
+    faces = drop_repeats(faces)
+    counts = (faces >= 0).sum(axis=1)
+    parts = [np.empty((0, 3), dtype=np.intp)]
+    for count, corners in ((4, (0, 1, 2, 3)), (3, (0, 1, 2)), (2, (0, 1))):
+        face_idx = np.flatnonzero(counts == count)
+        # a line has a single edge
+        pairs = zip(corners, corners[1:] + corners[:1]) if count > 2 else [corners]
+        parts.extend(np.column_stack((faces[face_idx, a], faces[face_idx, b], face_idx)) for a, b in pairs)
+    edges = np.concatenate(parts)
+    # faces sharing an edge are next to each other after sorting by edge
+    keys = np.sort(edges[:, :2], axis=1)
+    order = np.lexsort((edges[:, 2], keys[:, 1], keys[:, 0]))
+    keys, owners = keys[order], edges[order, 2]
+    starts = np.flatnonzero(np.concatenate(([True], (keys[1:] != keys[:-1]).any(axis=1)))) if len(keys) else \
+        np.empty(0, dtype=np.intp)
+    sizes = np.diff(np.concatenate((starts, [len(keys)])))
+    # pair each edge owner with every other owner of the same edge
+    group_start, group_size = np.repeat(starts, sizes), np.repeat(sizes, sizes)
+    offset = np.arange(len(keys)) - group_start
+    n_others = group_size - 1
+    others = np.arange(n_others.sum()) - np.repeat(np.cumsum(n_others) - n_others, n_others)
+    others += np.repeat(offset, n_others) <= others
+    rows = np.repeat(owners, n_others)
+    columns = owners[np.repeat(group_start, n_others) + others]
+    keep = rows != columns
+    return incidence(rows[keep], columns[keep], len(faces))
+
+
+class BoxGrid(NamedTuple):
+    """Boxes (x min, y min, x max, y max) listed in the cells of a uniform grid that they overlap.
+
+    origin: the (x, y) of the lower left corner of the grid
+    cell: the size of the square cells
+    shape: the (columns, rows) of the grid
+    cells: the incidence of the cells (numbered column * rows + row) with the boxes
+    """
+    origin: np.ndarray
+    cell: float
+    shape: Tuple[int, int]
+    cells: Incidence
+
+    def candidates(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """The (point index, box index) pairs of the points and the boxes listed in their cells, in point then box
+        order."""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        columns, rows = self.shape
+        with np.errstate(invalid="ignore"):
+            ij = np.floor((points - self.origin) / self.cell)
+        inside = ((ij >= 0) & (ij < (columns, rows))).all(axis=1)
+        point_idx = np.flatnonzero(inside)
+        cell_idx = ij[inside, 0].astype(np.intp) * rows + ij[inside, 1].astype(np.intp)
+        starts, stops = self.cells.indptr[cell_idx], self.cells.indptr[cell_idx + 1]
+        lengths = stops - starts
+        positions = np.repeat(stops - np.cumsum(lengths), lengths) + np.arange(lengths.sum())
+        return np.repeat(point_idx, lengths), self.cells.indices[positions]
+
+
+def box_grid(boxes: np.ndarray, cell: Optional[float] = None) -> BoxGrid:
+    """The grid of the (m, 4) array of boxes. The cells are the size of the median box (or larger, so there are no
+    more than about four cells per box) unless a cell size is given."""
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    if not len(boxes):
+        return BoxGrid(np.zeros(2), 1.0, (0, 0), incidence([], [], 0))
+    if not np.isfinite(boxes).all():
+        raise GeometryError("boxes must be finite")
+    origin = boxes[:, :2].min(axis=0)
+    extents = boxes[:, 2:].max(axis=0) - origin
+    if cell is None:
+        sizes = np.maximum(boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1])
+        cell = max(float(np.median(sizes)), float(np.sqrt(extents.prod() / (4 * len(boxes)))),
+                   float(extents.max()) / 4096, 1e-12)
+    elif not cell > 0:
+        raise GeometryError("the cell size must be positive")
+    # the last cell includes the maximum extents
+    shape = tuple((np.floor(extents / cell).astype(np.intp) + 1).tolist())
+    lo = np.floor((boxes[:, :2] - origin) / cell).astype(np.intp)
+    hi = np.minimum(np.floor((boxes[:, 2:] - origin) / cell).astype(np.intp), np.array(shape) - 1)
+    spans = hi - lo + 1
+    counts = spans.prod(axis=1)
+    box_idx = np.repeat(np.arange(len(boxes)), counts)
+    k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    column = lo[box_idx, 0] + k // spans[box_idx, 1]
+    row = lo[box_idx, 1] + k % spans[box_idx, 1]
+    return BoxGrid(origin, cell, shape, incidence(column * shape[1] + row, box_idx, shape[0] * shape[1]))
+
+
+def face_boxes(vertices: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """The (m, 4) bounding boxes of the faces with (m, 4, 2) padded vertexes (counts of 3 for triangles)."""
+    used = np.arange(vertices.shape[1]) < counts[:, None]
+    lo = np.where(used[..., None], vertices, np.inf).min(axis=1)
+    hi = np.where(used[..., None], vertices, -np.inf).max(axis=1)
+    return np.concatenate((lo, hi), axis=1)
+
+
+def points_in_faces(points: np.ndarray, vertices: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Whether each of the points is inside of (or on the boundary of) the face with the same index.
+
+    The faces are (n, 4, 2) arrays of padded vertexes, with counts of 3 for triangles. The faces can be any simple
+    polygon (not only convex ones). The edges are crossed the same way no matter their direction, so a point on an edge
+    shared by two faces is inside of just one of them unless it is exactly on the line of the edge.
+    """
+    px, py = points[:, 0], points[:, 1]
+    inside = np.zeros(len(points), dtype=bool)
+    on_edge = np.zeros(len(points), dtype=bool)
+    rows = np.arange(len(points))
+    for c in range(vertices.shape[1]):
+        valid = c < counts
+        a = vertices[:, c]
+        b = vertices[rows, np.where(c + 1 < counts, c + 1, 0)]
+        # the edge from its lower to its upper end, crossed if the point y is in [lower, upper)
+        lower_first = (a[:, 1] < b[:, 1]) | ((a[:, 1] == b[:, 1]) & (a[:, 0] <= b[:, 0]))
+        lo = np.where(lower_first[:, None], a, b)
+        hi = np.where(lower_first[:, None], b, a)
+        crossed = valid & (lo[:, 1] <= py) & (py < hi[:, 1])
+        # positive when the point is on the left of the upward edge
+        cross = (hi[:, 0] - lo[:, 0]) * (py - lo[:, 1]) - (hi[:, 1] - lo[:, 1]) * (px - lo[:, 0])
+        inside ^= crossed & (cross > 0)
+        on_edge |= valid & (cross == 0) & (np.minimum(a[:, 0], b[:, 0]) <= px) & (px <= np.maximum(a[:, 0], b[:, 0])) \
+            & (lo[:, 1] <= py) & (py <= hi[:, 1])
+    return inside | on_edge
+
+
+def locate_points(points: np.ndarray, vertices: np.ndarray, counts: np.ndarray, grid: Optional[BoxGrid] = None
+                  ) -> np.ndarray:
+    """The index of the (first) face containing each of the points; -1 for points not in any of the faces.
+
+    The faces are (m, 4, 2) arrays of padded vertexes, with counts of 3 for triangles. The grid is the box_grid of the
+    face bounding boxes (made if not given).
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    if grid is None:
+        grid = box_grid(face_boxes(vertices, counts))
+    point_idx, face_idx = grid.candidates(points)
+    found = points_in_faces(points[point_idx], vertices[face_idx], counts[face_idx])
+    point_idx, face_idx = point_idx[found], face_idx[found]
+    result = np.full(len(points), -1, dtype=np.intp)
+    # the candidates are in point then face order
+    located, first = np.unique(point_idx, return_index=True)
+    result[located] = face_idx[first]
+    return result
+
+
+def face_weights(points: np.ndarray, vertices: np.ndarray, counts: np.ndarray, iterations: int = 20) -> np.ndarray:
+    """The (n, 4) interpolation weights of the vertexes of the faces for the points with the same index.
+
+    The weights of triangles are barycentric (the last weight is 0), and the weights of quadrilaterals are bilinear (the
+    shape functions at the point mapped to the unit square; found with Newton iterations).
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    weights = np.zeros((len(points), 4), dtype=float)
+    tri = counts == 3
+    if tri.any():
+        p, (v1, v2, v3) = points[tri], vertices[tri, :3].transpose(1, 0, 2)
+        d = (v2[:, 1] - v3[:, 1]) * (v1[:, 0] - v3[:, 0]) + (v3[:, 0] - v2[:, 0]) * (v1[:, 1] - v3[:, 1])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            w1 = ((v2[:, 1] - v3[:, 1]) * (p[:, 0] - v3[:, 0]) + (v3[:, 0] - v2[:, 0]) * (p[:, 1] - v3[:, 1])) / d
+            w2 = ((v3[:, 1] - v1[:, 1]) * (p[:, 0] - v3[:, 0]) + (v1[:, 0] - v3[:, 0]) * (p[:, 1] - v3[:, 1])) / d
+        weights[tri, :3] = np.column_stack((w1, w2, 1.0 - w1 - w2))
+    quad = counts == 4
+    if quad.any():
+        p, v = points[quad], vertices[quad]
+        # natural coordinates of the corners (i, j, k, l)
+        sx, sy = np.array([-1.0, 1.0, 1.0, -1.0]), np.array([-1.0, -1.0, 1.0, 1.0])
+        xi, eta = np.zeros(len(p)), np.zeros(len(p))
+        for _ in range(iterations):
+            n = (1 + sx * xi[:, None]) * (1 + sy * eta[:, None]) / 4
+            dn_dxi = sx * (1 + sy * eta[:, None]) / 4
+            dn_deta = sy * (1 + sx * xi[:, None]) / 4
+            r = np.einsum("nc,ncd->nd", n, v) - p
+            j = np.stack((np.einsum("nc,ncd->nd", dn_dxi, v), np.einsum("nc,ncd->nd", dn_deta, v)), axis=2)
+            det = j[:, 0, 0] * j[:, 1, 1] - j[:, 0, 1] * j[:, 1, 0]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                d_xi = (j[:, 1, 1] * r[:, 0] - j[:, 0, 1] * r[:, 1]) / det
+                d_eta = (-j[:, 1, 0] * r[:, 0] + j[:, 0, 0] * r[:, 1]) / det
+            xi, eta = xi - d_xi, eta - d_eta
+            if not (np.abs(d_xi) > 1e-14).any() and not (np.abs(d_eta) > 1e-14).any():
+                break
+        weights[quad] = (1 + sx * xi[:, None]) * (1 + sy * eta[:, None]) / 4
+    return weights
@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 
 """Operations for working with geometries."""
-from typing import NamedTuple, Tuple, Iterator, Optional, Dict, List, DefaultDict, Counter, Set, Union, TypeVar
+from typing import NamedTuple, Tuple, Iterator, Optional, Dict, List, Counter, Union, TypeVar, \
+    Sequence
 
+import numpy as np
 import shapely.geometry as geo
 import shapely.ops as ops
 import shapely.affinity as affine
@@ -83,100 +85,168 @@ def iter_oriented_line_pt_idx(to_orient: String_or_Ring, path: String_or_Ring,
         raise GeometryError("a line like geometry object is required")
 
     # the path will decide the resulting line index order
-    coords_to_orient = list(to_orient.coords)
-    points_to_orient = geo.MultiPoint(coords_to_orient)
-    path_segments = geo.MultiLineString(list(iter_segments(path)))
-    if len(path_segments)==0:
+    points = _coords_array(to_orient)
+    starts, ends = segment_arrays(path)
+    if len(starts)==0:
         raise GeometryError("failed to break path into segments")
+    # the closest path segment capturing each line point (-1 for un-captured points)
+    _, capturing_sdx = nearest_segments(points, starts, ends, buffer)
+    captured = capturing_sdx >= 0
 
-    # sorting dictionaries
-    lpdx_to_sdx_dict: DefaultDict[int,Set[int]] = DefaultDict(set)
-    lpdx_to_min_dist_dict: Dict[int,float] = dict()
-    sdx_to_lpdx_dict: Dict[int, List[int]] = DefaultDict(list)
-
-    if to_orient.is_closed:
-        # handle ring-like line
-        repeated_point = points_to_orient[0]
-        # get the capturing segment
-        min_distance_to_repeated_point = min(repeated_point.distance(seg) for seg in path_segments)
-        # if the repeated ring end point is NOT captured, ignore; otherwise this needs handling
-        if min_distance_to_repeated_point<=buffer:
-            # repeated point is captured - needs handling
-            p_second, p_second_to_last = points_to_orient[1], points_to_orient[-2]
-            # get min distances for second and second-to-last points (are separate points since the line is simple)
-            d_second = min(p_second.distance(seg) for seg in path_segments)
-            d_second_to_last = min(p_second_to_last.distance(seg) for seg in path_segments)
-            # at least one of the two neighboring points to the repeated ring end point must be captured
-            captured_dict = {1: d_second<=buffer, -2: d_second_to_last<=buffer}
-            if True in captured_dict.values():
-                if captured_dict[1] and captured_dict[-2]:
-                    # both neighbors captured; discard both ring end points (they aren't needed)
-                    points_to_orient = geo.MultiPoint(points_to_orient[1:-1])
-                elif captured_dict[1]:
-                    # only pdx==1 captured, discard last line point
-                    points_to_orient = geo.MultiPoint(points_to_orient[:-1])
-                elif captured_dict[-2]:
-                    # only pdx==-2 captured, discard first line point
-                    points_to_orient = geo.MultiPoint(points_to_orient[1:])
-            else:
-                raise GeometryError("invalid path given to orient the ring-like line; path must capture a neighbor "
-                                    "of the repeated ring end points")
-
+    # the line points taking part; for ring-like lines one or both of the repeated ring end points are discarded
+    first, last = 0, len(points)
     # for adjusting final index results later
-    try:
-        lpdx_adjustment: int = {True:1,False:0}[captured_dict[-2]]
-    except NameError:
-        lpdx_adjustment = 0
-
-    # point capture algorithm
-    lpdx: int
-    lp: geo.Point
-    for (lpdx,lp) in enumerate(points_to_orient):
-        seg: geo.LineString
-        # match line point indexes with path segment indexes
-        for sdx, seg in enumerate(path_segments):
-            d: float = lp.distance(seg)
-            # associate each line point index with path segment indexes within the buffer
-            if d<=lpdx_to_min_dist_dict.get(lpdx,buffer):
-                if d<lpdx_to_min_dist_dict.get(lpdx, buffer):
-                    # keep only the closest path segment
-                    lpdx_to_sdx_dict[lpdx].clear()
-                lpdx_to_min_dist_dict[lpdx]=d
-                lpdx_to_sdx_dict[lpdx].add(sdx)
-        # point may fall on multiple segments
-        try:
-            # the Jacqueline Rule: the first segment in the series captures the point
-            closest_sdx = min(lpdx_to_sdx_dict[lpdx])
-        except ValueError:
-            # un-captured lp (lp not within buffer for any segments)
-            pass
+    lpdx_adjustment = 0
+    if to_orient.is_closed and captured[0]:
+        # repeated point is captured - at least one of its neighbors must also be captured
+        if captured[1] and captured[-2]:
+            first, last = 1, last - 1
+        elif captured[1]:
+            last -= 1
+        elif captured[-2]:
+            first = 1
         else:
-            # captured lp
-            sdx_to_lpdx_dict[closest_sdx].append(lpdx)
-    del lpdx,lp
-    sdx_to_lpdx_sorted = dict(sorted(sdx_to_lpdx_dict.items()))
-    # now have a 1 to 1 relationship for segments and points (but may be multiple points per segment)
-    lpdx_bag: List[int]
-    if all(len(lpdx_bag)==1 for lpdx_bag in sdx_to_lpdx_sorted.values()):
-        # ALL 1 to 1
-        yield from (lpdx for (lpdx,) in sdx_to_lpdx_sorted.values())
+            raise GeometryError("invalid path given to orient the ring-like line; path must capture a neighbor "
+                                "of the repeated ring end points")
+        lpdx_adjustment = int(bool(captured[-2]))
+
+    # group the captured line point indexes by capturing segment, in segment order (a stable sort keeps the line
+    # point order within the groups)
+    sdx = capturing_sdx[first:last]
+    lpdxs = np.flatnonzero(sdx >= 0)
+    lpdxs = lpdxs[np.argsort(sdx[lpdxs], kind="stable")]
+    group_sdxs, group_starts, group_sizes = np.unique(sdx[lpdxs], return_index=True, return_counts=True)
+    if (group_sizes==1).all():
+        # ALL 1 to 1 (NOTE: the ring end point adjustment is not applied here; kept from the original behavior)
+        yield from lpdxs.tolist()
+        return
+    line_points = points[first:last]
+    for group_sdx, group_start, group_size in zip(group_sdxs.tolist(), group_starts.tolist(), group_sizes.tolist()):
+        bag = lpdxs[group_start:group_start + group_size]
+        if group_size > 1:
+            # not 1 to 1; iterate based on distance to first segment point (then by line point index)
+            d = _point_distances(line_points[bag], starts[group_sdx])
+            bag = bag[np.lexsort((bag, d))]
+        yield from (bag + lpdx_adjustment).tolist()
+
+
+# above this many point x segment pairs the segments are bucketed in a grid instead of checking all of the pairs
+DENSE_PAIRS = 1 << 16
+
+
+def _coords_array(geom: geo.base.BaseGeometry) -> np.ndarray:
+    """The (n, 2) array of the x, y coordinates of a geometry."""
+    coords = np.asarray(geom.coords, dtype=float)
+    return coords[:, :2] if coords.ndim == 2 else coords.reshape(0, 2)
+
+
+def segment_arrays(line: geoLine) -> Tuple[np.ndarray, np.ndarray]:
+    """The (n, 2) start and end point arrays of the segments of a line or ring (the same segments as iter_segments)."""
+    coords = _coords_array(line)
+    if isinstance(line, geo.LinearRing):
+        coords = coords[:-1]
+    return coords[:-1], coords[1:]
+
+
+def _point_distances(points: np.ndarray, others: np.ndarray) -> np.ndarray:
+    d = points - others
+    return np.sqrt(d[..., 0] * d[..., 0] + d[..., 1] * d[..., 1])
+
+
+def point_segment_distances(points: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """The distances between points and segments (broadcast together; e.g. points[:, None] for a distance matrix).
+
+    Computed the same way as the GEOS point to segment distance (used by shapely), so the results can be compared.
+    """
+    px, py = points[..., 0], points[..., 1]
+    ax, ay, bx, by = starts[..., 0], starts[..., 1], ends[..., 0], ends[..., 1]
+    abx, aby = bx - ax, by - ay
+    len2 = abx * abx + aby * aby
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = ((px - ax) * abx + (py - ay) * aby) / len2
+        s = ((ay - py) * abx - (ax - px) * aby) / len2
+        d = np.abs(s) * np.sqrt(len2)
+    d_start = _point_distances(points, starts)
+    d_end = _point_distances(points, ends)
+    return np.where((len2 == 0) | (r <= 0), d_start, np.where(r >= 1, d_end, d))
+
+
+def nearest_segments(points: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                     buffer: float) -> Tuple[np.ndarray, np.ndarray]:
+    """The distance to and index of the closest segment within the buffer distance of each point.
+
+    Ties go to the first segment. Points with no segment within the buffer get an infinite distance and index -1.
+    Small problems check every point x segment pair; larger ones only the pairs in the same cells of a grid.
+    """
+    points, starts, ends = (np.asarray(a, dtype=float).reshape(-1, 2) for a in (points, starts, ends))
+    n, m = len(points), len(starts)
+    dmin = np.full(n, np.inf)
+    sdx = np.full(n, -1, dtype=np.intp)
+    if not n or not m:
+        return dmin, sdx
+    pairs = _grid_pairs(points, starts, ends, buffer) if n * m > DENSE_PAIRS and np.isfinite(buffer) else None
+    if pairs is None:
+        # all of the pairs, a block of points at a time
+        chunk = max(1, DENSE_PAIRS // m)
+        for lo in range(0, n, chunk):
+            d = point_segment_distances(points[lo:lo + chunk, None], starts, ends)
+            closest = d.argmin(axis=1)
+            dmin[lo:lo + chunk] = d[np.arange(len(d)), closest]
+            sdx[lo:lo + chunk] = closest
     else:
-        # some not 1 to 1
-        sdx: int
-        for sdx, lpdx_bag in sdx_to_lpdx_sorted.items():
-            if len(lpdx_bag)==1:
-                # 1 to 1
-                yield lpdx_bag[0]+lpdx_adjustment
-            else:
-                # not 1 to 1; iterate based on distance to first segment point
-                dist_lpdx_sub_list: List[Tuple[float,int]] = []
-                seg_point = geo.Point(path_segments[sdx].coords[0])
-                lpdx: int
-                for lpdx in lpdx_bag:
-                    d = seg_point.distance(points_to_orient[lpdx])
-                    dist_lpdx_sub_list.append((d,lpdx))
-                dist_lpdx_sub_list_sorted = sorted(dist_lpdx_sub_list)
-                yield from (lpdx+lpdx_adjustment for _,lpdx in dist_lpdx_sub_list_sorted)
+        pdx, cdx = pairs
+        d = point_segment_distances(points[pdx], starts[cdx], ends[cdx])
+        # the first of the closest segments for each point
+        order = np.lexsort((cdx, d, pdx))
+        first = order[np.concatenate(([True], pdx[order][1:] != pdx[order][:-1]))] if len(order) else order
+        dmin[pdx[first]] = d[first]
+        sdx[pdx[first]] = cdx[first]
+    outside = ~(dmin <= buffer)
+    dmin[outside] = np.inf
+    sdx[outside] = -1
+    return dmin, sdx
+
+
+def _grid_pairs(points: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                buffer: float) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """The (point index, segment index) pairs sharing a grid cell, including every pair within the buffer distance.
+
+    None if the grid doesn't help (e.g. many segments spanning many cells).
+    """
+    n, m = len(points), len(starts)
+    lo, hi = np.minimum(starts, ends), np.maximum(starts, ends)
+    # a small extra margin for rounding
+    pad = buffer + 1e-9 * (float(np.abs(np.concatenate((lo, hi, points))).max()) + 1.0)
+    lo, hi = lo - pad, hi + pad
+    size = float(np.median((hi - lo).max(axis=1)))
+    origin = lo.min(axis=0)
+    cell_lo = np.floor((lo - origin) / size).astype(np.int64)
+    cell_hi = np.floor((hi - origin) / size).astype(np.int64)
+    spans = cell_hi - cell_lo + 1
+    counts = spans[:, 0] * spans[:, 1]
+    total = int(counts.sum())
+    if total > 8 * (n + m):
+        return None
+    # the cells covered by each segment bounding box
+    seg = np.repeat(np.arange(m), counts)
+    k = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    cx = cell_lo[seg, 0] + k % spans[seg, 0]
+    cy = cell_lo[seg, 1] + k // spans[seg, 0]
+    ny = int(cell_hi[:, 1].max()) + 1
+    keys = cx * ny + cy
+    order = np.argsort(keys, kind="stable")
+    keys, seg = keys[order], seg[order]
+    # the cell of each point; points outside of the grid get no pairs
+    point_cells = np.floor((points - origin) / size).astype(np.int64)
+    inside = (point_cells >= 0).all(axis=1) & (point_cells[:, 0] <= cell_hi[:, 0].max()) & \
+             (point_cells[:, 1] < ny)
+    point_keys = point_cells[:, 0] * ny + point_cells[:, 1]
+    first = np.searchsorted(keys, point_keys, side="left")
+    stop = np.searchsorted(keys, point_keys, side="right")
+    n_pairs = np.where(inside, stop - first, 0)
+    pdx = np.repeat(np.arange(n), n_pairs)
+    offsets = np.arange(len(pdx)) - np.repeat(np.cumsum(n_pairs) - n_pairs, n_pairs)
+    return pdx, seg[np.repeat(first, n_pairs) + offsets]
 
 
 def iter_segments(line: geoLine) -> Iterator[geo.LineString]:
@@ -186,59 +256,167 @@ def iter_segments(line: geoLine) -> Iterator[geo.LineString]:
     yield from (geo.LineString(line.coords[x:x + 2]) for x in range(len(line.coords) - 1))
 
 
+def _signed_area(ring: np.ndarray) -> float:
+    """The signed (shoelace) area of a closed ring; positive for counterclockwise rings."""
+    x, y = ring[:, 0], ring[:, 1]
+    return float(np.dot(x[:-1], y[1:]) - np.dot(x[1:], y[:-1])) / 2
+
+
+def polygon_sides(polygons: Sequence[geo.Polygon], splitter: String_or_Ring) -> List[Optional[str]]:
+    """Which side of a splitter ("left" or "right") each of the polygons is on, from the orientations of the common edges.
+
+    The polygon rings are oriented with the interior on the left (by signed area: exterior counterclockwise, holes
+    clockwise). The common edges are the ring segments lying on the splitter; a polygon is on the left when its rings
+    run along them in the same direction as the splitter. All of the polygons are classified together. A polygon gets
+    None when it has no common edges or they disagree.
+    """
+    splitter_a, splitter_b = segment_arrays(splitter)
+    sides: List[Optional[str]] = [None] * len(polygons)
+    ring_parts: List[np.ndarray] = []
+    ring_polys: List[np.ndarray] = []
+    for pdx, p in enumerate(polygons):
+        for ring, ccw in ((p.exterior, True), *((interior, False) for interior in p.interiors)):
+            coords = np.asarray(ring.coords, dtype=float)[:, :2]
+            if (_signed_area(coords) > 0) != ccw:
+                coords = coords[::-1]
+            ring_parts.append(coords)
+            ring_polys.append(np.full(len(coords) - 1, pdx))
+    if not ring_parts or not len(splitter_a):
+        return sides
+    a = np.concatenate([c[:-1] for c in ring_parts])
+    b = np.concatenate([c[1:] for c in ring_parts])
+    ring_poly = np.concatenate(ring_polys)
+    # the split points are on the splitter up to rounding
+    tol = 1e-9 * (float(np.abs(np.concatenate((a, splitter_a, splitter_b))).max()) + 1.0)
+
+    # the ring segments with both ends and the midpoint on the splitter are common edges
+    n = len(a)
+    _, sdx = nearest_segments(np.concatenate((a, b, (a + b) / 2)), splitter_a, splitter_b, tol)
+    on_splitter = (sdx[:n] >= 0) & (sdx[n:2 * n] >= 0) & (sdx[2 * n:] >= 0)
+    mid_sdx = sdx[2 * n:][on_splitter]
+    splitter_dir = splitter_b[mid_sdx] - splitter_a[mid_sdx]
+    # +1: the interior is on the left of the splitter; -1: on the right; 0: undecided
+    side = np.sign(np.einsum("ij,ij->i", b[on_splitter] - a[on_splitter], splitter_dir))
+    side_poly = ring_poly[on_splitter]
+    for pdx in range(len(polygons)):
+        decided = set(side[(side_poly == pdx) & (side != 0)].tolist())
+        if len(decided) == 1:
+            sides[pdx] = "left" if decided.pop() > 0 else "right"
+    return sides
+
+
+def point_sides(points: np.ndarray, line: String_or_Ring) -> np.ndarray:
+    """Which side of a line each of the points is on: 1 for the left, -1 for the right, and 0 for points on the line.
+
+    The side is decided by the closest segment of the line. When the closest point of the line is a vertex joining two
+    segments, a point is on the left of a left turn if it is on the left of both segments, and on the left of a right
+    turn if it is on the left of either of them.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    starts, ends = segment_arrays(line)
+    if not len(starts):
+        raise GeometryError("failed to break line into segments")
+    _, sdx = nearest_segments(points, starts, ends, np.inf)
+    a, b = starts[sdx], ends[sdx]
+    d = b - a
+    rel = points - a
+    cross = d[:, 0] * rel[:, 1] - d[:, 1] * rel[:, 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.einsum("ij,ij->i", rel, d) / np.einsum("ij,ij->i", d, d)
+    side = np.sign(cross)
+    # closest to a vertex joining two segments: the end of the closest segment, or its start
+    for at_vertex, before, after in ((t >= 1, sdx, sdx + 1), (t <= 0, sdx - 1, sdx)):
+        joined = at_vertex & (before >= 0) & (after < len(starts))
+        if not joined.any():
+            continue
+        before, after = before[joined], after[joined]
+        d_before = ends[before] - starts[before]
+        d_after = ends[after] - starts[after]
+        rel_before = points[joined] - starts[before]
+        rel_after = points[joined] - starts[after]
+        side_before = np.sign(d_before[:, 0] * rel_before[:, 1] - d_before[:, 1] * rel_before[:, 0])
+        side_after = np.sign(d_after[:, 0] * rel_after[:, 1] - d_after[:, 1] * rel_after[:, 0])
+        left_turn = d_before[:, 0] * d_after[:, 1] - d_before[:, 1] * d_after[:, 0] > 0
+        left = np.where(left_turn, (side_before > 0) & (side_after > 0), (side_before > 0) | (side_after > 0))
+        on_line = (side_before == 0) & (side_after == 0)
+        side[joined] = np.where(on_line, 0, np.where(left, 1, -1))
+    return side
+
+
+def _ray_side(p: geo.Polygon, splitter: geo.base.BaseGeometry) -> Optional[str]:
+    """Which side of a splitter ("left" or "right") a polygon is on, using perpendicular rays from the common edges.
+
+    The original (slower) method; used when polygon_sides can't decide. None when no common edge segment decides it.
+    """
+    # step 1: get the line strings that make up the common edges of the sides and the splitter
+    common_edges = p.boundary.intersection(splitter)
+    common_edges = list(common_edges) if hasattr(common_edges, "__iter__") else [common_edges]
+    # step 2: iterate over the common_edges
+    for common_edge in common_edges:
+        # step 3: orient line_string so that it goes in same order of the splitter orientation
+        i_points_idxs = iter_oriented_line_pt_idx(common_edge, splitter)
+        common_edge = geo.LineString(orient_seq(list(common_edge.coords), i_points_idxs))
+        # step 4: iterate over the line segments making up each common_edge
+        for segment in iter_segments(common_edge):
+            # step 4a: get the segment midpoint
+            midpoint = segment.interpolate(0.5, normalized=True)
+            # step 4b: get the `x` exterior edge
+            a_edge = p.boundary.difference(common_edge)
+            # step 4c: make perpendicular segment at midpoint, increase by 1000x length each time until
+            # extends beyond the `x` bounding box; 90 deg rotation means
+            perp_segment = affine.rotate(segment, 90, midpoint)
+            factor = 1000
+            while True:
+                scaled_perp_segment: geo.LineString = affine.scale(perp_segment,factor,factor,factor,midpoint)
+                if scaled_perp_segment.within(p.minimum_rotated_rectangle):
+                    factor *= 1000
+                    continue
+                break
+            # step 4d: get left and right midpoint perpendiculars
+            l_perpendicular = geo.LineString((midpoint, scaled_perp_segment.interpolate(1.0, normalized=True)))
+            r_perpendicular = geo.LineString((midpoint, scaled_perp_segment.interpolate(0.0, normalized=True)))
+            # step 4e: find the intersections from midpoint to the `x` exterior on left/right side
+            l_intersections = l_perpendicular.intersection(a_edge)
+            r_intersections = r_perpendicular.intersection(a_edge)
+            # step 4f: check to see if both sides had no intersections? can this happen...?
+            if all(i.is_empty for i in (l_intersections,r_intersections)):
+                # give up; try the next segment
+                continue
+            # step 4g: the side with intersections tells us which side `x` is on
+            if l_intersections.is_empty:
+                # the side is in on the right
+                return "right"
+            elif r_intersections.is_empty:
+                # the side is in on the left
+                return "left"
+            else:
+                # could try to figure it out when intersections occur on both sides but let's just move on
+                continue
+    return None
+
+
 def get_LRsides(Aside: geo.base.BaseGeometry,
                 Bside: geo.base.BaseGeometry,
                 splitter: geo.base.BaseGeometry) -> Tuple[geo.base.BaseGeometry, geo.base.BaseGeometry]:
-    """Determine the 'left' and 'right' sides of an already split geometry"""
+    """Determine the 'left' and 'right' sides of an already split geometry
+
+    The side of the first polygon (of A, then of B) that can be classified decides. The polygons are classified by the
+    orientations of their common edges with the splitter (see polygon_sides); when that can't decide for a polygon
+    (degenerate cases), perpendicular rays from its common edges are used instead.
+    """
     Alist = list(Aside) if hasattr(Aside, "__iter__") else [Aside]
     Blist = list(Bside) if hasattr(Bside, "__iter__") else [Bside]
     result_dict = dict(A = dict(right=(Bside, Aside), left=(Aside, Bside)),
                        B = dict(right=(Aside, Bside), left=(Bside, Aside)))
-    for sidelist, side_name in zip((Alist,Blist),("A","B")):
-        for p in sidelist:
-            # step 1: get the line strings that make up the common edges of the sides and the splitter
-            common_edges = p.boundary.intersection(splitter)
-            common_edges = list(common_edges) if hasattr(common_edges, "__iter__") else [common_edges]
-            # step 2: iterate over the common_edges
-            for common_edge in common_edges:
-                # step 3: orient line_string so that it goes in same order of the splitter orientation
-                i_points_idxs = iter_oriented_line_pt_idx(common_edge, splitter)
-                common_edge = geo.LineString(orient_seq(list(common_edge.coords), i_points_idxs))
-                # step 4: iterate over the line segments making up each common_edge
-                for segment in iter_segments(common_edge):
-                    # step 4a: get the segment midpoint
-                    midpoint = segment.interpolate(0.5, normalized=True)
-                    # step 4b: get the `x` exterior edge
-                    a_edge = p.boundary.difference(common_edge)
-                    # step 4c: make perpendicular segment at midpoint, increase by 1000x length each time until
-                    # extends beyond the `x` bounding box; 90 deg rotation means
-                    perp_segment = affine.rotate(segment, 90, midpoint)
-                    factor = 1000
-                    while True:
-                        scaled_perp_segment: geo.LineString = affine.scale(perp_segment,factor,factor,factor,midpoint)
-                        if scaled_perp_segment.within(p.minimum_rotated_rectangle):
-                            factor *= 1000
-                            continue
-                        break
-                    # step 4d: get left and right midpoint perpendiculars
-                    l_perpendicular = geo.LineString((midpoint, scaled_perp_segment.interpolate(1.0, normalized=True)))
-                    r_perpendicular = geo.LineString((midpoint, scaled_perp_segment.interpolate(0.0, normalized=True)))
-                    # step 4e: find the intersections from midpoint to the `x` exterior on left/right side
-                    l_intersections = l_perpendicular.intersection(a_edge)
-                    r_intersections = r_perpendicular.intersection(a_edge)
-                    # step 4f: check to see if both sides had no intersections? can this happen...?
-                    if all(i.is_empty for i in (l_intersections,r_intersections)):
-                        # give up; try the next segment
-                        continue
-                    # step 4g: the side with intersections tells us which side `x` is on
-                    if l_intersections.is_empty:
-                        # the side is in on the right
-                        return result_dict[side_name]["right"]
-                    elif r_intersections.is_empty:
-                        # the side is in on the left
-                        return result_dict[side_name]["left"]
-                    else:
-                        # could try to figure it out when intersections occur on both sides but let's just move on
-                        continue
+    polygons = Alist + Blist
+    side_names = ["A"] * len(Alist) + ["B"] * len(Blist)
+    if isinstance(splitter, (geo.LineString, geo.LinearRing)) and all(isinstance(p, geo.Polygon) for p in polygons):
+        sides = polygon_sides(polygons, splitter)
     else:
-        raise GeometryError("Failed to figure out which side is which (left and right)")
+        sides = [None] * len(polygons)
+    for p, side_name, side in zip(polygons, side_names, sides):
+        if side is None:
+            side = _ray_side(p, splitter)
+        if side is not None:
+            return result_dict[side_name][side]
+    raise GeometryError("Failed to figure out which side is which (left and right)")
@@ -7,7 +7,9 @@ from pathlib import Path
 from typing import Union, Optional, Iterable, List, TypeVar, Type
 from dataclasses import dataclass, field
 
-from .mshrw.read import line_strings as read_line_strings
+import numpy as np
+
+from .mshrw.read import line_strings as read_line_strings, line_arrays as read_line_arrays
 
 
 def open(path: Union[str, Path]):
@@ -19,6 +21,15 @@ def open(path: Union[str, Path]):
     return open_path(path)
 
 
+def open_arrays(path: Union[str, Path]):
+    path = Path(path)
+    try:
+        open_path = {".msh": MshArrays.open}[path.suffix.lower()]
+    except KeyError:
+        raise TypeError(f"{path.suffix!r} file not yet supported") from None
+    return open_path(path)
+
+
 MshChild = TypeVar("MshChild", bound="MshChild")
 
 
@@ -49,3 +60,33 @@ class Msh:
 
     def __repr__(self):
         return f"Msh({len(self.nodes)} nodes, {len(self.elements)} elements, {len(self.boundaries)} boundaries)"
+
+
+MshArraysChild = TypeVar("MshArraysChild", bound="MshArrays")
+
+
+@dataclass(repr=False)
+class MshArrays:
+    """The contents of a .msh file as arrays (see `mshrw.read.line_arrays`) instead of lists of dicts."""
+    nodes: np.ndarray = field(default_factory=lambda: np.empty((0, 3), dtype=float))
+    elements: np.ndarray = field(default_factory=lambda: np.empty((0, 5), dtype=np.int64))
+    boundaries: np.ndarray = field(default_factory=lambda: np.empty((0, 2), dtype=np.int64))
+
+    @classmethod
+    def open(cls: Type[MshArraysChild], path: Union[str, Path]) -> MshArraysChild:
+        """Make an instance from a .msh file."""
+        path = Path(path).with_suffix(".msh")
+        return cls.from_lines(path.read_text().split("\n"))
+
+    @classmethod
+    def from_lines(cls: Type[MshArraysChild], lines: Optional[Iterable[str]] = None) -> MshArraysChild:
+        """Build an instance using line input strings
+
+        If no lines are provided, result is same as cls()
+        """
+        if lines is None:
+            return cls()
+        return cls(**read_line_arrays(lines))
+
+    def __repr__(self):
+        return f"MshArrays({len(self.nodes)} nodes, {len(self.elements)} elements, {len(self.boundaries)} boundaries)"
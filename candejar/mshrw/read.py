@@ -5,6 +5,8 @@
 from typing import Iterable, Callable, Any, Dict, TypeVar, Sequence, Iterator
 import itertools
 
+import numpy as np
+
 from . import MshObj, exc
 
 T = TypeVar("T")
@@ -140,3 +142,73 @@ def parse_boundary(boundary_line: str) -> Dict[str, Any]:
     field_names = "num node".split()
     field_converters = (int, int)
     return parse_line(boundary_line, field_names, field_converters)
+
+
+# field counts for the sections of a .msh file, in order (elements lines can be 2D: num i j)
+ARRAY_SECTIONS = (("nodes", (3,)), ("elements", (5, 3)), ("boundaries", (2,)))
+ARRAY_WIDTHS = dict(nodes=3, elements=5, boundaries=2)
+ARRAY_DTYPES = dict(nodes=float, elements=np.int64, boundaries=np.int64)
+
+
+def line_arrays(lines: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Reads .msh formatted lines (see `line_strings`) into arrays in one pass, without making an object per item.
+
+    The result maps "nodes", "elements", and "boundaries" to (n, 3) float [num x y], (n, 5) int [num i j k l], and
+    (n, 2) int [num node] arrays. Missing sections are empty arrays. The node numbers must be integers.
+    """
+    if isinstance(lines, str) or not isinstance(lines, Iterable):
+        raise exc.MSHRWError(f"lines must be an iterable, not {type(lines).__qualname__}")
+    data_lines = [line for line in (line.strip() for line in lines) if line and not line.startswith("#")]
+    result = {name: np.empty((0, ARRAY_WIDTHS[name]), dtype=ARRAY_DTYPES[name]) for name, _ in ARRAY_SECTIONS}
+    remaining = list(ARRAY_SECTIONS)
+    idx = 0
+    while idx < len(data_lines) and remaining:
+        total = parse_total(data_lines[idx])["num"]
+        idx += 1
+        if not total:
+            continue
+        block = data_lines[idx:idx + total]
+        if len(block) < total:
+            e = exc.MSHLineProcessingError(f"expected {total!s} data lines, found {len(block)!s}")
+            e.total = total
+            raise e
+        width = len(block[0].split())
+        # the first remaining section that accepts this field count gets the block
+        while remaining and width not in remaining[0][1]:
+            del remaining[0]
+        if not remaining:
+            e = exc.MSHLineProcessingError("line length mismatch occurred during parsing")
+            e.line = block[0]
+            raise e
+        name, _ = remaining.pop(0)
+        result[name] = _block_array(block, ARRAY_WIDTHS[name], ARRAY_DTYPES[name])
+        if name == "nodes":
+            # the node numbers share the float array with the coordinates, but are parsed as int (as in parse_node)
+            result[name][:, 0] = _block_array([line.split(None, 1)[0] for line in block], 1, np.int64)[:, 0]
+        idx += total
+    if idx < len(data_lines):
+        raise exc.MSHLineProcessingError(
+            f"There appear to be {len(data_lines) - idx!s} extraneous data lines at the end of the file.")
+    return result
+
+
+def _block_array(block: Sequence[str], width: int, dtype: type) -> np.ndarray:
+    """Parse all the lines of one section at once; rows with fewer fields (2D elements) are padded with zeros.
+
+    Values are parsed straight to the dtype, so a value like 1.5 in an integer section is an error (as in parse_element).
+    """
+    values = " ".join(block).split()
+    try:
+        if len(values) == width * len(block):
+            return np.array(values, dtype=dtype).reshape(len(block), width)
+        arr = np.zeros((len(block), width), dtype=dtype)
+        for row, line in zip(arr, block):
+            fields = line.split()
+            if len(fields) not in (width, 3):
+                e = exc.MSHLineProcessingError("line length mismatch occurred during parsing")
+                e.line = line
+                raise e
+            row[:len(fields)] = np.array(fields, dtype=dtype)
+    except ValueError as e:
+        raise exc.MSHLineProcessingError(f"invalid value in .msh data: {e!s}") from None
+    return arr
@@ -11,17 +11,29 @@ Selectable bys:
     nodes:
         boundary_condition (xcode, ycode), elements
     elements:
-        material, step, nodes, boundaries
+        material, step, nodes, boundaries, neighbors
     boundaries (equivalent to nodes...?):
         boundary_condition (xcode, ycode), nodes, elements
 
+Selections can also be made with lazy, composable queries (see Query):
+
+    select.query(cande).elements.where(mat=3, step=slice(1, 5)).within(zone)
+
 IMPORTANT: attribute errors for individual objects will fail silently
 """
 
+import collections
+import functools
+import itertools
+import numpy as np
 import shapely.geometry as geo
-from typing import Sequence, overload, TypeVar, Callable, Any, Iterator, Iterable
+from typing import Sequence, overload, TypeVar, Callable, Any, Iterator, Iterable, NamedTuple, Optional, List, Tuple, \
+    Union
 
 from . import exc
+from .candeobj import incidence, meshgeo
+from .candeobj.candeseq import BoundariesSection
+from .utilities.skip import SkipAttrIterMixin, SkippableIterMixin, skip_version_key, skippable_len
 
 T = TypeVar("T")
 T_Iterable = Iterable[T]
@@ -44,9 +56,62 @@ def copy(selectables: T_Sequence, select_f: Callable[..., T_Iterator], *args, **
     return selection
 
 
+def index_by_shape(selectables: T_Iterable, shape: geo.base.BaseGeometry) -> np.ndarray:
+    """The sorted indexes (in iteration order) of the selectables with representative points inside of the shape."""
+    # the representative points of sections and their spatial index are cached
+    return meshgeo.shape_index(selectables, shape)
+
+
+def at_index(selectables: T_Iterable, index: Iterable[int]) -> T_Iterator:
+    """The selectables at the indexes (in iteration order, so skipped items are not counted)."""
+    index = np.asarray(index, dtype=np.intp).reshape(-1)
+    if isinstance(selectables, SkipAttrIterMixin):
+        skip_state = selectables.skip_state()
+        if skip_state.count:
+            # iteration indexes to list indexes
+            index = np.flatnonzero(~skip_state.mask)[index]
+    elif not isinstance(selectables, (list, tuple)) or isinstance(selectables, SkippableIterMixin):
+        selectables = list(selectables)
+    yield from (selectables[i] for i in index.tolist())
+
+
 def by_shape(selectables: T_Iterable, shape: geo.base.BaseGeometry) -> T_Iterator:
-    selectable_geo = geo.asShape(selectables)
-    yield from (s for s,s_geo in zip(selectables, selectable_geo) if shape.contains(s_geo.representative_point()))
+    yield from at_index(selectables, index_by_shape(selectables, shape))
+
+
+def by_nodes(selectables: T_Sequence, nums: Iterable[int]) -> T_Iterator:
+    """The members of an elements or boundaries section referring to any of the node numbers."""
+    rows = np.fromiter(nums, dtype=np.intp) - 1
+    if isinstance(selectables, BoundariesSection):
+        node_incidence = incidence.node_boundaries(selectables)
+    else:
+        node_incidence = incidence.node_elements(selectables)
+    if len(rows) and (rows.min() < 0 or rows.max() >= len(node_incidence)):
+        raise exc.CandejarValueError(f"node number out of range for {len(node_incidence)} nodes")
+    yield from at_index(selectables, node_incidence.rows(rows))
+
+
+def by_elements(selectables: T_Sequence, elements: Iterable[Any]) -> T_Iterator:
+    """The members of a nodes section referred to by any of the elements, in node number order."""
+    nums = np.unique(np.fromiter(itertools.chain.from_iterable((e.i, e.j, e.k, e.l) for e in elements),
+                                 dtype=np.intp))
+    nums = nums[nums != 0]
+    if len(nums) and (nums.min() < 0 or nums.max() > len(selectables)):
+        raise exc.CandejarValueError(f"node number out of range for {len(selectables)} nodes")
+    positions = nums - 1
+    if isinstance(selectables, SkipAttrIterMixin) and selectables.skip_state().count:
+        positions = positions[~selectables.skip_state().mask[positions]]
+    yield from (selectables[p] for p in positions.tolist())
+
+
+def index_by_neighbors(selectables: T_Sequence, index: Iterable[int]) -> np.ndarray:
+    """The sorted indexes (in iteration order) of the members of an elements section sharing an edge with any of the
+    elements at the indexes (other than those elements)."""
+    index = np.asarray(index, dtype=np.intp).reshape(-1)
+    neighbors = incidence.element_neighbors(selectables)
+    if len(index) and (index.min() < 0 or index.max() >= len(neighbors)):
+        raise exc.CandejarValueError(f"element index out of range for {len(neighbors)} elements")
+    return np.setdiff1d(neighbors.rows(index), index)
 
 
 def by_filter(selectables: T_Iterable, *, function: Callable[[T], Any]) -> T_Iterator:
@@ -59,6 +124,78 @@ def by_equal_attr(selectable: T, attr: str, value: Any) -> bool:
     no_attr = object()
     return getattr(selectable, attr, no_attr) == value
 
+class AttrIndex(NamedTuple):
+    """The selectables grouped by the value of an int attribute; members without the attribute are left out."""
+    values: np.ndarray  # the sorted attribute values
+    order: np.ndarray  # the indexes (in iteration order) of the members, in values order
+
+    def equal(self, value: int) -> np.ndarray:
+        """The indexes of the members with the attribute value, in iteration order."""
+        lo = np.searchsorted(self.values, value, "left")
+        hi = np.searchsorted(self.values, value, "right")
+        return self.order[lo:hi]
+
+    def in_range(self, r: range) -> np.ndarray:
+        """The indexes of the members with attribute values in the range (with a positive step), grouped by value in
+        range order and in iteration order within each value."""
+        if not r:
+            return self.order[:0]
+        lo = np.searchsorted(self.values, r[0], "left")
+        hi = np.searchsorted(self.values, r[-1], "right")
+        index = self.order[lo:hi]
+        if r.step != 1:
+            index = index[(self.values[lo:hi] - r[0]) % r.step == 0]
+        return index
+
+
+def _attr_index(selectables: T_Iterable, attr: str) -> Optional[AttrIndex]:
+    no_attr = object()
+    values = [getattr(s, attr, no_attr) for s in selectables]
+    has_attr = [v is not no_attr for v in values]
+    values = list(itertools.compress(values, has_attr))
+    if not all(isinstance(v, int) for v in values):
+        return None
+    try:
+        values = np.array(values, dtype=np.int64).reshape(-1)
+    except OverflowError:
+        return None
+    sort = np.argsort(values, kind="stable")
+    return AttrIndex(values[sort], np.flatnonzero(has_attr)[sort])
+
+
+def attr_index(selectables: T_Iterable, attr: str) -> Optional[AttrIndex]:
+    """The index of the int values of an attribute of the selectables (None if any of the values are not ints).
+
+    The index of a section is cached; it is rebuilt after the section, or the attribute (or skip state) of its members,
+    change.
+    """
+    if not _cacheable(selectables):
+        return _attr_index(selectables, attr)
+    attrs = (attr,)
+    skippable_attr = getattr(selectables, "skippable_attr", None)
+    if skippable_attr is not None:
+        attrs += (skip_version_key(skippable_attr),)
+    return selectables.cached(("select", attr), functools.partial(_attr_index, attr=attr), attrs=attrs)
+
+
+def _cacheable(selectables: T_Iterable) -> bool:
+    """Whether the selectables can cache results and detect changes to the attributes of their members."""
+    return getattr(selectables, "cached", None) is not None and getattr(selectables, "tracks_attrs", False)
+
+
+def _slice_values(selectables: T_Sequence, s: slice) -> range:
+    """The attribute values selected by a slice (indexed starting at 1)."""
+    if s.step is not None and s.step<0:
+        raise exc.CandejarValueError(f"negative attribute slice steps are not allowed")
+    if s.start is None or s.start==0:
+        raise exc.CandejarValueError(f"Candejar attribute slices are indexed at 1; zero index not allowed")
+    try:
+        selectables_len = len(selectables)
+    except TypeError:
+        raise exc.CandejarTypeError(f"a selectable sequence is required for slicing")
+    return range(selectables_len+1)[s]
+
+
 # a sliceable attribute is one that is an int and can be selected over a range of numbers, e.g. "steps 1 through 3"
 # these slices are indexed starting at 1 because that's how CANDE indexes things
 
@@ -70,18 +207,20 @@ def by_sliceable_attr(selectables: T_Sequence, s: slice, *, attr: str) -> T_Iter
 
 def by_sliceable_attr(selectables, x, *, attr):
     if isinstance(x,int):
-        function = lambda s: by_equal_attr(s, attr, x)
-        yield from by_filter(selectables, function=function)
+        # an index is only worth making for a single value if it is kept
+        index = attr_index(selectables, attr) if _cacheable(selectables) else None
+        if index is None:
+            function = lambda s: by_equal_attr(s, attr, x)
+            yield from by_filter(selectables, function=function)
+        else:
+            yield from at_index(selectables, index.equal(x))
     if isinstance(x,slice):
-        if x.step is not None and x.step<0:
-            raise exc.CandejarValueError(f"negative attribute slice steps are not allowed")
-        if x.start is None or x.start==0:
-            raise exc.CandejarValueError(f"Candejar attribute slices are indexed at 1; zero index not allowed")
-        try:
-            selectables_len = len(selectables)
-        except TypeError:
-            raise exc.CandejarTypeError(f"a selectable sequence is required for slicing")
-        yield from (s for v in range(selectables_len+1)[x] for s in by_filter(selectables, function=lambda s: by_equal_attr(s, attr, v)))
+        values = _slice_values(selectables, x)
+        index = attr_index(selectables, attr)
+        if index is None:
+            yield from (s for v in values for s in by_filter(selectables, function=lambda s: by_equal_attr(s, attr, v)))
+        else:
+            yield from at_index(selectables, index.in_range(values))
 
 
 @overload
@@ -112,3 +251,223 @@ def by_step(selectables: T_Sequence, s: slice) -> T_Iterator: ...
 
 def by_step(selectables, x):
     return by_sliceable_attr(selectables, x, attr="step")
+
+
+def by_boundary_condition(selectables: T_Iterable, *, xcode: Optional[int] = None, ycode: Optional[int] = None
+                          ) -> T_Iterator:
+    """The selectables with the given boundary condition codes (either or both)."""
+    codes = {attr: code for attr, code in (("xcode", xcode), ("ycode", ycode)) if code is not None}
+    indexes = [attr_index(selectables, attr) for attr in codes] if _cacheable(selectables) else [None]
+    if any(index is None for index in indexes):
+        function = lambda s: all(by_equal_attr(s, attr, code) for attr, code in codes.items())
+        yield from by_filter(selectables, function=function)
+    else:
+        index = functools.reduce(np.intersect1d, (i.equal(code) for i, code in zip(indexes, codes.values())),
+                                 np.arange(skippable_len(selectables)))
+        yield from at_index(selectables, index)
+
+
+# the number of query results kept by each section
+QUERY_CACHE_SIZE = 32
+
+
+def _value_key(value: Any) -> Any:
+    """A hashable key for an attribute value of a query (slices aren't hashable)."""
+    return ("slice", value.start, value.stop, value.step) if isinstance(value, slice) else value
+
+
+class Query:
+    """A lazy selection of the members of a section, or of a chain of sections (e.g. the elements of a CandeObj).
+
+    Predicates are added with where (attribute values: an int or a one-based slice, as for by_sliceable_attr, or any
+    other value compared for equality), within (shapes, as for by_shape), and filter (functions); each returns a new
+    query. Nothing is selected until the query is iterated or its index is asked for. The attribute predicates are
+    evaluated first using the attribute indexes, then the shapes are checked for the remaining members only, and then
+    the functions are called for the members that are left.
+
+    The selection of each section (apart from the functions) is cached by the section, keyed on the query; it is
+    selected again after the section, the queried attributes of its members, or its geometry, change. Queries with
+    unhashable attribute values (e.g. lists) are not cached.
+
+    The selection is in iteration order.
+    """
+    __slots__ = ("selectables", "attrs", "shapes", "functions")
+
+    def __init__(self, selectables: T_Sequence, attrs: Iterable[Any] = (), shapes: Iterable[geo.base.BaseGeometry] = (),
+                 functions: Iterable[Callable[[T], Any]] = ()) -> None:
+        if not isinstance(selectables, Sequence):
+            raise exc.CandejarTypeError(f"a selectables sequence is required, not {type(selectables).__qualname__}")
+        self.selectables = selectables
+        self.attrs = tuple(attrs)
+        self.shapes = tuple(shapes)
+        self.functions = tuple(functions)
+
+    def __repr__(self) -> str:
+        predicates = [f"where({attr}={value!r})" for attr, value in self.attrs]
+        predicates.extend(f"within({shape.geom_type})" for shape in self.shapes)
+        predicates.extend(f"filter({function!r})" for function in self.functions)
+        return ".".join([f"{type(self).__qualname__}({type(self.selectables).__qualname__})", *predicates])
+
+    def where(self, **values: Any) -> "Query":
+        """A new query also selecting by attribute values."""
+        for value in values.values():
+            if isinstance(value, slice):
+                _slice_values(self.selectables, value)
+        return Query(self.selectables, self.attrs + tuple(values.items()), self.shapes, self.functions)
+
+    def within(self, shape: geo.base.BaseGeometry) -> "Query":
+        """A new query also selecting by shape."""
+        return Query(self.selectables, self.attrs, self.shapes + (shape,), self.functions)
+
+    def filter(self, function: Callable[[T], Any]) -> "Query":
+        """A new query also selecting by function."""
+        return Query(self.selectables, self.attrs, self.shapes, self.functions + (function,))
+
+    def _sections(self) -> List[T_Sequence]:
+        seq_map = getattr(self.selectables, "seq_map", None)
+        return [self.selectables] if seq_map is None else list(seq_map.values())
+
+    def _section_index(self, section: T_Sequence) -> np.ndarray:
+        """The sorted indexes of the members of a section selected by the attributes and shapes."""
+        key = tuple((attr, _value_key(value)) for attr, value in self.attrs), tuple(map(id, self.shapes))
+        try:
+            hash(key)
+        except TypeError:
+            # unhashable attribute values (e.g. lists) are compared as usual, without caching
+            return self._compute_section_index(section)
+        attrs = tuple(attr for attr, _ in self.attrs)
+        skippable_attr = getattr(section, "skippable_attr", None)
+        if skippable_attr is not None:
+            attrs += (skip_version_key(skippable_attr),)
+        # the geometry is made again after the section members or nodes change
+        geometry = section.geometry() if self.shapes and callable(getattr(section, "geometry", None)) else None
+        # slices of values are clipped to the length of the whole chain, which the other sections change
+        length = len(self.selectables) if any(isinstance(value, slice) for _, value in self.attrs) else None
+        return _cached_query(section, key, attrs, (geometry, self.shapes, length), self._compute_section_index)
+
+    def _compute_section_index(self, section: T_Sequence) -> np.ndarray:
+        index = None
+        for attr, value in self.attrs:
+            attr_idx = _attr_value_index(section, attr, value, len(self.selectables))
+            index = attr_idx if index is None else np.intersect1d(index, attr_idx, assume_unique=True)
+        for shape in self.shapes:
+            index = meshgeo.shape_index(section, shape, index)
+        if index is None:
+            index = np.arange(skippable_len(section))
+        return index
+
+    def index(self) -> np.ndarray:
+        """The sorted indexes (in iteration order) of the selected members."""
+        indexes = []
+        start = 0
+        for section in self._sections():
+            index = self._section_index(section)
+            if self.functions:
+                keep = [all(f(s) for f in self.functions) for s in at_index(section, index)]
+                index = index[np.array(keep, dtype=bool).reshape(-1)]
+            indexes.append(index + start)
+            start += skippable_len(section)
+        return np.concatenate(indexes) if indexes else np.empty(0, dtype=np.intp)
+
+    def __iter__(self) -> T_Iterator:
+        for section in self._sections():
+            selection = at_index(section, self._section_index(section))
+            for function in self.functions:
+                selection = filter(function, selection)
+            yield from selection
+
+    def count(self) -> int:
+        """The number of selected members."""
+        # (not __len__, which list() would call before iterating)
+        return len(self.index())
+
+    def copy(self) -> T_Sequence:
+        """A new sequence of the selection, the same as select.copy gives (for a chain of sections, a new chain of the
+        section selections)."""
+        seq_map = getattr(self.selectables, "seq_map", None)
+        if seq_map is None:
+            return copy(self.selectables, _iter_query, self)
+        return type(self.selectables)({k: copy(section, _iter_query, self) for k, section in seq_map.items()})
+
+
+def _iter_query(section: T_Sequence, query: Query) -> T_Iterator:
+    selection = at_index(section, query._section_index(section))
+    for function in query.functions:
+        selection = filter(function, selection)
+    return selection
+
+
+def _attr_value_index(section: T_Sequence, attr: str, value: Any, length: int) -> np.ndarray:
+    """The sorted indexes of the members of a section with the attribute value (a one-based slice of values up to the
+    length, an int, or any other value)."""
+    index = attr_index(section, attr) if isinstance(value, (int, slice)) else None
+    if isinstance(value, slice):
+        values = range(length + 1)[value]
+        if index is not None:
+            return np.sort(index.in_range(values))
+        return np.flatnonzero([getattr(s, attr, None) in values for s in section]).astype(np.intp)
+    if index is not None:
+        return index.equal(value)
+    return np.flatnonzero([by_equal_attr(s, attr, value) for s in section]).astype(np.intp)
+
+
+def _cached_query(section: T_Sequence, key: Any, attrs: Tuple[str, ...], extra: Any,
+                  compute: Callable[[T_Sequence], np.ndarray]) -> np.ndarray:
+    """compute(section), kept among the most recent query results of the section when it can detect changes."""
+    if not _cacheable(section):
+        return compute(section)
+    # a new dict after any change to the section list
+    queries = section.cached(("select", "queries"), lambda _: collections.OrderedDict())
+    stamp = section.attr_versions(attrs), extra
+    try:
+        cached_stamp, index = queries[key]
+    except KeyError:
+        pass
+    else:
+        # the stamp keeps the query shapes, so their ids in the key can't be reused
+        if _same_stamp(cached_stamp, stamp):
+            queries.move_to_end(key)
+            return index
+    index = compute(section)
+    index.flags.writeable = False
+    queries[key] = stamp, index
+    queries.move_to_end(key)
+    while len(queries) > QUERY_CACHE_SIZE:
+        queries.popitem(last=False)
+    return index
+
+
+def _same_stamp(a: Any, b: Any) -> bool:
+    (a_versions, (a_geometry, a_shapes, a_length)), (b_versions, (b_geometry, b_shapes, b_length)) = a, b
+    return a_versions == b_versions and a_length == b_length and a_geometry is b_geometry and \
+        all(x is y for x, y in zip(a_shapes, b_shapes)) and len(a_shapes) == len(b_shapes)
+
+
+class CandeQuery:
+    """The queries of the nodes, elements, and boundaries of a CandeObj."""
+    __slots__ = ("cande",)
+
+    def __init__(self, cande: Any) -> None:
+        self.cande = cande
+
+    @property
+    def nodes(self) -> Query:
+        return Query(self.cande.nodes)
+
+    @property
+    def elements(self) -> Query:
+        return Query(self.cande.elements)
+
+    @property
+    def boundaries(self) -> Query:
+        return Query(self.cande.boundaries)
+
+
+def query(obj: Any) -> Union[CandeQuery, Query]:
+    """A lazy query of a CandeObj (its nodes, elements, or boundaries), or of a section or chain of sections.
+
+    select.query(cande).elements.where(mat=3, step=slice(1, 5)).within(zone)
+    """
+    if isinstance(obj, Sequence):
+        return Query(obj)
+    return CandeQuery(obj)
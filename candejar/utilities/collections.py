@@ -4,11 +4,20 @@
 
 from __future__ import annotations
 
+import bisect
 import functools
 import itertools
+import weakref
+from collections import Counter
 from typing import List, Tuple, Any, overload, Sequence, MutableSequence, \
     Generic, TypeVar, Type, Union, Optional, Iterable, Iterator, Mapping, \
-    Callable, ClassVar
+    Callable, ClassVar, Dict, NamedTuple
+
+import numpy as np
+
+from .. import exc
+from .mixins import AttrVersionMixin, add_attr_holder
+from .skip import iter_skippable, Skip, skip_version_key
 
 T = TypeVar("T")
 NO_SLICE = object()
@@ -265,6 +274,151 @@ class ChainSequence(MutableSequence[T]):
 V = TypeVar("V")
 
 
+class SliceView(Sequence[V]):
+    """A lazy view of a slice of a sequence, e.g. a `KeyedChainView` or a `ConvertingList`.
+
+    Nothing is copied: the view holds the range of base indexes, and items are only looked up when they are accessed or
+    iterated (iteration skips the same items as iteration of the base). Slicing a view gives another view of the same
+    base. Assignment to the view items is written through to the base; the view length can't change.
+
+    The view refers to the base indexes at the time of the slicing; insertions or deletions in the base shift the items
+    that are seen.
+    """
+    __slots__ = ("base", "range")
+
+    def __init__(self, base: Sequence[V], r: range) -> None:
+        self.base = base
+        self.range = r
+
+    def __repr__(self) -> str:
+        return f"{type(self).__qualname__}({list(self)!r})"
+
+    def __len__(self) -> int:
+        return len(self.range)
+
+    @overload
+    def __getitem__(self, i: int) -> V:
+        ...
+
+    @overload
+    def __getitem__(self, s: slice) -> SliceView[V]:
+        ...
+
+    def __getitem__(self, x):
+        if isinstance(x, slice):
+            return SliceView(self.base, self.range[x])
+        return self.base[self.range[x]]
+
+    @overload
+    def __setitem__(self, i: int, v: V) -> None:
+        ...
+
+    @overload
+    def __setitem__(self, s: slice, v: Iterable[V]) -> None:
+        ...
+
+    def __setitem__(self, x, v):
+        if isinstance(x, slice):
+            indexes = self.range[x]
+            values = list(v)
+            if len(values) != len(indexes):
+                raise ValueError(f"attempt to assign sequence of size {len(values)} to {type(self).__qualname__} of "
+                                 f"size {len(indexes)}")
+            for idx, value in zip(indexes, values):
+                self.base[idx] = value
+        else:
+            self.base[self.range[x]] = v
+
+    def __iter__(self) -> Iterator[V]:
+        try:
+            iter_range = self.base.iter_range
+        except AttributeError:
+            return (self.base[idx] for idx in self.range)
+        return iter_range(self.range)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (SliceView, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def copy(self) -> List[V]:
+        """A list of the items."""
+        return list(self)
+
+
+class VersionedDict(Dict[Any, V]):
+    """A dict that increments its version with every mutation."""
+    __slots__ = ("_version",)
+
+    @property
+    def version(self) -> int:
+        try:
+            return self._version
+        except AttributeError:
+            return 0
+
+    def touch(self) -> None:
+        self._version = self.version + 1
+
+    def __setitem__(self, k, v) -> None:
+        super().__setitem__(k, v)
+        self.touch()
+
+    def __delitem__(self, k) -> None:
+        super().__delitem__(k)
+        self.touch()
+
+    def __ior__(self, other):
+        result = super().__ior__(other)
+        self.touch()
+        return result
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self.touch()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self.touch()
+        return result
+
+    def setdefault(self, k, default=None):
+        result = super().setdefault(k, default)
+        self.touch()
+        return result
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self.touch()
+
+    def clear(self) -> None:
+        super().clear()
+        self.touch()
+
+
+class PositionTable(NamedTuple):
+    """The cumulative lengths of the sub-sequences of a KeyedChainView, and what they were computed from."""
+    seq_map: Mapping[Any, Sequence]
+    stamp: Tuple[Any, ...]
+    keys: List[Any]
+    sequences: List[Sequence]
+    ends: List[int]  # the chain index after the end of each sub-sequence
+
+
+class SeqMapDescriptor:
+    """The KeyedChainView.seq_map attribute. Plain dicts are stored as VersionedDicts so changes can be detected."""
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance._seq_map
+
+    def __set__(self, instance, value) -> None:
+        instance._seq_map = VersionedDict(value) if type(value) is dict else value
+        instance._positions = instance._identity = None
+
+
 class KeyedChainView(MutableSequence[V]):
     """A mutable viewer of underlying sub-sequences, each with a key.
 
@@ -274,10 +428,19 @@ class KeyedChainView(MutableSequence[V]):
 
     The key(s) associated with the underlying sub-sequences can be any hashable
     value, but not int (to allow indexing of the sub-sequences).
+
+    Integer indexes are located using a cached table of the cumulative sub-sequence lengths (a bisect search, so
+    O(log k) for k sub-sequences). The table is rebuilt after any change to the seq_map or to the version of one of its
+    ConvertingList sub-sequences; the lengths of any other kinds of sub-sequences are checked on every use.
+
+    The search methods (in, index, remove, locate, owner) first look up items by identity using an index of each
+    sub-sequence (O(k)), built when needed. ConvertingLists keep their own index up to date (see
+    `ConvertingList.identity_index`), so only a changed sub-sequence is indexed again. They act on the items by
+    position, including items that are skipped during iteration (see `SkippableIterMixin`).
     """
-    __slots__ = ("seq_map")
+    __slots__ = ("_seq_map", "_positions", "_identity")
 
-    seq_map: Mapping[Any, Sequence[V]]
+    seq_map: Mapping[Any, Sequence[V]] = SeqMapDescriptor()
 
     def __init__(self, seq_map: Optional[Mapping[Any, Sequence[V]]] = None, **kwargs: Iterable[V]) -> None:
         if seq_map and any(isinstance(k, int) for k in seq_map.keys()):
@@ -291,7 +454,13 @@ class KeyedChainView(MutableSequence[V]):
         return f"{type(self).__qualname__}({self.seq_map!r})"
 
     def __contains__(self, item) -> bool:
-        return item in set(v for s in self.seq_map.values() for v in s)
+        if self._identity_position(item) is not None:
+            return True
+        return any(v == item for v in self._iter_all())
+
+    def _iter_all(self) -> Iterator[V]:
+        """Iterate over every item by position (including any items skipped during iteration)."""
+        return (v for s in self.positions().sequences for v in iter_skippable(s))
 
     def __iter__(self) -> Iterator[V]:
         yield from (v for seq in self.seq_map.values() for v in seq)
@@ -305,23 +474,129 @@ class KeyedChainView(MutableSequence[V]):
             seq.reverse()
 
     def __len__(self) -> int:
-        return sum(len(s) for s in self.seq_map.values()) if self.seq_map else 0
+        ends = self.positions().ends
+        return ends[-1] if ends else 0
+
+    def positions(self) -> PositionTable:
+        """The cumulative length table of the sub-sequences, rebuilt when out of date."""
+        seq_map = self._seq_map
+        table = self._positions
+        if table is not None and table.seq_map is seq_map and table.stamp == self._positions_stamp(table.sequences):
+            return table
+        sequences = list(seq_map.values())
+        if self._identity is not None:
+            # forget the indexes of the sub-sequences that are gone
+            self._identity = {id(s): self._identity[id(s)] for s in sequences if id(s) in self._identity}
+        table = self._positions = PositionTable(seq_map, self._positions_stamp(sequences), list(seq_map.keys()),
+                                                sequences, list(itertools.accumulate(len(s) for s in sequences)))
+        return table
+
+    def _positions_stamp(self, sequences: Sequence[Sequence[V]]) -> Tuple[Any, ...]:
+        seq_map = self._seq_map
+        try:
+            map_version = seq_map.version
+        except AttributeError:
+            # some other kind of mapping; its contents have to be compared
+            map_version = tuple(map(id, seq_map.values()))
+        # the versions of the ConvertingLists and the lengths of any other kinds of sub-sequences
+        return map_version, tuple(s.version if isinstance(s, ConvertingList) else len(s) for s in sequences)
 
     def get_seq_idx(self, i: int) -> Tuple[Sequence[V], int]:
         """Convert an index to a sub-sequence index"""
-        chain_len = len(self)
+        _, s, idx = self.get_key_seq_idx(i)
+        return s, idx
+
+    def get_key_seq_idx(self, i: int) -> Tuple[Any, Sequence[V], int]:
+        """Convert an index to the key of a sub-sequence, the sub-sequence, and the sub-sequence index"""
+        table = self.positions()
+        chain_len = table.ends[-1] if table.ends else 0
         try:
             idx = range(chain_len)[i]
         except IndexError:
             raise IndexError(f"{type(self).__qualname__} index out of range") from None
-        ctr = itertools.count()
-        for s in self.seq_map.values():
-            for i_, ct in zip(range(len(s)), ctr):
-                if ct == idx:
-                    return s, i_
+        seq_idx = bisect.bisect_right(table.ends, idx)
+        return table.keys[seq_idx], table.sequences[seq_idx], idx - (table.ends[seq_idx - 1] if seq_idx else 0)
+
+    def _sequence_ids(self, s: Sequence[V], rebuild: bool = False) -> Dict[int, int]:
+        """The index of the first position of each item of a sub-sequence by item id."""
+        if isinstance(s, ConvertingList):
+            if rebuild:
+                s._ids = None
+            return s.identity_index()
+        # other kinds of sub-sequences are indexed by the view, and checked when used
+        identity = self._identity
+        if identity is None:
+            identity = self._identity = dict()
+        cached = identity.get(id(s))
+        if cached is None or cached[0] is not s or rebuild:
+            ids: Dict[int, int] = dict()
+            for idx, v in enumerate(iter_skippable(s)):
+                ids.setdefault(id(v), idx)
+            cached = identity[id(s)] = s, ids
+        return cached[1]
+
+    def _identity_position(self, item: V) -> Optional[int]:
+        table = self.positions()
+        for seq_idx, s in enumerate(table.sequences):
+            idx = self._sequence_ids(s).get(id(item))
+            if idx is not None and (idx >= len(s) or s[idx] is not item):
+                # changed in place without the index being updated
+                idx = self._sequence_ids(s, rebuild=True).get(id(item))
+            if idx is not None:
+                return idx + (table.ends[seq_idx - 1] if seq_idx else 0)
+        return None
+
+    def locate(self, item: V) -> Tuple[Any, int]:
+        """The key of the sub-sequence holding the item, and the item index in the sub-sequence.
+
+        Items are found by identity using the identity index (O(1)), and by equality otherwise (O(n)).
+        """
+        key, _, idx = self.get_key_seq_idx(self.index(item))
+        return key, idx
+
+    def owner(self, item: V) -> Any:
+        """The key of the sub-sequence holding the item."""
+        return self.locate(item)[0]
 
     def iter_seq_slice(self, s: slice) -> Iterator[Tuple[Sequence[V], slice]]:
-        raise NotImplementedError()
+        """The sub-sequences and sub-sequence slices covered by a slice, in order of increasing index.
+
+        Negative steps give the same items as the equivalent positive step slice.
+        """
+        for seq, r in self.iter_seq_range(range(len(self))[s]):
+            yield seq, slice(r.start, r.stop, r.step)
+
+    def iter_seq_range(self, r: range) -> Iterator[Tuple[Sequence[V], range]]:
+        """The sub-sequences and the sub-sequence ranges covered by a range of chain indexes, in order of increasing
+        index."""
+        if r.step < 0:
+            r = r[::-1]
+        if not r:
+            return
+        table = self.positions()
+        first = bisect.bisect_right(table.ends, r.start)
+        for seq_idx in range(first, len(table.sequences)):
+            start = table.ends[seq_idx - 1] if seq_idx else 0
+            end = table.ends[seq_idx]
+            # the part of the range inside of this sub-sequence
+            sub = r[max(0, -(-(start - r.start) // r.step)):max(0, -(-(end - r.start) // r.step))]
+            if sub:
+                yield table.sequences[seq_idx], range(sub.start - start, sub.stop - start, r.step)
+            if end >= r[-1] + 1:
+                break
+
+    def iter_range(self, r: range) -> Iterator[V]:
+        """Iterate over the items in a range of chain indexes (skipping the same items as iteration)."""
+        parts = [(seq, sub) for seq, sub in self.iter_seq_range(r)]
+        if r.step < 0:
+            parts = [(seq, sub[::-1]) for seq, sub in reversed(parts)]
+        for seq, sub in parts:
+            try:
+                iter_sub = seq.iter_range
+            except AttributeError:
+                yield from (seq[i] for i in sub)
+            else:
+                yield from iter_sub(sub)
 
     @overload
     def __getitem__(self, i: int) -> V:
@@ -337,8 +612,7 @@ class KeyedChainView(MutableSequence[V]):
 
     def __getitem__(self, x):
         if isinstance(x, slice):
-            iter_s_x_del = self.iter_seq_slice(x)
-            return [s[x_get] for s, x_get in iter_s_x_del]
+            return SliceView(self, range(len(self))[x])
         else:
             if isinstance(x, int):
                 s, x_get = self.get_seq_idx(x)
@@ -360,7 +634,8 @@ class KeyedChainView(MutableSequence[V]):
 
     def __setitem__(self, x, v):
         if isinstance(x, slice):
-            raise TypeError(f"{type(self).__qualname__} slice assignment not supported")
+            # assigned item by item; the lengths of the sub-sequences can't change
+            SliceView(self, range(len(self))[x])[:] = v
         else:
             if isinstance(x, int):
                 s, x_set = self.get_seq_idx(x)
@@ -450,40 +725,26 @@ class KeyedChainView(MutableSequence[V]):
             raise IndexError(f"cannot insert to empty {type(self).__qualname__}")
 
     def remove(self, object: V):
-        for idx, v in enumerate(iter(self)):
-            if object == v:
-                s, i = self.get_seq_idx(idx)
-                break
-        else:
-            t_name = type(self).__qualname__
-            raise ValueError(f"{t_name}.remove(x): x not in {t_name}")
-        del s[i]
-
-    def index(self, object: V, start: int = ..., stop: int = ...):
         try:
-            r = range(start, stop)
-        except TypeError as e:
-            if ... in (start, stop):
-                if start == ...:
-                    start = 0
-                if stop == ...:
-                    stop = len(self)
-                self.index(object, start, stop)
-                return
-            else:
-                raise e
-        value_error = ValueError(f"{object!s} is not in {type(self).__qualname__}")
-        if not r:
-            raise value_error
-        for idx, v in enumerate(iter(self)):
-            if object == v:
-                _, i = self.get_seq_idx(idx)
-                return i
-        else:
-            raise value_error
-
-    def count(self, object: V):
-        return sum(v for v in iter(self) if v == object)
+            idx = self.index(object)
+        except ValueError:
+            t_name = type(self).__qualname__
+            raise ValueError(f"{t_name}.remove(x): x not in {t_name}") from None
+        del self[idx]
+
+    def index(self, object: V, start: int = 0, stop: Optional[int] = None) -> int:
+        """The chain index of the first position of the object, found by identity or equality (the same as list.index)."""
+        r = range(len(self))[start:stop]
+        idx = self._identity_position(object)
+        if idx is not None and idx in r:
+            return idx
+        for idx, v in zip(r, itertools.islice(self._iter_all(), r.start, r.stop)):
+            if v is object or v == object:
+                return idx
+        raise ValueError(f"{object!s} is not in {type(self).__qualname__}")
+
+    def count(self, object: V) -> int:
+        return sum(1 for v in self._iter_all() if v is object or v == object)
 
     def popitem(self, last: bool = True) -> Tuple[Any, Sequence[V]]:
         idx = {True: -1, False: 0}[bool(last)]
@@ -544,6 +805,7 @@ class KeyedChainView(MutableSequence[V]):
 class Converter:
     def __init__(self, cls, converter):
         cls._converter = self.wrapped_converter(cls, converter)
+        cls.item_type = self.converter_type(converter)
 
     def __get__(self, instance, owner):
         t = type(instance) if instance is not None else owner
@@ -552,6 +814,12 @@ class Converter:
         except AttributeError:
             raise TypeError(f"{t.__qualname__} requires a 'converter' class attribute")
 
+    @staticmethod
+    def converter_type(f):
+        """The type produced by the converter, or None if the converter is just a function."""
+        f_actual = getattr(f, "__wrapped__", f)
+        return f_actual if isinstance(f_actual, type) else None
+
     def wrapped_converter(self, cls, f):
         """Prevents unnecessarily making copies of values that are already instances of a converter type.
 
@@ -575,6 +843,7 @@ class HasConverterMixin(Generic[T]):
 
     converter: ClassVar[Converter]
     _converter: ClassVar[Callable[[Any], T]]
+    item_type: ClassVar[Optional[type]]
 
     def __init_subclass__(cls, **kwargs: Any) -> None:
         try:
@@ -590,7 +859,12 @@ class HasConverterMixin(Generic[T]):
 
 
 class ConvertingList(HasConverterMixin[T], List[T]):
-    __slots__ = ()
+    """A list that converts incoming items using the class converter.
+
+    Every mutation of the list increments the list version. Values computed from the list contents can be stored using
+    the cached method; they are recomputed after the list, or the watched attributes of its members, change.
+    """
+    __slots__ = ("_version", "_cache", "_attr_counts", "_ref", "_ids", "_sharers", "__weakref__")
 
     def __init__(self, iterable: Iterable[V]=None) -> None:
         if iterable is None:
@@ -598,6 +872,169 @@ class ConvertingList(HasConverterMixin[T], List[T]):
         iterable = map(self.converter, iterable)
         super().__init__(iterable)
 
+    @classmethod
+    def from_trusted(cls, items: Iterable[T]) -> ConvertingList[T]:
+        """A new list of the items as-is, without running the converter. The items must already be valid (e.g. made in
+        bulk and checked by the caller)."""
+        if not hasattr(cls, "converter"):
+            raise AttributeError(f"{cls.__qualname__} requires a 'converter' attribute for instantiation")
+        new = cls.__new__(cls)
+        list.extend(new, items)
+        return new
+
+    def __getstate__(self):
+        # the cache, attribute counts, identity index and sharers are not copied or pickled
+        return getattr(self, "__dict__", None) or None, {"_version": self.version}
+
+    @property
+    def version(self) -> int:
+        """Incremented by every mutation of the list (but NOT by mutation of the list members)."""
+        try:
+            return self._version
+        except AttributeError:
+            return 0
+
+    def touch(self) -> None:
+        """Mark the list as changed (e.g. after changing the list members in place)."""
+        self._touch()
+
+    def _touch(self, ids: Optional[Dict[int, int]] = None) -> None:
+        # the identity index is dropped unless the mutation kept it up to date
+        self._version = self.version + 1
+        self._ids = ids
+
+    def identity_index(self) -> Dict[int, int]:
+        """The index of the first position of each member by member id.
+
+        Built when needed, then kept up to date by item assignments, appends and extends (O(1) per item) while the
+        members are all different objects; rebuilt after any other mutation.
+        """
+        ids = getattr(self, "_ids", None)
+        if ids is None:
+            ids = dict()
+            for idx, v in enumerate(super().__iter__()):
+                ids.setdefault(id(v), idx)
+            self._ids = ids
+        return ids
+
+    def _ids_assigned(self, i: int, v: T) -> Optional[Dict[int, int]]:
+        # the identity index updated for assigning v at index i, or None when it has to be rebuilt
+        ids = getattr(self, "_ids", None)
+        # a shorter index means some members are repeated
+        if ids is None or len(ids) != len(self):
+            return None
+        try:
+            old = super().__getitem__(i)
+        except IndexError:
+            return None
+        if old is not v:
+            if id(v) in ids:
+                return None
+            del ids[id(old)]
+            ids[id(v)] = range(len(self))[i]
+        return ids
+
+    def _ids_extended(self, items: Sequence[T]) -> Optional[Dict[int, int]]:
+        # the identity index updated for adding the items to the end, or None when it has to be rebuilt
+        ids = getattr(self, "_ids", None)
+        n = len(self)
+        if ids is None or len(ids) != n:
+            return None
+        for v in items:
+            if ids.setdefault(id(v), n) != n:
+                return None
+            n += 1
+        return ids
+
+    @property
+    def tracks_attrs(self) -> bool:
+        """Whether the list can count attribute assignments on its members (see attr_versions)."""
+        item_type = getattr(self, "item_type", None)
+        return isinstance(item_type, type) and issubclass(item_type, AttrVersionMixin)
+
+    def attr_versions(self, attrs: Iterable[str]) -> Optional[Tuple[int, ...]]:
+        """The assignment counts of the named attributes over the list members, or None when the item type doesn't
+        report assignments (see `AttrVersionMixin`). Assignments changing an attribute to or from a Skip value are also
+        counted under the `skip_version_key` of the attribute.
+
+        The list starts counting the first time; members added after that are counted as they are added. Members
+        removed from the list may still be counted (which only causes extra recomputes of cached values).
+        """
+        try:
+            counts = self._attr_counts
+        except AttributeError:
+            if not self.tracks_attrs:
+                return None
+            counts = self._attr_counts = Counter()
+            self._ref = weakref.ref(self)
+            self._track(super().__iter__())
+        return tuple(counts[attr] for attr in attrs)
+
+    def _track(self, items: Iterable[T]) -> None:
+        # register the items with a list that counts the attribute assignments of its members
+        ref = getattr(self, "_ref", None)
+        if ref is not None:
+            for item in items:
+                add_attr_holder(item, ref)
+
+    def share(self, holder: Any) -> None:
+        """Register a (weakly referenced) holder of the list, such as a model or a snapshot of a model.
+
+        The list and its members (when their assignments can be counted; see attr_versions) can't be changed while more
+        than one live holder still holds the list (see `shared`). Holders have a holds(seq) method.
+        """
+        self.attr_versions(())
+        ref = weakref.ref(holder)
+        sharers = getattr(self, "_sharers", None) or ()
+        if not any(r is ref for r in sharers):
+            self._sharers = (*(r for r in sharers if r() is not None), ref)
+
+    @property
+    def shared(self) -> bool:
+        """Whether more than one live holder (see share) still holds the list."""
+        sharers = getattr(self, "_sharers", None)
+        if not sharers:
+            return False
+        holders = [holder for holder in (ref() for ref in sharers) if holder is not None]
+        if len(holders) < len(sharers):
+            self._sharers = tuple(map(weakref.ref, holders))
+        return sum(1 for holder in holders if holder.holds(self)) > 1
+
+    def _check_unshared(self) -> None:
+        if getattr(self, "_sharers", None) and self.shared:
+            raise exc.CandejarValueError(f"a shared {type(self).__qualname__} (e.g. with a fork or a snapshot) can't be "
+                                         f"changed; make a private copy first (see CandeObj.own_section)")
+
+    def _member_assigned(self, item: T, name: str, value: Any) -> None:
+        self._check_unshared()
+        counts = self._attr_counts
+        counts[name] += 1
+        if isinstance(value, Skip) or isinstance(item.__dict__.get(name), Skip):
+            counts[skip_version_key(name)] += 1
+
+    def cached(self, key: Any, compute: Callable[[ConvertingList[T]], V], attrs: Iterable[str] = (),
+               extra: Any = None) -> V:
+        """The cached result of compute(self).
+
+        The result is recomputed when the list version changes, or when any of the named attributes are assigned on the
+        list members (see attr_versions), or when the extra stamp (for anything else the result depends on) changes.
+        """
+        stamp = self.version, self.attr_versions(attrs) if attrs else (), extra
+        try:
+            cache = self._cache
+        except AttributeError:
+            cache = self._cache = dict()
+        try:
+            cached_stamp, value = cache[key]
+        except KeyError:
+            pass
+        else:
+            if cached_stamp == stamp:
+                return value
+        value = compute(self)
+        cache[key] = stamp, value
+        return value
+
     @overload
     def __getitem__(self, i: int) -> T:
         ...
@@ -613,6 +1050,25 @@ class ConvertingList(HasConverterMixin[T], List[T]):
         else:
             return s
 
+    def view(self, s: slice) -> SliceView[T]:
+        """A lazy view of a slice of the list (see `SliceView`); nothing is copied."""
+        return SliceView(self, range(len(self))[s])
+
+    def iter_range(self, r: range) -> Iterator[T]:
+        """Iterate over the items in a range of indexes (skipping the same items as iteration)."""
+        if r.step > 0:
+            items = itertools.islice(super().__iter__(), r.start, r.stop, r.step)
+        else:
+            items = map(super().__getitem__, r)
+        skip_state = getattr(self, "skip_state", None)
+        if skip_state is not None:
+            state = skip_state()
+            if not state.count:
+                return items
+            return itertools.compress(items, ~state.mask[np.arange(r.start, r.stop, r.step)])
+        skip_f = getattr(self, "skip_f", None)
+        return items if skip_f is None else filter(skip_f, items)
+
     @overload
     def __setitem__(self, i: int, v: V) -> None:
         ...
@@ -622,20 +1078,82 @@ class ConvertingList(HasConverterMixin[T], List[T]):
         ...
 
     def __setitem__(self, x, v):
-        v = self.converter(v)
-        super().__setitem__(x, v)
+        self._check_unshared()
+        if isinstance(x, slice):
+            v = [*map(self.converter, v)]
+            self._track(v)
+            super().__setitem__(x, v)
+            self.touch()
+        else:
+            v = self.converter(v)
+            self._track((v,))
+            ids = self._ids_assigned(x, v)
+            super().__setitem__(x, v)
+            self._touch(ids)
+
+    def __delitem__(self, x) -> None:
+        self._check_unshared()
+        super().__delitem__(x)
+        self.touch()
+
+    def __iadd__(self, iterable: Iterable[V]) -> ConvertingList[T]:
+        self.extend(iterable)
+        return self
+
+    def __imul__(self, n: int) -> ConvertingList[T]:
+        self._check_unshared()
+        result = super().__imul__(n)
+        self.touch()
+        return result
 
     def insert(self, idx: int, v: Any) -> None:
+        self._check_unshared()
         v = self.converter(v)
+        self._track((v,))
         super().insert(idx, v)
+        self.touch()
 
     def append(self, v: V) -> None:
+        self._check_unshared()
         v = self.converter(v)
+        self._track((v,))
+        ids = self._ids_extended((v,))
         super().append(v)
+        self._touch(ids)
 
     def extend(self, iterable: Iterable[V]) -> None:
-        iterable = map(self.converter, iterable)
-        super().extend(iterable)
+        self._check_unshared()
+        items = [*map(self.converter, iterable)]
+        self._track(items)
+        ids = self._ids_extended(items)
+        super().extend(items)
+        self._touch(ids)
+
+    def pop(self, idx: int = -1) -> T:
+        self._check_unshared()
+        v = super().pop(idx)
+        self.touch()
+        return v
+
+    def remove(self, v: Any) -> None:
+        self._check_unshared()
+        super().remove(v)
+        self.touch()
+
+    def clear(self) -> None:
+        self._check_unshared()
+        super().clear()
+        self.touch()
+
+    def sort(self, *args, **kwargs) -> None:
+        self._check_unshared()
+        super().sort(*args, **kwargs)
+        self.touch()
+
+    def reverse(self) -> None:
+        self._check_unshared()
+        super().reverse()
+        self.touch()
 
     def copy(self) -> ConvertingList[T]:
         return type(self)(self)
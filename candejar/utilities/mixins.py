@@ -3,10 +3,12 @@
 """Special mixin classes."""
 
 from __future__ import annotations
+import weakref
 from typing import Callable, Any, Dict, Optional, Counter, TypeVar, Generic, \
     Type, Sequence, NamedTuple, ClassVar
 
 
+
 class ChildRegistryError(Exception):
     pass
 
@@ -190,6 +192,14 @@ class CompositeAttributeError(AttributeError):
 
 
 class CompositeMixin:
+    """Attributes missing from the composite are looked up on its components.
+
+    The attribute names are routed to the components by a table built when components are added. The table is rebuilt
+    (and checked for duplicate names again) when the components or their numbers of instance attributes change, e.g.
+    after an attribute is added to a component. Call refresh_components() after changes that keep those numbers (e.g.
+    an attribute replaced by another one); missing names also cause a refresh.
+    """
+
     @property
     def _component_attrs(self):
         return [attr for comp in self.components for attr in vars(comp)]
@@ -197,22 +207,56 @@ class CompositeMixin:
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.components = []
+        self.refresh_components()
 
-    def __getattr__(self, item):
+    def refresh_components(self):
+        """Rebuild the table routing attribute names to the components, and check it for duplicate names."""
         ctr = Counter(self._component_attrs)
-        if any(v != 1 for v in ctr.values()):
-            dupes = [k for k, v in ctr.items() if v != 1]
-            comps = [c for c in self.components if any(dupeattr in vars(c) for dupeattr in dupes)]
+        dupes = [k for k, v in ctr.items() if v != 1]
+        routes = dict()
+        # the first component with the name wins, like the lookup of a class attribute
+        for comp in reversed(self.components):
+            routes.update(dict.fromkeys(vars(comp), comp))
+        self._component_routes, self._component_dupes = routes, dupes
+        self._component_sizes = self._current_component_sizes()
+
+    def _current_component_sizes(self):
+        return [(id(comp), len(vars(comp))) for comp in self.components]
+
+    def __getattr__(self, item):
+        self_vars = vars(self)
+        try:
+            routes, dupes, sizes, components = (self_vars[name] for name in ("_component_routes", "_component_dupes",
+                                                                             "_component_sizes", "components"))
+        except KeyError:
+            # not initialized
+            raise AttributeError(f"{type(self).__qualname__!r} object has no attribute {item!r}") from None
+        if sizes != self._current_component_sizes():
+            # components or component attributes were added or removed since the table was made
+            self.refresh_components()
+            return getattr(self, item)
+        if dupes:
+            comps = [c for c in components if any(dupeattr in vars(c) for dupeattr in dupes)]
             raise CompositeAttributeError(f"Duplicate attribute names {str(dupes)[1:-1]} detected "
                                           f"in components {str(comps)[1:-1]}")
         try:
-            comp = next(c for c in self.components if hasattr(c, item))
-            return getattr(comp, item)
-        except (StopIteration, AttributeError):
-            raise AttributeError("{type(self)!r} object has no attribute {item!r}") from None
+            return getattr(routes[item], item)
+        except (KeyError, AttributeError):
+            pass
+        # not an instance attribute of a component when the table was made (e.g. a class attribute)
+        try:
+            comp = next(c for c in components if hasattr(c, item))
+        except StopIteration:
+            raise AttributeError(f"{type(self).__qualname__!r} object has no attribute {item!r}") from None
+        if item in vars(comp) or routes.get(item) is not None:
+            # the components changed since the table was made
+            self.refresh_components()
+            return getattr(self, item)
+        return getattr(comp, item)
 
     def add_component(self, comp):
         self.components.append(comp)
+        self.refresh_components()
 
 
 ##########################################################################
@@ -240,14 +284,23 @@ class GeoInterface:
 
     * Node not part of GeoJSON format spec; a Node contains a node.node attribute which specifies the point number
       TODO: Node could be reworked later to be a "Feature" containing a Point instead but don't have time for that now
+
+    The optional builder argument is a function making the whole __geo_interface__ mapping from the instance (e.g. from
+    cached arrays) in place of the item by item lookups below.
     """
 
-    def __init__(self, geo_type, strict=False):
+    def __init__(self, geo_type, strict=False, builder=None):
         self.geo_type = geo_type
         self.strict = strict
+        self.builder = builder
 
     def __get__(self, instance, owner):
         if instance is not None:
+            if self.builder is not None:
+                try:
+                    return self.builder(instance)
+                except Exception as e:
+                    raise GeoInterfaceError(f"{type(instance).__qualname__} object") from e
             _f = self._lookup[self.geo_type]
             try:
                 geo_type, coords = _f(self, instance)
@@ -347,6 +400,8 @@ class GeoMixin:
     The geo_type argument specifies the type of geometry. Choices are:
         - Point, MultiPoint, Polygon, LineString, MultiPolygon, MultiLineString
         - Any Polygon with only 2 valid points will delegate to a LineString instead
+
+    The optional geo_builder argument is passed on to GeoInterface as the builder.
     """
     __geo_interface__: ClassVar[GeoInterface]
 
@@ -355,10 +410,51 @@ class GeoMixin:
             geo_type = kwargs.pop("geo_type")
         except KeyError:
             raise GeoInterfaceError(f"geo_type argument required to subclass {cls.__qualname__}")
-        cls.__geo_interface__ = GeoInterface(geo_type)
+        cls.__geo_interface__ = GeoInterface(geo_type, builder=kwargs.pop("geo_builder", None))
         super().__init_subclass__(**kwargs)
 
 
+class AttrVersionMixin:
+    """Reports attribute assignments to the holders of the instance, e.g. the lists counting the attribute assignments
+    of their members (see `ConvertingList.attr_versions`).
+
+    Allows values computed from many instances (e.g. all the nodes in a section) to detect in-place changes. Holders
+    are weakly referenced and registered with `add_attr_holder`; each one gets a `_member_assigned(obj, name, value)`
+    call before every assignment. Instances without holders only pay for checking the holders slot. The holders are
+    not copied or pickled.
+    """
+    __slots__ = ("_attr_holders",)
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> AttrVersionMixin:
+        obj = super().__new__(cls)
+        object.__setattr__(obj, "_attr_holders", None)
+        return obj
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return self.__dict__
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        holders = self._attr_holders
+        if holders is not None:
+            for ref in holders:
+                holder = ref()
+                if holder is not None:
+                    holder._member_assigned(self, name, value)
+        object.__setattr__(self, name, value)
+
+
+def add_attr_holder(obj: AttrVersionMixin, ref: weakref.ref) -> None:
+    """Register the (weakly referenced) holder to be told about attribute assignments on obj (see AttrVersionMixin)."""
+    holders = obj._attr_holders
+    if holders is None:
+        holders = (ref,)
+    elif any(r is ref for r in holders):
+        return
+    else:
+        holders = (*(r for r in holders if r() is not None), ref)
+    object.__setattr__(obj, "_attr_holders", holders)
+
+
 class WithKwargsMixin:
     def __init__(self, *args, **kwargs):
         super().__init__(*args)
@@ -5,12 +5,20 @@ Skip() instance to be skipped during iteration but not during any other operatio
 
 Special skippable_len and iter_skippable functions also provided to manage
 ignoring of skipped items appropriately.
+
+SkipAttrIterMixin lists whose items count skip state changes (see
+`skip_version_key`) keep a cached skip mask, so skippable_len is O(1) and
+iteration doesn't inspect every item again until something changes.
 """
 
 from __future__ import annotations
+import functools
+import itertools
 from .. import exc
 from typing import TypeVar, Union, ClassVar, Iterator, Generic, Sized, \
-    SupportsInt, Iterable, Callable, Any
+    SupportsInt, Iterable, Callable, Any, NamedTuple
+
+import numpy as np
 
 
 class Skip:
@@ -33,6 +41,20 @@ class SkipInt(Skip, int):
 T = TypeVar('T')
 
 
+def skip_version_key(attr: str) -> str:
+    """The ConvertingList.attr_versions key counting assignments that change
+    the skip state of an attribute (to or from a Skip value)."""
+    # not a valid attribute name, so it can't collide with one
+    return f"{attr} skip"
+
+
+class SkipState(NamedTuple):
+    """The skip state of the items of a list."""
+    mask: np.ndarray  # True for skipped items
+    count: int  # the number of skipped items
+    keep: bytes  # nonzero for items that are not skipped; for itertools.compress
+
+
 class SkippableIterMixin(Generic[T]):
     """Items are skipped during iteration if skip_f returns False"""
 
@@ -55,22 +77,65 @@ class SkipAttrIterMixin(SkippableIterMixin[T]):
                                         f"{type(self).__qualname__} object ")
 
     def __iter__(self) -> Iterator[T]:
+        if not self._caches_skip_state():
+            # the mask would be thrown away, so skip the items as they come
+            try:
+                yield from super().__iter__()
+            except AttributeError:
+                raise exc.CandeAttributeError(f"{self.skippable_attr!r} attribute required for {type(self)!s} "
+                                              f"collection")
+            return
+        state = self.skip_state()
+        items = super(SkippableIterMixin, self).__iter__()
+        if state.count:
+            items = itertools.compress(items, state.keep)
+        yield from items
+
+    def _caches_skip_state(self) -> bool:
+        return hasattr(self, "cached") and getattr(self, "tracks_attrs", False)
+
+    def skip_state(self) -> SkipState:
+        """The skip mask of the items.
+
+        Cached when the list supports it (see ConvertingList.cached) and
+        counts skip state changes of its members (see
+        ConvertingList.attr_versions); the mask
+        is recomputed only after the list changes, or after the skippable
+        attribute of an item changes to or from a Skip value.
+        """
+        if not self._caches_skip_state():
+            return self._compute_skip_state()
+        return self.cached(("skip", self.skippable_attr), type(self)._compute_skip_state,
+                           attrs=(skip_version_key(self.skippable_attr),))
+
+    def _compute_skip_state(self) -> SkipState:
+        attr = self.skippable_attr
         try:
-            yield from super().__iter__()
+            mask = np.fromiter((isinstance(getattr(obj, attr), Skip) for obj in
+                                super(SkippableIterMixin, self).__iter__()),
+                               dtype=bool, count=len(self))
         except AttributeError:
-            raise exc.CandeAttributeError(f"{self.skippable_attr!r} attribute required for {type(self)!s} collection")
+            raise exc.CandeAttributeError(f"{attr!r} attribute required for {type(self)!s} collection")
+        return SkipState(mask, int(mask.sum()), (~mask).tobytes())
 
     @property
     def skip_f(self):
         try:
             return self._skip_f
         except AttributeError:
-            f = self._skip_f = lambda obj: not isinstance(getattr(obj, self.skippable_attr), Skip)
+            # a partial (unlike a lambda) can be pickled along with the instance
+            f = self._skip_f = functools.partial(_not_skipped, attr=self.skippable_attr)
             return f
 
 
+def _not_skipped(obj: Any, attr: str) -> bool:
+    return not isinstance(getattr(obj, attr), Skip)
+
+
 def skippable_len(x: Union[Sized, SkippableIterMixin[T]]) -> int:
     """Same as len() but takes into account skippable items."""
+    if isinstance(x, SkipAttrIterMixin):
+        return len(x) - x.skip_state().count
     if isinstance(x, SkippableIterMixin):
         return sum(1 for _  in x)
     return len(x)
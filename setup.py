@@ -11,7 +11,7 @@ with open('README.rst') as readme_file:
 with open('HISTORY.rst') as history_file:
     history = history_file.read()
 
-requirements = []
+requirements = ['numpy', ]
 
 setup_requirements = ['pytest-runner', ]
 
@@ -28,6 +28,11 @@ setup(
         'Programming Language :: Python :: 3.7',
     ],
     description="Tools for working with CANDE (.cid) files.",
+    entry_points={
+        'console_scripts': [
+            'candejar=candejar.candejar:main',
+        ],
+    },
     install_requires=requirements,
     license="MIT license",
     long_description=readme + '\n\n' + history,
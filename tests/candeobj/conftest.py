@@ -9,6 +9,7 @@ from dataclasses import make_dataclass
 from candejar.utilities.skip import SkipAttrIterMixin
 
 from candejar.candeobj.candeobj import CandeObj
+from candejar.candeobj.connections import MergedConnection
 
 
 @pytest.fixture
@@ -58,3 +59,41 @@ def NumMapCheck():
     return NumMapCheck
 
 
+@pytest.fixture(scope="session")
+def make_obj():
+    def make_obj(merges: int = 1) -> CandeObj:
+        """Two nodes sections (A and B) of four nodes, an element in each, and a boundary in B. The first `merges` of
+        the two pairs of A and B nodes on their shared edge are merged."""
+        c = CandeObj()
+        c.nodes["A"] = [dict(num=n, x=x, y=y) for n, (x, y) in enumerate([(0, 0), (1, 0), (1, 1), (0, 1)], 101)]
+        c.nodes["B"] = [dict(num=n, x=x, y=y) for n, (x, y) in enumerate([(1, 0), (2, 0), (2, 1), (1, 1)], 201)]
+        c.elements["A"] = [dict(num=1, i=101, j=102, k=103, l=104, mat=1, step=1)]
+        c.elements["A"].nodes = c.nodes["A"]
+        c.elements["B"] = [dict(num=1, i=201, j=202, k=203, l=204, mat=1, step=1)]
+        c.elements["B"].nodes = c.nodes["B"]
+        c.boundaries["B"] = [dict(node=202, xcode=1, ycode=1, step=1)]
+        c.boundaries["B"].nodes = c.nodes["B"]
+        for a, b in [(1, 0), (2, 3)][:merges]:
+            c.connections.append(MergedConnection(items=[c.nodes["A"][a], c.nodes["B"][b]]))
+        return c
+    return make_obj
+
+
+@pytest.fixture(scope="session")
+def lines():
+    def lines(c: CandeObj):
+        """The values written to the .cid file for the nodes, elements, boundaries and totals."""
+        return ([(n.num, n.x, n.y) for n in c.nodes],
+                [(e.num, e.i, e.j, e.k, e.l, e.mat, e.step) for e in c.elements],
+                [(b.node, b.step) for b in c.boundaries],
+                (c.heading, c.nnodes, c.nelements, c.nsteps, c.nsoilmaterials))
+    return lines
+
+
+@pytest.fixture(scope="session")
+def add_element_section():
+    def add_element_section(c: CandeObj, n: int):
+        """Add an elements section C of n elements on the A nodes."""
+        c.elements["C"] = [dict(num=1, i=1, j=2, k=3, l=4, mat=1, step=1)] * n
+        c.elements["C"].nodes = c.nodes["A"]
+    return add_element_section
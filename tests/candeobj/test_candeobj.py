@@ -3,6 +3,10 @@
 
 """Tests for `candejar.candeobj` module."""
 
+import warnings
+
+import pytest
+
 from candejar import msh
 from candejar.candeobj import Node
 from candejar.candeobj.candeobj import CandeObj
@@ -99,3 +103,82 @@ def test_globalize_node_nums(new_c_obj):
     assert node_convert_map[id(new_c_obj.nodes["Section1"])][2001].num == 2
     assert node_convert_map[id(new_c_obj.nodes["Section2"])][3000].num == 1
     assert node_convert_map[id(new_c_obj.nodes["Section2"])][3001].num == 2
+
+
+@pytest.fixture
+def embankment_obj(new_c_obj):
+    """Trapezoid embankment mesh of three quads with sloped sides; nodes have rounding noise."""
+    new_c_obj.nodes["SOIL"] = [dict(num=num, x=x, y=y) for num, (x, y) in
+                               enumerate([(0, 1e-9), (1, 0), (2, -1e-9), (3, 0),
+                                          (0.5, 1), (1.2, 1), (1.8, 1), (2.5, 1)], 1)]
+    new_c_obj.elements["SOIL"] = [dict(num=n, i=n, j=n + 1, k=n + 5, l=n + 4, mat=1, step=1) for n in (1, 2, 3)]
+    new_c_obj.elements["SOIL"].nodes = new_c_obj.nodes["SOIL"]
+    return new_c_obj
+
+
+def test_add_standard_boundaries_box(embankment_obj):
+    embankment_obj.add_standard_boundaries(nodes=embankment_obj.nodes["SOIL"], tol=1e-6)
+    boundaries = [(b.node, b.xcode, b.ycode) for b in embankment_obj.boundaries]
+    assert boundaries == [(1, 1, 1), (2, 0, 1), (3, 0, 1), (4, 1, 1)]
+
+
+def test_add_standard_boundaries_box_exact(embankment_obj):
+    # without a tolerance the extents are matched exactly (the rounding noise is not ignored)
+    embankment_obj.add_standard_boundaries(nodes=embankment_obj.nodes["SOIL"])
+    boundaries = [(b.node, b.xcode, b.ycode) for b in embankment_obj.boundaries]
+    assert boundaries == [(1, 1, 0), (3, 0, 1), (4, 1, 0)]
+
+
+def test_add_standard_boundaries_outline_triangles(embankment_obj):
+    # the middle quad split into two triangles stored with k == l
+    elements = embankment_obj.elements["SOIL"]
+    elements[1].l = elements[1].k
+    elements.append(dict(num=4, i=2, j=7, k=6, l=6, mat=1, step=1))
+    with warnings.catch_warnings():
+        # no zero length edges (with 0 / 0 normals)
+        warnings.simplefilter("error", RuntimeWarning)
+        embankment_obj.add_standard_boundaries(nodes=embankment_obj.nodes["SOIL"], extents="outline")
+    boundaries = [(b.node, b.xcode, b.ycode) for b in embankment_obj.boundaries]
+    assert boundaries == [(1, 1, 1), (2, 0, 1), (3, 0, 1), (4, 1, 1), (5, 1, 0), (8, 1, 0)]
+
+
+def test_add_standard_boundaries_outline(embankment_obj):
+    embankment_obj.add_standard_boundaries(nodes=embankment_obj.nodes["SOIL"], extents="outline")
+    boundaries = [(b.node, b.xcode, b.ycode) for b in embankment_obj.boundaries]
+    assert boundaries == [(1, 1, 1), (2, 0, 1), (3, 0, 1), (4, 1, 1), (5, 1, 0), (8, 1, 0)]
+    assert all(b.step == 1 for b in embankment_obj.boundaries)
+
+
+def test_add_standard_boundaries_bad_extents(embankment_obj):
+    with pytest.raises(ValueError):
+        embankment_obj.add_standard_boundaries(nodes=embankment_obj.nodes["SOIL"], extents="circle")
+
+
+def test_add_msh_sections(tmp_path, new_c_obj, complicated_msh_lines):
+    path = tmp_path / "mesh.msh"
+    path.write_text("\n".join(complicated_msh_lines))
+    expected = CandeObj()
+    expected.add_from_msh(path, name="expected")
+
+    names = new_c_obj.add_msh_sections(path, path, names=["A", None],
+                                       transform=lambda xy: xy + (10.0, 0.0), node_offset=1000)
+    assert names == ["A", "section2"]
+    for name in names:
+        assert new_c_obj.elements[name].nodes is new_c_obj.nodes[name]
+        assert new_c_obj.boundaries[name].nodes is new_c_obj.nodes[name]
+    assert [n.num - 1000 for n in new_c_obj.nodes["A"]] == [n.num for n in expected.nodes["expected"]]
+    assert [c for n in new_c_obj.nodes["A"] for c in (n.x - 10.0, n.y)] == \
+           pytest.approx([c for n in expected.nodes["expected"] for c in (n.x, n.y)])
+    assert [(e.num, e.i, e.j, e.mat) for e in new_c_obj.elements["A"]] == \
+           [(e.num, e.i + 1000, e.j + 1000, e.mat) for e in expected.elements["expected"]]
+    assert [b.node for b in new_c_obj.boundaries["A"]] == [b.node + 1000 for b in expected.boundaries["expected"]]
+
+
+def test_add_msh_sections_non_integer_node(tmp_path, new_c_obj):
+    from candejar.mshrw.exc import MSHLineProcessingError
+
+    path = tmp_path / "mesh.msh"
+    path.write_text("2\n1    0.0    0.0\n3.7    1.0    0.0\n\n0\n\n0\n")
+    with pytest.raises(MSHLineProcessingError):
+        new_c_obj.add_msh_sections(path)
+    assert not new_c_obj.nodes.seq_map
@@ -44,3 +44,96 @@ def test_c_instance_(i, list_, c_instance):
         assert c_instance[i]==types.SimpleNamespace(**list_[i])
         assert c_instance[i]!=list_[i]
 
+
+
+def test_section_slice_view():
+    from candejar.candeobj.candeseq import NodesSection
+    from candejar.utilities.collections import SliceView
+    from candejar.utilities.skip import SkipInt
+
+    section = NodesSection([dict(num=n, x=float(n), y=0.0) for n in range(1, 11)])
+    section[3].num = SkipInt(4)
+    view = section.view(slice(1, 9, 2))
+    assert isinstance(view, SliceView) and len(view) == 4
+    # the skipped node is left out of iteration, the same as for the section
+    assert [n.num for n in view] == [2, 6, 8]
+    assert [n.num for n in view[::-1]] == [8, 6, 2]
+    version = section.version
+    view[0] = dict(num=20, x=0.0, y=0.0)
+    assert section[1].num == 20 and section.version > version
+
+
+def test_bulk_constructors():
+    from candejar.candeobj import exc
+    from candejar.candeobj.candeseq import NodesSection, ElementsSection
+    from candejar.candeobj.parts import Node, Element
+
+    records = [dict(num=1, x=0.0, y=0.0), dict(num=2, x=1.0, y=0.0, master=None)]
+    section = NodesSection.from_records(records)
+    assert all(type(n) is Node for n in section)
+    assert [(n.num, n.x, n.master) for n in section] == [(1, 0.0, None), (2, 1.0, None)]
+    assert NodesSection.from_records(section)[0] is section[0]
+    # extra attributes present in only some records: converted one at a time
+    mixed = NodesSection.from_records([dict(num=1, x=0.0, y=0.0, extra=1), dict(num=2, x=1.0, y=0.0)])
+    assert mixed[0].extra == 1 and not hasattr(mixed[1], "extra")
+
+    elements = ElementsSection.from_columns(dict(num=[1, 2], i=[1, 2], j=[2, 3], mat=[1, 1]))
+    assert [(e.num, e.k, e.mat) for e in elements] == [(1, 0, 1), (2, 0, 1)]
+    assert type(ElementsSection.from_trusted(list(elements))) is ElementsSection
+    with pytest.raises(exc.CandeValueError):
+        ElementsSection.from_columns(dict(num=[1, 2], i=[1], j=[2, 3]))
+    with pytest.raises(exc.CandeTypeError):
+        ElementsSection.from_columns(dict(num=[1], i=[1]))
+    assert elements == ElementsSection([Element(num=1, i=1, j=2, mat=1), Element(num=2, i=2, j=3, mat=1)])
+
+
+def test_section_slice():
+    from candejar.candeobj.candeseq import NodesSection
+    from candejar.utilities.skip import SkipInt
+
+    section = NodesSection([dict(num=n, x=float(n), y=0.0) for n in range(1, 6)])
+    section[2].num = SkipInt(3)
+    items = section[1:4]
+    # a new section of the same items, skipping the same items as the section
+    assert type(items) is NodesSection and items[0] is section[1]
+    assert [n.num for n in items] == [2, 4]
+    items.append(section[0])
+    section.insert(0, dict(num=6, x=6.0, y=0.0))
+    assert [n.num for n in items] == [2, 4, 1]
+
+
+def test_section_attr_versions():
+    import copy
+    import pickle
+    from candejar.candeobj.candeseq import NodesSection
+    from candejar.candeobj.parts import Node
+    from candejar.utilities.skip import SkipInt, skip_version_key
+
+    class SubNode(Node, geo_type="Point"):
+        pass
+
+    a = NodesSection([dict(num=1, x=0.0, y=0.0), SubNode(num=2, x=1.0, y=0.0)])
+    b = NodesSection([dict(num=3, x=0.0, y=1.0), a[0]])
+    attrs = ("x", skip_version_key("num"))
+    assert a.attr_versions(attrs) == b.attr_versions(attrs) == (0, 0)
+    # subclass instances are counted too
+    a[1].x = 2.0
+    assert a.attr_versions(attrs) == (1, 0) and b.attr_versions(attrs) == (0, 0)
+    # a member of both sections is counted by both
+    a[0].num = SkipInt(1)
+    assert a.attr_versions(attrs) == (1, 1) and b.attr_versions(attrs) == (0, 1)
+    # members added after counting starts are counted
+    a.append(dict(num=4, x=0.0, y=0.0))
+    a[2].x = 3.0
+    assert a.attr_versions(attrs) == (2, 1)
+    # instances not held by a counting section (e.g. copies) aren't counted
+    node = copy.copy(a[0])
+    node.x = 5.0
+    pickle.loads(pickle.dumps(a[0])).x = 5.0
+    copy.copy(a).attr_versions(attrs)
+    assert a.attr_versions(attrs) == (2, 1)
+    # bulk made members are counted the same
+    bulk = NodesSection.from_columns(dict(num=[1, 2], x=[0.0, 1.0], y=[0.0, 0.0]))
+    bulk.attr_versions(attrs)
+    bulk[1].x = 2.0
+    assert bulk.attr_versions(attrs) == (1, 0)
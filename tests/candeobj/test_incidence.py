@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `candejar.candeobj.incidence` module."""
+
+import pytest
+
+from candejar.candeobj import exc, incidence
+from candejar.candeobj.candeseq import NodesSection, ElementsSection, BoundariesSection
+from candejar.candeobj.candeobj import CandeObj
+from candejar.utilities.skip import SkipInt
+
+
+@pytest.fixture
+def elements():
+    """2x1 grid of quads with a triangle on top of the first one."""
+    nodes = NodesSection([dict(num=n, x=float((n - 1) % 3), y=float((n - 1) // 3)) for n in range(1, 8)])
+    elements = ElementsSection([dict(num=1, i=1, j=2, k=5, l=4), dict(num=2, i=2, j=3, k=6, l=5),
+                                dict(num=3, i=4, j=5, k=7)])
+    elements.nodes = nodes
+    return elements
+
+
+def test_section_incidence(elements):
+    boundaries = BoundariesSection([dict(node=1), dict(node=3), dict(node=1)])
+    boundaries.nodes = elements.nodes
+    node_elements, node_boundaries, neighbors = incidence.section_incidence(elements, boundaries)
+    assert [node_elements.row(n).tolist() for n in range(7)] == [[0], [0, 1], [1], [0, 2], [0, 1, 2], [1], [2]]
+    assert [node_boundaries.row(n).tolist() for n in range(7)] == [[0, 2], [], [1], [], [], [], []]
+    assert [neighbors.row(e).tolist() for e in range(3)] == [[1, 2], [0], [0]]
+    assert incidence.section_incidence(elements).node_boundaries.counts().tolist() == [0] * 7
+    other = BoundariesSection([dict(node=1)])
+    other.nodes = NodesSection()
+    with pytest.raises(exc.CandeValueError):
+        incidence.section_incidence(elements, other)
+
+
+def test_section_incidence_repeats(elements):
+    # triangles stored with k == l, sharing only the k corner
+    elements[:] = [dict(num=1, i=5, j=4, k=3, l=3), dict(num=2, i=1, j=2, k=3, l=3)]
+    assert [incidence.element_neighbors(elements).row(e).tolist() for e in range(2)] == [[], []]
+    assert incidence.node_elements(elements).row(2).tolist() == [0, 1]
+
+
+def test_section_incidence_changes(elements):
+    node_elements = incidence.node_elements(elements)
+    assert incidence.node_elements(elements) is node_elements
+    elements[2].k = 6
+    assert incidence.node_elements(elements).row(6).tolist() == []
+    assert incidence.element_neighbors(elements).row(2).tolist() == [0, 1]
+    # skipped elements are not counted
+    elements[0].num = SkipInt(1)
+    assert incidence.node_elements(elements).row(0).tolist() == []
+    assert incidence.element_neighbors(elements).row(1).tolist() == [0]
+    elements.nodes.append(dict(num=8, x=0.0, y=3.0))
+    assert len(incidence.node_elements(elements)) == 8
+    elements[1].l = 9
+    with pytest.raises(exc.CandeValueError):
+        incidence.node_elements(elements)
+
+
+def test_cande_obj_incidence(elements):
+    c = CandeObj()
+    c.nodes["A"] = elements.nodes
+    c.elements["A"] = elements
+    c.nodes["B"] = [dict(num=n, x=x, y=y) for n, (x, y) in enumerate([(5, 0), (6, 0), (6, 1)], 8)]
+    c.elements["B"] = [dict(num=1, i=8, j=9, k=10)]
+    c.elements["B"].nodes = c.nodes["B"]
+    c.boundaries["B"] = [dict(node=9, xcode=1)]
+    c.boundaries["B"].nodes = c.nodes["B"]
+    with pytest.raises(exc.CandeValueError):
+        c.incidence()
+    c.prepare()
+    node_elements, node_boundaries, neighbors = c.incidence()
+    assert c.incidence() is c.incidence()
+    assert len(node_elements) == c.nnodes == 10
+    # global node numbers
+    assert [node_elements.row(n).tolist() for n in (0, 4, 7, 9)] == [[0], [0, 1, 2], [3], [3]]
+    assert [node_boundaries.row(n).tolist() for n in range(10)] == [[]] * 8 + [[0], []]
+    assert [neighbors.row(e).tolist() for e in range(4)] == [[1, 2], [0], [0], []]
+    c.elements["B"][0].k = 1
+    with pytest.raises(exc.CandeValueError):
+        c.incidence()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `candejar.candeobj.instrumentation` module."""
+
+import json
+
+from candejar.candeobj.candeobj import CandeObj
+from candejar.candeobj.instrumentation import NULL_RECORDER, PrepareRecorder, StageRecord
+
+PREPARE_STAGES = ["num_maps", "make_connections", "globalize_node_nums", "globalize_node_references",
+                  "order_pipe_sections", "globalize_element_nums", "update_totals"]
+
+
+def test_not_instrumented(cande_obj_standard: CandeObj):
+    assert cande_obj_standard._recorder is NULL_RECORDER
+    cande_obj_standard.prepare()
+    assert "_recorder" not in vars(cande_obj_standard)
+
+
+def test_instrument_prepare(cande_obj_standard: CandeObj):
+    with cande_obj_standard.instrument() as recorder:
+        cande_obj_standard.prepare()
+    assert cande_obj_standard._recorder is NULL_RECORDER
+    assert [record.name for record in recorder.stages] == PREPARE_STAGES
+    assert all(record.seconds >= 0 for record in recorder.stages)
+    records = {record.name: record for record in recorder.stages}
+    assert records["num_maps"].items == len(cande_obj_standard.nodes)
+    assert records["globalize_element_nums"].items == len(cande_obj_standard.elements)
+    assert records["update_totals"].items is None
+
+
+def test_instrument_report(cande_obj_standard: CandeObj):
+    with cande_obj_standard.instrument(allocations=True) as recorder:
+        cande_obj_standard.prepare()
+        cande_obj_standard.prepare(full=True)
+    report = json.loads(recorder.to_json())
+    assert report["runs"] == 2
+    assert len(report["stages"]) == 2 * len(PREPARE_STAGES)
+    assert list(report["totals"]) == PREPARE_STAGES
+    assert all(stage["alloc_bytes"] is not None for stage in report["stages"])
+    assert {stage["run"] for stage in report["stages"]} == {1, 2}
+
+
+def test_instrument_callback(cande_obj_standard: CandeObj):
+    seen = []
+    with cande_obj_standard.instrument(callback=seen.append):
+        cande_obj_standard.prepare()
+    assert all(isinstance(record, StageRecord) for record in seen)
+    assert [record.name for record in seen] == PREPARE_STAGES
+
+
+def test_recorder_stage_error():
+    recorder = PrepareRecorder()
+    try:
+        with recorder.stage("failing", count=lambda: 1):
+            raise RuntimeError()
+    except RuntimeError:
+        pass
+    record, = recorder.stages
+    assert record.name == "failing"
+    assert record.items is None
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `candejar.candeobj.meshgeo` module."""
+
+import numpy as np
+import pytest
+
+from candejar.candeobj import meshgeo
+from candejar.candeobj.candeobj import CandeObj
+from candejar.candeobj.candeseq import NodesSection, ElementsSection, BoundariesSection
+from candejar.utilities.mixins import GeoInterface, GeoInterfaceError
+from candejar.utilities.skip import SkipInt
+
+
+def legacy(section):
+    """The __geo_interface__ made item by item."""
+    geo_type = type(section).__geo_interface__.geo_type
+    return GeoInterface(geo_type).__get__(section, type(section))
+
+
+@pytest.fixture
+def nodes():
+    return NodesSection([dict(num=n, x=float(n % 3), y=float(n // 3)) for n in range(1, 7)])
+
+
+@pytest.fixture
+def elements(nodes):
+    elements = ElementsSection([dict(num=1, i=1, j=2, k=5, l=4), dict(num=2, i=2, j=3, k=5)])
+    elements.nodes = nodes
+    return elements
+
+
+@pytest.fixture
+def boundaries(nodes):
+    boundaries = BoundariesSection([dict(node=1, xcode=1), dict(node=6, ycode=1)])
+    boundaries.nodes = nodes
+    return boundaries
+
+
+def test_geo_interface(nodes, elements, boundaries):
+    nodes[4].num = SkipInt(5)
+    for section in (nodes, elements, boundaries):
+        assert section.__geo_interface__ == legacy(section)
+    assert elements.__geo_interface__["type"] == "MultiPolygon"
+    assert len(meshgeo.shape(nodes).geoms) == 5
+    assert meshgeo.shape(elements).area == pytest.approx(2.0)
+
+
+def test_line_elements(elements):
+    elements[1].k = 0
+    assert elements.__geo_interface__ == legacy(elements)
+    assert elements.__geo_interface__["type"] == "MultiLineString"
+    elements[1].j = 0
+    with pytest.raises(GeoInterfaceError):
+        elements.__geo_interface__
+
+
+def test_cached(nodes, elements):
+    geometry = elements.geometry()
+    shape = geometry.shape()
+    assert elements.geometry() is geometry and meshgeo.shape(elements) is shape
+    elements[0].mat = 2
+    assert elements.geometry() is geometry
+    with pytest.raises(ValueError):
+        geometry.coords[0, 0] = 1.0
+
+
+@pytest.mark.parametrize("change", [
+    lambda nodes, elements: setattr(nodes[4], "x", 5.0),
+    lambda nodes, elements: setattr(elements[1], "k", 6),
+    lambda nodes, elements: nodes.append(dict(num=7, x=9.0, y=9.0)),
+    lambda nodes, elements: elements.pop(),
+    lambda nodes, elements: setattr(elements, "nodes", NodesSection(nodes)),
+    lambda nodes, elements: setattr(elements[0], "num", SkipInt(1)),
+], ids=["coordinates", "connectivity", "nodes section", "elements section", "nodes reference", "skipped"])
+def test_invalidated(nodes, elements, change):
+    geometry = elements.geometry()
+    change(nodes, elements)
+    assert elements.geometry() is not geometry
+    assert elements.__geo_interface__ == legacy(elements)
+
+
+def test_locate(nodes, elements):
+    # where the square and the triangle overlap the square (first) wins
+    points = [(1.5, 0.1), (0.5, 0.9), (1.5, 0.5), (0.5, 0.2), (-1.0, 0.0)]
+    assert elements.locate(points).tolist() == [0, 1, 0, -1, -1]
+    index, weights = elements.locate(points, weights=True)
+    assert weights[0] == pytest.approx([0.45, 0.45, 0.05, 0.05])
+    assert weights[1] == pytest.approx([0.1, 0.75, 0.15, 0.0]) and np.isnan(weights[3:]).all()
+    assert meshgeo.element_faces(elements) is meshgeo.element_faces(elements)
+    # skipped elements are passed over
+    elements[0].num = SkipInt(1)
+    assert elements.locate(points).tolist() == [-1, 0, 0, -1, -1]
+
+
+def test_locate_mixed(elements):
+    # a two node element makes the section geometry lines; the triangle is still found
+    elements.insert(0, dict(num=3, i=1, j=2))
+    assert elements.geometry().type == "MultiLineString"
+    points = [(1.5, 0.1), (0.5, 0.9), (1.5, 0.5)]
+    assert elements.locate(points).tolist() == [1, 2, 1]
+    # a triangle stored with k == l gets barycentric weights, the l node none
+    elements[2].l = elements[2].k
+    index, weights = elements.locate(points, weights=True)
+    assert index.tolist() == [1, 2, 1] and weights[1] == pytest.approx([0.1, 0.75, 0.15, 0.0])
+    elements[2].i, elements[2].j, elements[2].k, elements[2].l = 3, 3, 5, 2
+    assert elements.locate(points, weights=True)[1][1] == pytest.approx([0.75, 0.0, 0.15, 0.1])
+    # elements with fewer than three different nodes are passed over
+    elements[1].k = elements[1].l = 0
+    elements[2].l = 5
+    assert elements.locate(points).tolist() == [-1, -1, -1]
+
+
+def test_cande_obj_locate(elements):
+    c = CandeObj()
+    c.nodes["A"] = elements.nodes
+    c.elements["A"] = elements
+    xy = [(0, 5), (1, 5), (5, 5), (5, 6), (0, 0), (1, 0), (1, 1), (0, 1)]
+    c.nodes["B"] = [dict(num=n, x=x, y=y) for n, (x, y) in enumerate(xy, 7)]
+    c.elements["pipe"] = [dict(num=1, i=1, j=2)]
+    c.elements["pipe"].nodes = c.nodes["B"]
+    # a mixed section (soil and pipe elements)
+    c.elements["B"] = [dict(num=1, i=1, j=3, k=4), dict(num=2, i=1, j=2), dict(num=3, i=5, j=6, k=7, l=8)]
+    c.elements["B"].nodes = c.nodes["B"]
+    points = [(4.0, 5.5), (0.5, 0.5), (1.5, 0.2), (0.5, 4.0), (0.9, 0.95)]
+    # the pipe elements are passed over, and the A elements win where element B 3 overlaps them
+    assert c.locate(points).tolist() == [3, 5, 0, -1, 1]
+    index, weights = c.locate(points, weights=True)
+    assert weights[0] == pytest.approx([0.2, 0.3, 0.5, 0.0])
+    assert np.isnan(weights[3]).all() and not np.isnan(weights[[0, 1, 2, 4]]).any()
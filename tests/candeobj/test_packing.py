@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `candejar.candeobj.packing` module (pickling of CandeObj and sections)."""
+
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+from candejar.candeobj import packing
+from candejar.candeobj.candeseq import NodesSection
+from candejar.utilities.skip import SkipInt
+
+
+@pytest.mark.parametrize("values, kind", [
+    ([1, SkipInt(2), 300], "int"),
+    ([7, 7], "constant"),
+    ([1.5, 2.0], "float"),
+    ([1, 2.5], "number"),
+    (["a", None], "object"),
+    ([2 ** 70, 1], "object"),
+])
+def test_pack_values(values, kind):
+    column = packing.pack_values(values)
+    assert column[0] == kind
+    result = packing.unpack_values(column, len(values))
+    assert result == values
+    assert [type(v) for v in result] == [type(v) for v in values]
+
+
+@pytest.mark.parametrize("protocol", [4, 5])
+def test_pickle_cande_obj(protocol, make_obj, lines):
+    c = make_obj()
+    c.prepare()
+    c.nodes["A"][0].extra = "only one node has this"
+    new = pickle.loads(pickle.dumps(c, protocol=protocol))
+    assert lines(new) == lines(c)
+    assert new.nodes["A"][0].extra == "only one node has this"
+    assert not hasattr(new.nodes["A"][1], "extra")
+    # node references are restored as references
+    assert new.elements["A"].nodes is new.nodes["A"]
+    assert new.boundaries["B"].nodes is new.nodes["B"]
+    slave = new.nodes["B"][0]
+    assert isinstance(slave.num, SkipInt)
+    assert slave.master is new.nodes["A"][1]
+    assert new.nodes["A"][1].slaves == [slave]
+    assert new.connections[0].items == [new.nodes["A"][1], slave]
+
+
+def test_pickle_keeps_prepared_state(make_obj, lines):
+    c = make_obj()
+    c.prepare()
+    new = pickle.loads(pickle.dumps(c))
+    with new.instrument() as recorder:
+        new.prepare()
+    assert "num_maps" not in recorder.totals()
+    assert lines(new) == lines(c)
+
+
+def test_pickle_fork(make_obj, lines):
+    c = make_obj()
+    c.prepare()
+    fork = c.fork()
+    new = pickle.loads(pickle.dumps(fork))
+    assert "_shared_sections" not in vars(new)
+    assert lines(new) == lines(c)
+
+
+def test_out_of_band_buffers(make_obj, lines):
+    c = make_obj()
+    data, buffers = packing.dumps(c)
+    assert buffers
+    assert lines(packing.loads(data, buffers)) == lines(c)
+
+
+def test_pickle_section():
+    section = NodesSection([dict(num=1, x=0.0, y=0.0), dict(num=2, x=1.0, y=0.0)])
+    section[1].master = section[0]
+    section.touch()
+    new = pickle.loads(pickle.dumps(section))
+    assert type(new) is NodesSection and new.version == section.version
+    assert [(n.num, n.x, n.y) for n in new] == [(1, 0.0, 0.0), (2, 1.0, 0.0)]
+    assert new[1].master is new[0]
+
+
+def test_copy_is_shallow(make_obj):
+    c = make_obj()
+    section = c.nodes["A"]
+    assert copy.copy(section)[0] is section[0]
+    assert copy.copy(c).nodes is c.nodes
+    # deep copies use the packed form
+    assert copy.deepcopy(section)[0] is not section[0]
+    assert np.isclose(copy.deepcopy(section)[1].x, section[1].x)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for the incremental `CandeObj.prepare` (`candejar.candeobj.prepared` module)."""
+
+import pytest
+
+from candejar.candeobj.candeobj import CandeObj
+from candejar.candeobj.exc import CandeKeyError
+
+
+def result(c: CandeObj):
+    return ([(e.num, e.i, e.j, e.k, e.l) for e in c.elements],
+            [b.node for b in c.boundaries],
+            (c.nnodes, c.nelements, c.nboundaries, c.nsteps, c.nsoilmaterials))
+
+
+def add_section(c: CandeObj):
+    i, j, k, l = (node.num for node in c.nodes["A"])
+    c.elements["A2"] = [dict(num=1, i=i, j=j, k=k, l=k, mat=2, step=2)]
+    c.elements["A2"].nodes = c.nodes["A"]
+    c.boundaries["A"] = [dict(node=l, xcode=1, ycode=1, step=1)]
+    c.boundaries["A"].nodes = c.nodes["A"]
+
+
+def test_prepare_idempotent(make_obj):
+    c = make_obj(merges=2)
+    c.prepare()
+    first = result(c)
+    c.prepare()
+    assert result(c) == first
+    c.prepare(full=True)
+    assert result(c) == first
+
+
+def test_prepare_incremental_matches_full(make_obj):
+    incremental = make_obj(merges=2)
+    incremental.prepare()
+    add_section(incremental)
+    with incremental.instrument() as recorder:
+        incremental.prepare()
+    # node numbering was reused
+    assert "num_maps" not in recorder.totals()
+
+    full = make_obj(merges=2)
+    full.prepare()
+    add_section(full)
+    full.prepare(full=True)
+    assert result(incremental) == result(full)
+    assert result(full)[0][-1] == (3, 1, 2, 3, 3)
+
+
+def test_prepare_incremental_member_edit(make_obj):
+    c = make_obj(merges=2)
+    c.prepare()
+    c.elements["A"][0].mat = 7
+    c.prepare()
+    assert c.nsoilmaterials == 7
+
+
+def test_prepare_other_model_edit(make_obj):
+    c, other = make_obj(merges=2), make_obj(merges=2)
+    c.prepare()
+    other.prepare()
+    other.elements["A"][0].i = 102
+    other.nodes["A"][0].num = 110
+    # edits in another model (or another section) don't make this model dirty
+    assert c._prepared_state.same_node_numbering(c)
+    assert not c._prepared_state.dirty_elements(c)
+    assert other._prepared_state.dirty_elements(other) == [other.elements["A"]]
+    assert not other._prepared_state.same_node_numbering(other)
+
+
+def test_prepare_node_change_full(make_obj):
+    c = make_obj(merges=2)
+    c.prepare()
+    c.nodes["B"].append(dict(num=205, x=3, y=0))
+    with c.instrument() as recorder:
+        c.prepare()
+    assert "num_maps" in recorder.totals()
+    with c.instrument() as recorder:
+        c.prepare()
+    assert "num_maps" not in recorder.totals()
+
+
+def test_mark_dirty(make_obj):
+    c = make_obj(merges=2)
+    c.prepare()
+    version = c.elements["A"].version
+    c.mark_dirty("A")
+    assert c.elements["A"].version == version + 1
+    with pytest.raises(CandeKeyError):
+        c.mark_dirty("Z")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `candejar.candeobj.shared` module."""
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from candejar.candeobj import exc
+from candejar.candeobj.shared import SharedMesh, attach
+
+
+@pytest.fixture
+def shared(make_obj):
+    with SharedMesh(make_obj()) as shared:
+        yield shared
+
+
+def worker_cande_obj(handle):
+    with attach(handle) as model:
+        return model.to_cande_obj()
+
+
+def test_attach(shared, make_obj, lines):
+    expected = make_obj()
+    expected.prepare()
+    with attach(shared.handle) as model:
+        assert model.keys("elements") == ["A", "B"]
+        x = model.column("nodes", "B", "x")
+        assert x.tolist() == [1, 2, 2, 1]
+        assert not x.flags.writeable
+        del x
+        c = model.to_cande_obj()
+    assert lines(c) == lines(expected)
+    assert c.nodes["B"][0].master is c.nodes["A"][1]
+
+
+def test_overlay(shared, lines):
+    with attach(shared.handle) as model:
+        model.set("elements", "B", "mat", 2)
+        model.set("nodes", "A", "x", [5.0, 6.0], index=[2, 3])
+        assert model.column("elements", "B", "mat").tolist() == [2]
+        with pytest.raises(exc.CandeTypeError):
+            model.set("nodes", "B", "master", None)
+        c = model.to_cande_obj()
+        model.clear()
+        assert lines(model.to_cande_obj()) != lines(c)
+    assert [n.x for n in c.nodes["A"]] == [0, 1, 5.0, 6.0]
+    # the edited sections are prepared again
+    with c.instrument() as recorder:
+        c.prepare()
+    assert "num_maps" in recorder.totals()
+    assert c.nsoilmaterials == 2
+
+
+def test_handle_is_small(shared):
+    assert len(pickle.dumps(shared.handle)) < 4096
+
+
+def test_attach_in_worker(shared, lines):
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = [lines(c) for c in executor.map(worker_cande_obj, [shared.handle] * 2)]
+    with attach(shared.handle) as model:
+        expected = lines(model.to_cande_obj())
+    assert results == [expected, expected]
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for CandeObj.snapshot and CandeObj.restore."""
+
+import pytest
+
+
+def test_snapshot_shares_sections(make_obj):
+    c = make_obj()
+    c.prepare()
+    snapshot = c.snapshot()
+    assert all(snapshot.sections["elements"][k] is c.elements[k] for k in "AB")
+    # first write copies only the one section
+    own = c.own_section("elements", "B")
+    assert own is not snapshot.sections["elements"]["B"]
+    assert c.elements["A"] is snapshot.sections["elements"]["A"]
+    assert c.nodes["B"] is snapshot.sections["nodes"]["B"]
+
+
+def test_restore(make_obj, lines, add_element_section):
+    c = make_obj()
+    c.prepare()
+    before = lines(c)
+    sections = {k: c.elements[k] for k in "AB"}
+    snapshot = c.snapshot()
+
+    for element in c.own_section("elements", "B"):
+        element.mat = 5
+    add_element_section(c, 2)
+    c.heading = "trial"
+    c.prepare()
+    assert c.nsoilmaterials == 5 and c.nelements == 4
+
+    c.restore(snapshot)
+    assert lines(c) == before
+    assert all(c.elements[k] is sections[k] for k in "AB")
+    assert "C" not in c.elements.seq_map
+
+    # restoring again after more changes
+    for node in c.own_section("nodes", "A"):
+        node.x += 1
+    c.prepare()
+    c.restore(snapshot)
+    assert lines(c) == before
+    # the restored model is still prepared
+    with c.instrument() as recorder:
+        c.prepare()
+    assert "num_maps" not in recorder.totals()
+
+
+def test_mark_dirty_owns(make_obj):
+    c = make_obj()
+    c.prepare()
+    snapshot = c.snapshot()
+    version = c.elements["A"].version
+    c.mark_dirty("A")
+    assert snapshot.sections["elements"]["A"].version == version
+    assert c.elements["A"] is not snapshot.sections["elements"]["A"]
+
+
+@pytest.mark.parametrize("edit", [
+    lambda c: setattr(c.elements["B"][0], "mat", 9),
+    lambda c: c.elements["B"].append(dict(num=2, i=201, j=202, k=203, l=204, mat=1, step=1)),
+    lambda c: setattr(c.nodes["A"][0], "x", 55),
+    lambda c: c.elements.__setitem__(0, dict(num=1, i=101, j=102, k=103, l=104, mat=9, step=1)),
+], ids=["member", "append", "node member", "chain item"])
+def test_shared_sections_read_only(edit, make_obj, lines):
+    c = make_obj()
+    c.prepare()
+    before = lines(c)
+    snapshot = c.snapshot()
+    with pytest.raises(ValueError):
+        edit(c)
+    assert lines(c) == before
+    c.restore(snapshot)
+    assert lines(c) == before
+    with pytest.raises(ValueError):
+        edit(c)
+    # the sections are no longer shared once the snapshot is gone
+    del snapshot
+    edit(c)
+    assert lines(c) != before
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tests for `candejar.candeobj.sweep` module (and CandeObj.fork)."""
+
+import copy
+import json
+
+import pytest
+
+from candejar.candeobj.candeobj import CandeObj
+from candejar.candeobj.sweep import Sweep, SetSectionAttr, SetAttr
+
+
+@pytest.fixture
+def sweep(make_obj):
+    return Sweep(make_obj(), grid=dict(mat=[2, 3], step=[1, 2, 3], heading=["X"]),
+                 edits=dict(mat=SetSectionAttr("elements", "B", "mat"), step=SetSectionAttr("elements", "A", "step"),
+                            heading=SetAttr("heading")))
+
+
+def test_fork_shares_sections(make_obj):
+    c = make_obj()
+    c.prepare()
+    fork = c.fork()
+    assert all(fork.nodes[k] is c.nodes[k] for k in "AB")
+    assert fork.pipegroups is not c.pipegroups
+    own = fork.own_section("elements", "A")
+    assert own is not c.elements["A"] and own.nodes is c.nodes["A"]
+    assert fork.own_section("elements", "A") is own
+    assert fork.elements["B"] is c.elements["B"]
+
+
+def test_fork_shared_read_only(make_obj):
+    c = make_obj()
+    fork = c.fork()
+    with pytest.raises(ValueError):
+        fork.elements["A"][0].mat = 2
+    with pytest.raises(ValueError):
+        c.nodes["A"].append(dict(num=105, x=0, y=2))
+    fork.own_section("elements", "A")[0].mat = 2
+    # the base is the only holder of its section now
+    c.elements["A"][0].mat = 3
+    assert (fork.elements["A"][0].mat, c.elements["A"][0].mat) == (2, 3)
+
+
+def test_fork_own_nodes(make_obj):
+    c = make_obj()
+    c.prepare()
+    fork = c.fork()
+    nodes_a = fork.own_section("nodes", "A")
+    assert nodes_a is not c.nodes["A"] and fork.nodes["B"] is c.nodes["B"]
+    assert fork.elements["A"] is not c.elements["A"] and fork.elements["A"].nodes is nodes_a
+    assert fork.elements["B"] is c.elements["B"] and fork.boundaries["B"] is c.boundaries["B"]
+    assert fork.connections[0].items[0] is nodes_a[1]
+    assert c.connections[0].items[0] is c.nodes["A"][1]
+
+
+def test_sweep_params(sweep):
+    assert len(sweep) == 6
+    assert [sweep.params(i) for i in (0, 1, 5)] == [dict(mat=2, step=1, heading="X"), dict(mat=2, step=2, heading="X"),
+                                                    dict(mat=3, step=3, heading="X")]
+    assert [sweep.name(i) for i in (0, 5)] == ["variant_0", "variant_5"]
+
+
+def test_sweep_variants(sweep, make_obj, lines):
+    base_lines = lines(sweep.base)
+    for variant in sweep:
+        expected = copy.deepcopy(make_obj())
+        for key, value in variant.params.items():
+            sweep.edits[key](expected, value)
+        expected.prepare()
+        assert lines(variant.cande_obj) == lines(expected)
+        # the unedited sections are still shared with the base
+        assert variant.cande_obj.nodes["A"] is sweep.base.nodes["A"]
+        assert variant.cande_obj.elements["A"] is not sweep.base.elements["A"]
+    assert lines(sweep.base) == base_lines
+
+
+def test_sweep_layout_change(make_obj, lines, add_element_section):
+    base = make_obj()
+    sweep = Sweep(base, grid=dict(n=[1, 2]), edits=dict(n=add_element_section))
+    base_lines = lines(base)
+    for variant in sweep:
+        assert [e.num for e in variant.cande_obj.elements] == list(range(1, 3 + variant.params["n"]))
+        # the sections before the new one keep their element numbers, so they are still shared
+        assert all(variant.cande_obj.elements[k] is base.elements[k] for k in "AB")
+    assert lines(base) == base_lines
+    # removing a section only copies the sections after it
+    fork = base.fork()
+    del fork.elements["A"]
+    fork.prepare()
+    assert fork.elements["B"] is not base.elements["B"] and fork.elements["B"][0].num == 1
+    assert lines(base) == base_lines
+
+
+@pytest.fixture(scope="module")
+def standard_sweep(cid_obj_standard):
+    base = CandeObj.load_cidobj(cid_obj_standard)
+    return Sweep(base, grid=dict(mat=[1, 2], heading=["A", "B"]),
+                 edits=dict(mat=SetSectionAttr("elements", "section1", "mat"), heading=SetAttr("heading")),
+                 prefix="model")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_sweep_write(standard_sweep, tmp_path, workers):
+    manifest = standard_sweep.write(tmp_path, workers=workers)
+    assert [entry["name"] for entry in manifest["variants"]] == [f"model_{i}" for i in range(4)]
+    assert manifest["variants"][3]["params"] == dict(mat=2, heading="B")
+    assert json.loads((tmp_path / "manifest.json").read_text()) == manifest
+    variant = standard_sweep.build(3)
+    assert (tmp_path / "model_3.cid").read_text() == "\n".join(variant.cande_obj.iter_line_strings())
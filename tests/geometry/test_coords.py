@@ -1,6 +1,9 @@
 import pytest
 
-from candejar.geometry import box,draw
+import numpy as np
+
+from candejar.geometry import box, draw, get_xy, get_xy_many
+from candejar.geometry.coords import CoordinatesError, DrawError
 
 def test_box():
     extents = box((-445.140000, -132.380000), (445.140000, 160.910000))
@@ -15,3 +18,33 @@ def test_draw():
     layer_coords_gen = (c for pair in layers_gen for c in pair)
     point_coords = -103.900000, -6.380000, 103.140000, -6.380000, 270.430000, 160.910000, -271.190000, 160.910000
     assert tuple(layer_coords_gen) == pytest.approx(point_coords)
+
+def test_get_xy_many():
+    class P:
+        def __init__(self, x, y):
+            self.X, self.Y = x, y
+    points = [(1, 2), dict(x=3, y=4), P(5, 6), np.array([7, 8]), [9, 10]]
+    xy = get_xy_many(points)
+    assert xy.shape == (5, 2) and xy.dtype == float
+    assert xy.tolist() == [list(get_xy(p)) for p in points]
+    assert get_xy_many(iter(points)).tolist() == xy.tolist()
+    assert get_xy_many([(1, 2), (3, 4)]).tolist() == [[1, 2], [3, 4]]
+    assert get_xy_many(np.arange(6).reshape(3, 2)).tolist() == [[0, 1], [2, 3], [4, 5]]
+    assert get_xy_many([]).shape == (0, 2)
+    for bad in ([(1, 2), (3, "a")], [(1, 2, 3)], [dict(z=1)], 5):
+        with pytest.raises(CoordinatesError):
+            get_xy_many(bad)
+
+def test_draw_many_steps():
+    steps = np.random.default_rng(0).uniform(-1, 1, (1000, 2))
+    x, y = 1.0, 2.0
+    expected = [(x, y)]
+    for dx, dy in steps.tolist():
+        x, y = x + dx, y + dy
+        expected.append((x, y))
+    assert list(draw((1, 2), dxdy=steps)) == expected
+    assert list(draw((1, 2), dxdy=(dx for dx in steps.tolist()))) == expected
+    assert list(draw((1, 2), dxdy=(3, 4))) == [(1, 2), (4, 6)]
+    assert list(draw((1, 2))) == [(1, 2)]
+    with pytest.raises(DrawError):
+        list(draw((1, 2), dxdy=5))
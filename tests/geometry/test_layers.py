@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+"""Splitting a region into the bands between layer lines."""
+
+import pytest
+import shapely.geometry as geo
+import shapely.ops as shops
+
+from candejar.geometry import split_layers, splitLR
+from candejar.geometry.exc import GeometryError
+
+
+@pytest.fixture
+def region():
+    return geo.box(0, 0, 10, 10)
+
+
+@pytest.fixture
+def layers():
+    return [geo.LineString(((-1, 2), (0, 2), (5, 3), (5, 4), (10, 4), (11, 4))),
+            geo.LineString(((-1, 6), (0, 6), (10, 7), (11, 7)))]
+
+
+def test_split_layers(region, layers):
+    bands = split_layers(region, layers)
+    assert [band.area for band in bands] == pytest.approx([32.5, 32.5, 35.0])
+    assert shops.unary_union(bands).equals(region)
+
+
+def test_split_layers_same_as_splitLR(region, layers):
+    pieces, expected = [region], []
+    for layer in layers:
+        lhs, rhs = [], []
+        for piece in pieces:
+            left, right = splitLR(piece, layer)
+            lhs.extend(left.geoms)
+            rhs.extend(right.geoms)
+        pieces = lhs
+        expected.append(geo.MultiPolygon(rhs))
+    expected.append(geo.MultiPolygon(pieces))
+    for band, expected_band in zip(split_layers(region, layers), expected):
+        assert band.symmetric_difference(expected_band).area == pytest.approx(0)
+
+
+def test_split_layers_bad_order(region, layers):
+    with pytest.raises(GeometryError):
+        split_layers(region, layers[::-1])
+    with pytest.raises(GeometryError):
+        split_layers(region, [layers[0], geo.LineString(reversed(layers[1].coords))])
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for `candejar.geometry.mesh` module."""
+
+import numpy as np
+import pytest
+import shapely.geometry as geo
+
+from candejar.geometry import outer_edges
+from candejar.geometry.exc import GeometryError
+from candejar.geometry.mesh import boundary_edges, drop_repeats, interior_points, incidence, face_neighbors, box_grid, face_boxes, \
+    locate_points, face_weights
+
+
+@pytest.fixture
+def grid_with_hole():
+    """3x3 grid of quads with the center quad missing."""
+    xy = np.array([(x, y) for y in range(4) for x in range(4)], dtype=float)
+    faces = [(r * 4 + c, r * 4 + c + 1, r * 4 + c + 5, r * 4 + c + 4)
+             for r in range(3) for c in range(3) if (r, c) != (1, 1)]
+    return np.array(faces), xy
+
+
+def test_boundary_edges(grid_with_hole):
+    faces, _ = grid_with_hole
+    # 12 outer edges, 4 hole edges
+    assert len(boundary_edges(faces)) == 16
+
+
+def test_outer_edges(grid_with_hole):
+    faces, xy = grid_with_hole
+    edges, normals = outer_edges(faces, xy)
+    assert len(edges) == 12
+    assert not set(edges.ravel().tolist()) & {5, 6, 9, 10}
+    mids = xy[edges].mean(axis=1)
+    # normals point away from the mesh center
+    assert np.all(np.einsum("ij,ij->i", normals, mids - 1.5) > 0)
+    assert np.allclose(np.hypot(*normals.T), 1)
+
+
+def test_outer_edges_triangles():
+    xy = np.array([(0, 0), (1, 0), (1, 1), (0, 1)], dtype=float)
+    faces = np.array([(0, 1, 2, -1), (0, 2, 3, -1)])
+    edges, normals = outer_edges(faces, xy)
+    assert sorted(map(tuple, np.sort(edges, axis=1).tolist())) == [(0, 1), (0, 3), (1, 2), (2, 3)]
+
+
+def test_outer_edges_bad_faces():
+    with pytest.raises(GeometryError):
+        outer_edges(np.array([(0, 1, 2)]), np.zeros((3, 2)))
+
+
+def test_drop_repeats():
+    faces = [(0, 1, 2, 3), (0, 1, 2, 2), (0, 1, 1, 2), (2, 0, 1, 2), (0, 1, 2, -1), (0, 0, 1, 1)]
+    assert drop_repeats(faces).tolist() == [[0, 1, 2, 3], [0, 1, 2, -1], [0, 1, 2, -1], [2, 0, 1, -1],
+                                            [0, 1, 2, -1], [0, 1, -1, -1]]
+
+
+def test_interior_points():
+    rng = np.random.default_rng(0)
+    # random (possibly self-intersecting) triangles and quads, some with repeated or lined up vertexes
+    polygons = [rng.integers(0, 3, (rng.integers(3, 5), 2)).astype(float) if n % 4 == 0 else
+                rng.uniform(-10, 10, (rng.integers(3, 5), 2)) for n in range(500)]
+    offsets = np.concatenate(([0], np.cumsum([len(p) for p in polygons])))
+    points = interior_points(np.concatenate(polygons), offsets)
+    assert points.tolist() == [list(geo.Polygon(p).representative_point().coords[0]) for p in polygons]
+
+
+def test_incidence():
+    inc = incidence([2, 0, 2, 2, 0], [5, 1, 3, 5, 0], 4)
+    assert inc.indptr.tolist() == [0, 2, 2, 4, 4]
+    assert inc.row(0).tolist() == [0, 1] and inc.row(1).tolist() == [] and inc.row(2).tolist() == [3, 5]
+    assert inc.counts().tolist() == [2, 0, 2, 0]
+    assert inc.rows([2, 0, 2]).tolist() == [0, 1, 3, 5]
+    with pytest.raises(GeometryError):
+        incidence([4], [0], 4)
+    with pytest.raises(GeometryError):
+        inc.rows([4])
+
+
+def test_face_neighbors(grid_with_hole):
+    faces, _ = grid_with_hole
+    # a triangle on top of the first quad, and a line along its left side
+    faces = np.concatenate((faces, [(4, 0, 5, -1), (0, 4, -1, -1)]))
+    neighbors = face_neighbors(faces)
+    assert len(neighbors) == 10
+    assert neighbors.row(0).tolist() == [1, 3, 8, 9]
+    assert neighbors.row(4).tolist() == [2, 7]
+    assert neighbors.row(8).tolist() == [0, 3, 9] and neighbors.row(9).tolist() == [0, 8]
+    with pytest.raises(GeometryError):
+        face_neighbors([(0, -1, 2, -1)])
+
+
+def test_face_neighbors_repeats():
+    # triangles stored with k == l sharing only their k corner, and a line stored with i == j
+    neighbors = face_neighbors([(4, 3, 2, 2), (0, 1, 2, 2), (1, 2, 5, 5), (2, 2, -1, -1)])
+    assert [neighbors.row(f).tolist() for f in range(4)] == [[], [2], [1], []]
+
+
+@pytest.fixture
+def jittered_mesh():
+    """A 12 x 12 grid of quads with moved interior nodes; every third quad is split into two triangles."""
+    rng = np.random.default_rng(1)
+    x, y = np.meshgrid(np.arange(13.0), np.arange(13.0))
+    xy = np.column_stack((x.ravel(), y.ravel()))
+    interior = ((xy > 0) & (xy < 12)).all(axis=1)
+    xy[interior] += rng.uniform(-0.3, 0.3, (interior.sum(), 2))
+    vertices, counts = [], []
+    for n in (r * 13 + c for r in range(12) for c in range(12)):
+        i, j, k, l = n, n + 1, n + 14, n + 13
+        if n % 3:
+            vertices.append(xy[[i, j, k, l]])
+            counts.append(4)
+        else:
+            vertices.extend((xy[[i, j, k, k]], xy[[i, k, l, l]]))
+            counts.extend((3, 3))
+    return np.array(vertices), np.array(counts), xy
+
+
+def test_box_grid():
+    grid = box_grid([(0, 0, 1, 1), (0.5, 0.5, 3, 1), (2, 2, 3, 3)], cell=1.0)
+    assert grid.shape == (4, 4)
+    assert [grid.cells.row(c * 4 + r).tolist() for c, r in [(0, 0), (1, 1), (2, 1), (3, 3), (0, 3)]] == \
+        [[0, 1], [0, 1], [1], [2], []]
+    point_idx, box_idx = grid.candidates([(0.5, 0.5), (-1, 0), (2.5, 1.5), (3, 3)])
+    assert point_idx.tolist() == [0, 0, 2, 3] and box_idx.tolist() == [0, 1, 1, 2]
+    assert box_grid(np.empty((0, 4))).candidates([(0, 0)])[0].tolist() == []
+    with pytest.raises(GeometryError):
+        box_grid([(0, 0, np.nan, 1)])
+
+
+def test_locate_points(jittered_mesh):
+    vertices, counts, xy = jittered_mesh
+    rng = np.random.default_rng(2)
+    # random points, the nodes, and points on the edges
+    points = np.concatenate((rng.uniform(-1, 13, (2000, 2)), xy, (xy[:-1] + xy[1:]) / 2))
+    index = locate_points(points, vertices, counts)
+    polygons = [geo.Polygon(v[:c]) for v, c in zip(vertices, counts)]
+    for point, n in zip(points, index.tolist()):
+        point = geo.Point(point)
+        # points on the edges are found in a face they are within rounding of
+        hits = [m for m, polygon in enumerate(polygons) if polygon.distance(point) < 1e-12]
+        assert n in hits if n >= 0 else not hits
+    # the edges shared by two faces belong to one of them
+    assert (locate_points(points, vertices, counts, box_grid(face_boxes(vertices, counts), cell=0.5)) == index).all()
+
+
+def test_face_weights(jittered_mesh):
+    vertices, counts, _ = jittered_mesh
+    rng = np.random.default_rng(3)
+    points = rng.uniform(0, 12, (1000, 2))
+    index = locate_points(points, vertices, counts)
+    weights = face_weights(points, vertices[index], counts[index])
+    assert np.einsum("nc,ncd->nd", weights, vertices[index]) == pytest.approx(points, abs=1e-9)
+    assert weights.sum(axis=1) == pytest.approx(1.0)
+    assert (weights > -1e-9).all() and (weights[counts[index] == 3, 3] == 0).all()
+    # the vertexes of a quad get all of the weight
+    assert face_weights(vertices[2], vertices[[2] * 4], counts[[2] * 4]) == pytest.approx(np.eye(4), abs=1e-12)
@@ -2,11 +2,17 @@
 
 """Operations for working with geometries."""
 
+import random
+from typing import DefaultDict, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
 import pytest
 import shapely.geometry as geo
 import shapely.ops as shops
 
 from candejar.geometry import ops
+from candejar.geometry.exc import GeometryError
+from candejar.geometry.ops import String_or_Ring
 
 
 @pytest.fixture
@@ -77,3 +83,181 @@ def test_get_LRsides(two_triangles, splitter, rev_splitter):
     Left, Right = ops.get_LRsides(*two_triangles, rev_splitter)
     assert Left.equals(two_triangles[0])
     assert Right.equals(two_triangles[1])
+
+def test_point_segment_distances():
+    points = np.array([(0, 0), (2, 1), (-1, 3), (0.5, 0.5)], dtype=float)
+    starts = np.array([(0, 1), (1, 1)], dtype=float)
+    ends = np.array([(2, 1), (1, 1)], dtype=float)
+    d = ops.point_segment_distances(points[:, None], starts, ends)
+    expected = [[geo.Point(p).distance(geo.LineString((a, b)) if tuple(a) != tuple(b) else geo.Point(a))
+                 for a, b in zip(starts, ends)] for p in points]
+    assert d.tolist() == expected
+
+def random_lines(seed, count):
+    rng = random.Random(seed)
+    for _ in range(count):
+        path = [(rng.randint(0, 5), rng.randint(0, 5)) for _ in range(rng.randint(2, 8))]
+        pts = [(rng.randint(0, 10) / 2, rng.randint(0, 10) / 2) for _ in range(rng.randint(2, 6))]
+        if rng.random() < 0.4:
+            pts.append(pts[0])
+        line, path = geo.LineString(pts), geo.LineString(path)
+        if line.length and line.is_simple and path.length:
+            yield line, path, rng.choice([None, 0.1, 0.5, 1.0])
+
+def iter_oriented_line_pt_idx_shapely(to_orient: String_or_Ring, path: String_or_Ring,
+                                      buffer: Optional[float] = None) -> Iterator[int]:
+    """The original point by point (shapely) version of iter_oriented_line_pt_idx, to compare against."""
+    if buffer is None:
+        buffer = 0
+    else:
+        buffer = float(buffer)
+    if isinstance(to_orient, (geo.LineString, geo.LinearRing)):
+        if not to_orient.is_simple:
+            raise GeometryError("simple linear objects are required for orientation")
+    else:
+        raise GeometryError("a line like geometry object is required")
+
+    # the path will decide the resulting line index order
+    coords_to_orient = list(to_orient.coords)
+    points_to_orient = geo.MultiPoint(coords_to_orient)
+    path_segments = geo.MultiLineString(list(ops.iter_segments(path)))
+    if len(path_segments)==0:
+        raise GeometryError("failed to break path into segments")
+
+    # sorting dictionaries
+    lpdx_to_sdx_dict: DefaultDict[int,Set[int]] = DefaultDict(set)
+    lpdx_to_min_dist_dict: Dict[int,float] = dict()
+    sdx_to_lpdx_dict: Dict[int, List[int]] = DefaultDict(list)
+
+    if to_orient.is_closed:
+        # handle ring-like line
+        repeated_point = points_to_orient[0]
+        # get the capturing segment
+        min_distance_to_repeated_point = min(repeated_point.distance(seg) for seg in path_segments)
+        # if the repeated ring end point is NOT captured, ignore; otherwise this needs handling
+        if min_distance_to_repeated_point<=buffer:
+            # repeated point is captured - needs handling
+            p_second, p_second_to_last = points_to_orient[1], points_to_orient[-2]
+            # get min distances for second and second-to-last points (are separate points since the line is simple)
+            d_second = min(p_second.distance(seg) for seg in path_segments)
+            d_second_to_last = min(p_second_to_last.distance(seg) for seg in path_segments)
+            # at least one of the two neighboring points to the repeated ring end point must be captured
+            captured_dict = {1: d_second<=buffer, -2: d_second_to_last<=buffer}
+            if True in captured_dict.values():
+                if captured_dict[1] and captured_dict[-2]:
+                    # both neighbors captured; discard both ring end points (they aren't needed)
+                    points_to_orient = geo.MultiPoint(points_to_orient[1:-1])
+                elif captured_dict[1]:
+                    # only pdx==1 captured, discard last line point
+                    points_to_orient = geo.MultiPoint(points_to_orient[:-1])
+                elif captured_dict[-2]:
+                    # only pdx==-2 captured, discard first line point
+                    points_to_orient = geo.MultiPoint(points_to_orient[1:])
+            else:
+                raise GeometryError("invalid path given to orient the ring-like line; path must capture a neighbor "
+                                    "of the repeated ring end points")
+
+    # for adjusting final index results later
+    try:
+        lpdx_adjustment: int = {True:1,False:0}[captured_dict[-2]]
+    except NameError:
+        lpdx_adjustment = 0
+
+    # point capture algorithm
+    lpdx: int
+    lp: geo.Point
+    for (lpdx,lp) in enumerate(points_to_orient):
+        seg: geo.LineString
+        # match line point indexes with path segment indexes
+        for sdx, seg in enumerate(path_segments):
+            d: float = lp.distance(seg)
+            # associate each line point index with path segment indexes within the buffer
+            if d<=lpdx_to_min_dist_dict.get(lpdx,buffer):
+                if d<lpdx_to_min_dist_dict.get(lpdx, buffer):
+                    # keep only the closest path segment
+                    lpdx_to_sdx_dict[lpdx].clear()
+                lpdx_to_min_dist_dict[lpdx]=d
+                lpdx_to_sdx_dict[lpdx].add(sdx)
+        # point may fall on multiple segments
+        try:
+            # the Jacqueline Rule: the first segment in the series captures the point
+            closest_sdx = min(lpdx_to_sdx_dict[lpdx])
+        except ValueError:
+            # un-captured lp (lp not within buffer for any segments)
+            pass
+        else:
+            # captured lp
+            sdx_to_lpdx_dict[closest_sdx].append(lpdx)
+    del lpdx,lp
+    sdx_to_lpdx_sorted = dict(sorted(sdx_to_lpdx_dict.items()))
+    # now have a 1 to 1 relationship for segments and points (but may be multiple points per segment)
+    lpdx_bag: List[int]
+    if all(len(lpdx_bag)==1 for lpdx_bag in sdx_to_lpdx_sorted.values()):
+        # ALL 1 to 1
+        yield from (lpdx for (lpdx,) in sdx_to_lpdx_sorted.values())
+    else:
+        # some not 1 to 1
+        sdx: int
+        for sdx, lpdx_bag in sdx_to_lpdx_sorted.items():
+            if len(lpdx_bag)==1:
+                # 1 to 1
+                yield lpdx_bag[0]+lpdx_adjustment
+            else:
+                # not 1 to 1; iterate based on distance to first segment point
+                dist_lpdx_sub_list: List[Tuple[float,int]] = []
+                seg_point = geo.Point(path_segments[sdx].coords[0])
+                lpdx: int
+                for lpdx in lpdx_bag:
+                    d = seg_point.distance(points_to_orient[lpdx])
+                    dist_lpdx_sub_list.append((d,lpdx))
+                dist_lpdx_sub_list_sorted = sorted(dist_lpdx_sub_list)
+                yield from (lpdx+lpdx_adjustment for _,lpdx in dist_lpdx_sub_list_sorted)
+
+def run_orient(f, line, path, buffer):
+    try:
+        return list(f(line, path, buffer))
+    except GeometryError:
+        return None
+
+@pytest.mark.parametrize("dense_pairs", [ops.DENSE_PAIRS, 0], ids=["all pairs", "grid"])
+def test_iter_oriented_line_pt_idx_same_as_shapely(dense_pairs, monkeypatch):
+    monkeypatch.setattr(ops, "DENSE_PAIRS", dense_pairs)
+    for line, path, buffer in random_lines(0, 300):
+        assert run_orient(ops.iter_oriented_line_pt_idx, line, path, buffer) == \
+               run_orient(iter_oriented_line_pt_idx_shapely, line, path, buffer)
+
+def test_polygon_sides(two_triangles, splitter, rev_splitter):
+    assert ops.polygon_sides(list(two_triangles), splitter) == ["right", "left"]
+    assert ops.polygon_sides(list(two_triangles), rev_splitter) == ["left", "right"]
+    # no common edge
+    assert ops.polygon_sides([geo.box(5, 0, 6, 1)], splitter) == [None]
+
+def test_polygon_sides_same_as_rays():
+    rng = np.random.default_rng(0)
+    checked = 0
+    for _ in range(100):
+        polygon = geo.MultiPoint(rng.random((6, 2)) * 10).convex_hull
+        splitter = geo.LineString(np.column_stack((np.linspace(-5, 15, 5), rng.random(5) * 6 + 2)))
+        polygons = [g for g in shops.split(polygon, splitter).geoms if isinstance(g, geo.Polygon)]
+        for p, side in zip(polygons, ops.polygon_sides(polygons, splitter)):
+            try:
+                ray_side = ops._ray_side(p, splitter)
+            except (ValueError, GeometryError):
+                # the rays can't handle some common edges
+                continue
+            if ray_side is not None:
+                assert side == ray_side
+                checked += 1
+    assert checked
+
+def test_get_LRsides_ray_fallback(two_triangles, splitter, monkeypatch):
+    monkeypatch.setattr(ops, "polygon_sides", lambda polygons, splitter: [None] * len(polygons))
+    Left, Right = ops.get_LRsides(*two_triangles, splitter)
+    assert Left.equals(two_triangles[1])
+    assert Right.equals(two_triangles[0])
+
+def test_point_sides():
+    # a left turn then a right turn
+    line = geo.LineString(((0, 0), (2, 0), (2, 2), (4, 2)))
+    points = [(1, 1), (1, -1), (3, 1), (3, 3), (2.5, -0.5), (1.5, 2.5), (2, 1), (5, 2)]
+    assert ops.point_sides(points, line).tolist() == [1, -1, -1, 1, -1, 1, 0, 0]
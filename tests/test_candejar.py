@@ -2,3 +2,61 @@
 # -*- coding: utf-8 -*-
 
 """Tests for `candejar` package."""
+
+import json
+
+import pytest
+
+from candejar.candejar import main, expand_inputs, output_path, run_batch
+from tests.cid_file_test_standards import standard_lines
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    models = tmp_path / "models"
+    models.mkdir()
+    (models / "good.cid").write_text(standard_lines)
+    (models / "bad.cid").write_text("garbage")
+    return models
+
+
+def test_expand_inputs(models_dir):
+    pattern = str(models_dir / "*.cid")
+    assert expand_inputs([pattern, str(models_dir / "good.cid")]) == [str(models_dir / "bad.cid"),
+                                                                       str(models_dir / "good.cid")]
+
+
+def test_output_path(tmp_path):
+    assert output_path(tmp_path / "a.cidl3") == tmp_path / "a_prepared.cid"
+    assert output_path(tmp_path / "a.cid", tmp_path / "out", "") == tmp_path / "out" / "a.cid"
+
+
+def test_batch_prepare(models_dir, tmp_path, capsys):
+    report_path = tmp_path / "report.json"
+    out_dir = tmp_path / "out"
+    rc = main(["batch", "prepare", str(models_dir / "*.cid"), "--workers", "1", "--output-dir", str(out_dir),
+               "--report", str(report_path)])
+    assert rc == 1
+    report = json.loads(report_path.read_text())
+    assert (report["files"], report["ok"], report["failed"]) == (2, 1, 1)
+    bad, good = report["results"]
+    assert bad["error"].startswith("open failed")
+    assert good["ok"] and set(good["timings"]) == {"open", "prepare", "save"}
+    assert (out_dir / "good_prepared.cid").exists()
+    assert not (out_dir / "bad_prepared.cid").exists()
+    assert "1 of 2 files prepared" in capsys.readouterr().err
+
+
+def test_run_batch_no_overwrite(models_dir, tmp_path):
+    (tmp_path / "good_prepared.cid").write_text("")
+    result, = run_batch([str(models_dir / "good.cid")], workers=1, output_dir=tmp_path)
+    assert not result.ok
+    assert result.error.startswith("save failed")
+
+
+def test_run_batch_pool(models_dir, tmp_path):
+    progress = []
+    results = run_batch([str(models_dir / "bad.cid")] * 2, workers=2, output_dir=tmp_path,
+                        progress=lambda done, total, result: progress.append((done, total)))
+    assert [result.ok for result in results] == [False, False]
+    assert progress == [(1, 2), (2, 2)]
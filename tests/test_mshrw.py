@@ -1,4 +1,7 @@
-from candejar.mshrw.read import line_strings as read
+import pytest
+
+from candejar.mshrw.exc import MSHLineProcessingError
+from candejar.mshrw.read import line_strings as read, line_arrays as read_arrays
 
 def test_read_all(msh_all_obj):
     msh = msh_all_obj
@@ -55,3 +58,32 @@ def test_read_complicated_msh_elements(msh_cls, complicated_msh_2Delements_lines
     assert msh.elements
     assert all(len(d)==5 for d in msh.elements)
     assert not msh.boundaries
+
+
+@pytest.mark.parametrize("lines_fixture", ["msh_all_lines", "msh_nodes_lines", "msh_elements_lines",
+                                           "msh_boundaries_lines", "msh_nodes_elements_lines",
+                                           "msh_elements_boundaries_lines", "msh_nodes_boundaries_lines",
+                                           "complicated_msh_lines", "complicated_msh_2Delements_lines"])
+def test_read_arrays(request, msh_cls, lines_fixture):
+    lines = request.getfixturevalue(lines_fixture)
+    msh = read(msh_cls(), lines)
+    arrays = read_arrays(lines)
+    assert arrays["nodes"].tolist() == [[d["num"], d["x"], d["y"]] for d in msh.nodes]
+    assert arrays["elements"].tolist() == [[d[k] for k in "num i j k l".split()] for d in msh.elements]
+    assert arrays["boundaries"].tolist() == [[d["num"], d["node"]] for d in msh.boundaries]
+
+
+def test_read_arrays_extraneous_lines(msh_all_lines):
+    with pytest.raises(MSHLineProcessingError):
+        read_arrays(msh_all_lines + ["1    1"])
+
+
+@pytest.mark.parametrize("lines", [
+    "1\n3.7    1.0    2.0\n\n0\n\n".split("\n"),
+    "1\n1    1.0    2.0\n\n1\n1    1    2.5    0    0\n\n".split("\n"),
+    "1\n1    1.0    2.0\n\n2\n1    1    2    0    0\n2    1.5    2\n\n".split("\n"),
+    "1\n1    1.0    2.0\n\n0\n\n1\n1    1.5\n\n".split("\n"),
+], ids=["nodes", "elements", "2D elements", "boundaries"])
+def test_read_arrays_non_integer(lines):
+    with pytest.raises(MSHLineProcessingError):
+        read_arrays(lines)
@@ -1,8 +1,16 @@
+import random
+
 import pytest
 
-from candejar import select
+from candejar import exc, select
+from candejar.candeobj.candeobj import CandeObj
 from dataclasses import make_dataclass
 
+import shapely.geometry as geo
+
+from candejar.candeobj.candeseq import NodesSection, ElementsSection, BoundariesSection
+from candejar.utilities.skip import SkipInt
+
 @pytest.fixture
 def test_type():
     TestType = make_dataclass("TestType", "mat step".split())
@@ -20,3 +28,175 @@ def has_mats_seq(test_type):
 def test_by_material(has_mats_seq):
     x = list(select.by_material(has_mats_seq, 1))
     assert len(x)==1
+
+@pytest.fixture
+def grid_elements():
+    """4x4 grid of quads (the last row triangles), the third element skipped."""
+    nodes = NodesSection([dict(num=n, x=float((n - 1) % 5), y=float((n - 1) // 5)) for n in range(1, 26)])
+    corners = [r * 5 + c + 1 for r in range(4) for c in range(4)]
+    elements = ElementsSection([dict(num=e, i=i, j=i + 1, k=i + 6, l=i + 5 if e <= 12 else 0)
+                                for e, i in enumerate(corners, 1)])
+    elements.nodes = nodes
+    elements[2].num = SkipInt(3)
+    return elements
+
+def test_by_shape(grid_elements):
+    for zone in (geo.box(0.5, 0.5, 3.5, 2.5), geo.Point(2, 2).buffer(1.6), geo.box(-1, -1, 5, 5), geo.box(10, 10, 11, 11),
+                 geo.Polygon()):
+        # the same as checking each element polygon one at a time
+        expected = [e for e, e_geo in zip(grid_elements, geo.shape(grid_elements).geoms)
+                    if zone.contains(e_geo.representative_point())]
+        assert list(select.by_shape(grid_elements, zone)) == expected
+        # other objects with a __geo_interface__
+        other = make_dataclass("Other", [("__geo_interface__", dict)])(grid_elements.__geo_interface__)
+        assert select.index_by_shape(other, zone).tolist() == select.index_by_shape(grid_elements, zone).tolist()
+    selection = select.copy(grid_elements, select.by_shape, geo.box(0, 0, 4, 1))
+    assert [e.num for e in selection] == [1, 2, 4] and selection.nodes is grid_elements.nodes
+    assert select.index_by_shape(grid_elements, geo.box(0, 0, 4, 1)).tolist() == [0, 1, 2]
+    # moving nodes moves the selection
+    assert [e.num for e in select.by_shape(grid_elements, geo.box(0, 0, 0.6, 1))] == [1]
+    grid_elements.nodes[0].x = 0.9
+    assert [e.num for e in select.by_shape(grid_elements, geo.box(0, 0, 0.6, 1))] == []
+
+def legacy_by_attr(selectables, x, attr):
+    """The way by_sliceable_attr used to work: a scan of the selectables for each value."""
+    values = [x] if isinstance(x, int) else range(len(selectables) + 1)[x]
+    return [s for v in values for s in selectables if getattr(s, attr, None) == v]
+
+@pytest.fixture
+def random_elements():
+    rng = random.Random(0)
+    elements = ElementsSection([dict(num=rng.randint(1, 60), i=1, j=2, k=3, mat=rng.randint(1, 5),
+                                     step=rng.randint(1, 12)) for _ in range(50)])
+    for e in elements[::7]:
+        e.num = SkipInt(e.num)
+    return elements
+
+@pytest.mark.parametrize("x", [1, 3, 11, 0, 99, slice(1, None), slice(2, 9), slice(3, 40, 4), slice(-10, None),
+                               slice(5, 2)])
+def test_by_attr_index(random_elements, x):
+    for f, attr in ((select.by_number, "num"), (select.by_material, "mat"), (select.by_step, "step")):
+        expected = legacy_by_attr(random_elements, x, attr)
+        assert list(f(random_elements, x)) == expected
+        assert list(f(list(random_elements), x)) == legacy_by_attr(list(random_elements), x, attr)
+
+def test_attr_index_changes(random_elements):
+    index = select.attr_index(random_elements, "mat")
+    assert select.attr_index(random_elements, "mat") is index
+    skipped = random_elements[0]
+    random_elements[1].mat = 9
+    assert list(select.by_material(random_elements, 9)) == [random_elements[1]]
+    skipped.mat = 9
+    assert list(select.by_material(random_elements, 9)) == [random_elements[1]]
+    skipped.num = 1
+    assert list(select.by_material(random_elements, 9)) == [skipped, random_elements[1]]
+    random_elements.append(dict(num=1, i=1, j=2, k=3, mat=9))
+    assert len(list(select.by_material(random_elements, 9))) == 3
+    # not all ints
+    random_elements[2].mat = 9.5
+    assert select.attr_index(random_elements, "mat") is None
+    assert len(list(select.by_material(random_elements, 9))) == 3
+
+def test_by_boundary_condition():
+    boundaries = BoundariesSection([dict(node=n, xcode=n % 2, ycode=n % 3 == 0) for n in range(1, 13)])
+    assert [b.node for b in select.by_boundary_condition(boundaries, xcode=1)] == [1, 3, 5, 7, 9, 11]
+    assert [b.node for b in select.by_boundary_condition(boundaries, xcode=1, ycode=1)] == [3, 9]
+    assert [b.node for b in select.by_boundary_condition(list(boundaries), xcode=0, ycode=1)] == [6, 12]
+    assert len(list(select.by_boundary_condition(boundaries))) == 12
+
+@pytest.fixture
+def grid_cande(grid_elements):
+    cande = CandeObj()
+    for name, dx in (("A", 0.0), ("B", 10.0)):
+        cande.nodes[name] = [dict(num=n.num, x=n.x + dx, y=n.y) for n in grid_elements.nodes]
+        cande.elements[name] = [dict(num=int(e.num), i=e.i, j=e.j, k=e.k, l=e.l, mat=e.num % 3 + 1, step=e.num % 5 + 1)
+                                for e in grid_elements]
+        cande.elements[name].nodes = cande.nodes[name]
+    cande.elements["B"][4].num = SkipInt(6)
+    return cande
+
+def shape_selection(sections, zone):
+    """The members of sections with representative points in the zone, checked one at a time."""
+    return [e for section in sections for e, e_geo in zip(section, geo.shape(section).geoms)
+            if zone.contains(e_geo.representative_point())]
+
+def test_query(grid_cande):
+    elements = grid_cande.elements
+    zone = geo.box(1, 0, 14, 3)
+    q = select.query(grid_cande).elements.where(mat=2, step=slice(2, 5)).within(zone)
+    expected = [e for e in shape_selection(elements.seq_map.values(), zone) if e.mat == 2 and 2 <= e.step <= 4]
+    assert expected and list(q) == expected and q.count() == len(expected)
+    assert q.index().tolist() == [n for n, e in enumerate(elements) if any(e is x for x in expected)]
+    # predicates compose in any order
+    assert list(select.query(elements).within(zone).where(step=slice(2, 5)).where(mat=2)) == expected
+    assert list(q.filter(lambda e: e.num > 8)) == [e for e in expected if e.num > 8]
+    assert list(select.query(grid_cande).elements) == list(elements)
+    assert list(select.query(grid_cande).nodes.within(geo.box(-1, -1, 0.5, 0.5))) == [grid_cande.nodes["A"][0]]
+    # a copy for each section
+    selection = q.copy()
+    assert list(selection) == expected and selection.seq_map.keys() == elements.seq_map.keys()
+    assert selection.seq_map["A"].nodes is grid_cande.nodes["A"]
+    section_selection = select.query(elements.seq_map["A"]).where(mat=2).copy()
+    assert section_selection == select.copy(elements.seq_map["A"], select.by_material, 2)
+
+def test_query_cached(grid_cande):
+    section = grid_cande.elements.seq_map["A"]
+    zone = geo.box(1, 0, 14, 3)
+    q = select.query(section).where(mat=2).within(zone)
+    index = q.index()
+    assert select.query(section).where(mat=2).within(zone)._section_index(section) is \
+        q._section_index(section)
+    assert q.index().tolist() == index.tolist()
+    # changes to the queried attributes, the nodes, or the section
+    first = next(iter(q))
+    first.mat = 1
+    assert first not in list(q)
+    section.nodes[0].x = -1.0
+    assert list(q) == [e for e in shape_selection([section], zone) if e.mat == 2]
+    section.append(dict(num=17, i=2, j=3, k=8, l=7, mat=2, step=1))
+    assert section[-1] in list(q)
+    with pytest.raises(exc.CandejarValueError):
+        q.where(mat=slice(0, 2))
+
+def test_query_cached_slice_length():
+    # slices of values are clipped to the length of the whole chain, which the other sections change
+    cande = CandeObj()
+    cande.elements["A"] = [dict(num=1, i=1, j=2, step=3), dict(num=2, i=2, j=3, step=5)]
+    cande.elements["B"] = [dict(num=3, i=3, j=4, step=1)]
+    q = select.query(cande).elements.where(step=slice(2, None))
+    assert [e.step for e in q] == [3]
+    cande.elements["B"].extend(dict(num=n, i=n, j=n + 1, step=1) for n in range(4, 7))
+    assert [e.step for e in q] == [3, 5]
+
+def test_query_unhashable(grid_cande):
+    # compared for equality like by_equal_attr, without caching
+    q = select.query(grid_cande).elements.where(step=1)
+    assert list(q.where(mat=[1, 2])) == [e for e in q if e.mat == [1, 2]] == []
+    q = q.where(mat=2).filter(lambda e: True)
+    assert list(q.where(step=[1])) == []
+    assert list(q.where(tags={"a": 1})) == []
+
+def test_by_nodes(grid_elements):
+    # node 7 is a corner of elements 1, 2, 5, 6 (element 3 is skipped)
+    assert [e.num for e in select.by_nodes(grid_elements, [7])] == [1, 2, 5, 6]
+    assert [e.num for e in select.by_nodes(grid_elements, [1, 25])] == [1, 16]
+    assert list(select.by_nodes(grid_elements, [])) == []
+    boundaries = BoundariesSection([dict(node=n) for n in (3, 7, 3)])
+    boundaries.nodes = grid_elements.nodes
+    assert list(select.by_nodes(boundaries, [3])) == [boundaries[0], boundaries[2]]
+    with pytest.raises(exc.CandejarValueError):
+        list(select.by_nodes(grid_elements, [26]))
+
+def test_by_elements(grid_elements):
+    nodes = grid_elements.nodes
+    assert [n.num for n in select.by_elements(nodes, grid_elements[:2])] == [1, 2, 3, 6, 7, 8]
+    nodes[1].num = SkipInt(2)
+    assert [n.num for n in select.by_elements(nodes, grid_elements[:1])] == [1, 6, 7]
+    assert select.copy(nodes, select.by_elements, grid_elements[-1:]) == [nodes[n] for n in (18, 19, 24)]
+
+def test_index_by_neighbors(grid_elements):
+    # iteration indexes: element 3 is skipped, so element 4 is at index 2
+    assert select.index_by_neighbors(grid_elements, [0]).tolist() == [1, 3]
+    assert [e.num for e in select.at_index(grid_elements, select.index_by_neighbors(grid_elements, [0, 1]))] == [5, 6]
+    with pytest.raises(exc.CandejarValueError):
+        select.index_by_neighbors(grid_elements, [15])
@@ -0,0 +1,55 @@
+import pytest
+
+from candejar.utilities.mixins import CompositeMixin, CompositeAttributeError
+
+
+class Part:
+    kind = "part"
+
+    def __init__(self, **kwargs):
+        vars(self).update(kwargs)
+
+
+@pytest.fixture
+def composite():
+    c = CompositeMixin()
+    c.add_component(Part(a=1, b=2))
+    c.add_component(Part(c=3))
+    return c
+
+
+def test_routing(composite):
+    assert (composite.a, composite.b, composite.c) == (1, 2, 3)
+    assert composite._component_routes["c"] is composite.components[1]
+    # class attributes of the components are found too
+    assert composite.kind == "part"
+    with pytest.raises(AttributeError):
+        composite.d
+
+
+def test_component_changes(composite):
+    composite.components[1].d = 4
+    assert composite.d == 4
+    del composite.components[0].a
+    with pytest.raises(AttributeError):
+        composite.a
+    composite.components.append(Part(e=5))
+    assert composite.e == 5
+
+
+def test_duplicates(composite):
+    composite.add_component(Part(a=6))
+    with pytest.raises(CompositeAttributeError):
+        composite.c
+    composite.components.pop()
+    composite.refresh_components()
+    assert composite.a == 1
+    # an attribute added to a component later is checked too
+    composite.components[1].a = 7
+    with pytest.raises(CompositeAttributeError):
+        composite.a
+
+
+def test_uninitialized():
+    c = CompositeMixin.__new__(CompositeMixin)
+    assert not hasattr(c, "a")
@@ -1,5 +1,7 @@
+import time
+
 import pytest
-from candejar.utilities.collections import KeyedChainView
+from candejar.utilities.collections import KeyedChainView, ConvertingList
 
 
 @pytest.fixture
@@ -99,3 +101,182 @@ def test_len_chain_list(keyed_chain_view):
     assert len(keyed_chain_view)==12
 
 
+
+def test_positions_empty_sections():
+    c = KeyedChainView(A=[], B=[1, 2], C=[], D=[3])
+    assert [c[i] for i in range(len(c))] == [1, 2, 3]
+    assert c.get_seq_idx(2) == (c.seq_map["D"], 0)
+
+
+def test_positions_invalidated(keyed_chain_view):
+    assert keyed_chain_view[3] == 4
+    keyed_chain_view.seq_map["A"].append(99)
+    assert len(keyed_chain_view) == 13 and keyed_chain_view[3] == 99
+    keyed_chain_view.seq_map["E"] = [100]
+    assert keyed_chain_view[-1] == 100
+    del keyed_chain_view.seq_map["A"]
+    assert keyed_chain_view[0] == 4
+    keyed_chain_view.seq_map = dict(X=[7])
+    assert len(keyed_chain_view) == 1 and keyed_chain_view[0] == 7
+
+
+def test_positions_converting_list():
+    class Ints(ConvertingList[int], converter=int):
+        pass
+
+    a, b = Ints([1, 2]), Ints([3])
+    c = KeyedChainView(dict(A=a, B=b))
+    table = c.positions()
+    assert c[2] == 3
+    assert c.positions() is table
+    a.append(5)
+    assert c.positions() is not table
+    assert c[2] == 5 and c[3] == 3
+
+
+class Counted:
+    """Counts equality comparisons."""
+    comparisons = 0
+
+    def __eq__(self, other):
+        Counted.comparisons += 1
+        return self is other
+
+    __hash__ = object.__hash__
+
+
+def counted_view(n, sections=10):
+    items = [Counted() for _ in range(n)]
+    size = n // sections
+    return KeyedChainView({f"S{k}": items[k * size:(k + 1) * size] for k in range(sections)}), items
+
+
+def test_search_methods(keyed_chain_view):
+    assert 5 in keyed_chain_view and 99 not in keyed_chain_view
+    assert keyed_chain_view.index(5) == 4
+    assert keyed_chain_view.index(5, 2, 6) == 4
+    with pytest.raises(ValueError):
+        keyed_chain_view.index(5, 5)
+    assert keyed_chain_view.count(5) == 1
+    assert keyed_chain_view.locate(5) == ("B", 1)
+    assert keyed_chain_view.owner(12) == "D"
+    keyed_chain_view.remove(5)
+    assert 5 not in keyed_chain_view and keyed_chain_view.index(6) == 4
+    with pytest.raises(ValueError):
+        keyed_chain_view.remove(5)
+
+
+def test_identity_search_no_comparisons():
+    view, items = counted_view(10_000)
+    Counted.comparisons = 0
+    assert all(item in view for item in items)
+    assert [view.index(item) for item in items] == list(range(len(items)))
+    assert view.owner(items[-1]) == "S9"
+    assert Counted.comparisons == 0
+
+
+def test_identity_index_follows_changes():
+    view, items = counted_view(100)
+    assert view.index(items[50]) == 50
+    view.seq_map["S5"][0] = new = Counted()
+    assert view.index(new) == 50
+    assert items[50] not in view
+
+
+@pytest.mark.parametrize("method", ["__contains__", "index", "owner"])
+def test_lookups_linear_time(method):
+    def total_time(n):
+        view, items = counted_view(n)
+        f = getattr(view, method)
+        f(items[0])
+        start = time.perf_counter()
+        for item in items:
+            f(item)
+        return time.perf_counter() - start
+
+    small, large = min(total_time(4_000) for _ in range(3)), min(total_time(32_000) for _ in range(3))
+    # 8x the lookups: about 8x the time when linear, 64x when quadratic
+    assert large / small < 24
+
+
+@pytest.mark.parametrize("s", [slice(None), slice(2, 10), slice(1, 11, 3), slice(None, None, -1), slice(10, 0, -4),
+                               slice(-5, None), slice(5, 5)])
+def test_slice_view(keyed_chain_view, s):
+    expected = list(range(1, 13))[s]
+    view = keyed_chain_view[s]
+    assert len(view) == len(expected)
+    assert list(view) == expected
+    assert [view[i] for i in range(len(view))] == expected
+    assert list(view[::2]) == expected[::2]
+
+
+def test_slice_view_write_through(keyed_chain_view):
+    view = keyed_chain_view[1:10:2]
+    view[0] = 20
+    view[1:3] = [40, 60]
+    assert keyed_chain_view.seq_map["A"] == [1, 20, 3]
+    assert keyed_chain_view.seq_map["B"] == [40, 5, 60]
+    keyed_chain_view[::6] = [0, 0]
+    assert keyed_chain_view[0] == keyed_chain_view[6] == 0
+    with pytest.raises(ValueError):
+        view[:] = [1]
+
+
+def test_slice_delete(keyed_chain_view):
+    del keyed_chain_view[2:8:2]
+    assert list(keyed_chain_view) == [1, 2, 4, 6, 8, 9, 10, 11, 12]
+
+
+def test_positions_follow_section_versions():
+    from candejar.candeobj.candeseq import NodesSection
+
+    a, b, other = (NodesSection([dict(num=n, x=0.0, y=0.0) for n in range(3)]) for _ in range(3))
+    view = KeyedChainView(dict(A=a, B=b))
+    table = view.positions()
+    # changes to lists that aren't in the view don't rebuild the table
+    other.append(dict(num=3, x=0.0, y=0.0))
+    assert view.positions() is table
+    b.append(dict(num=3, x=0.0, y=0.0))
+    assert view.positions() is not table and len(view) == 7
+
+
+@pytest.mark.parametrize("write", ["assign", "append elsewhere"])
+def test_lookups_mixed_with_writes_linear_time(write):
+    from candejar.candeobj.candeseq import NodesSection
+
+    def total_time(n):
+        size = n // 10
+        sections = {f"S{k}": NodesSection.from_columns(dict(num=range(size), x=[0.0] * size, y=[0.0] * size))
+                    for k in range(10)}
+        view, other = KeyedChainView(sections), NodesSection()
+        nodes, new = list(view), list(NodesSection.from_columns(dict(num=range(n), x=[1.0] * n, y=[0.0] * n)))
+        start = time.perf_counter()
+        for i, node in enumerate(nodes):
+            assert node in view
+            if write == "assign":
+                view[i] = node if i % 2 else new[i]
+            else:
+                other.append(new[i])
+        return time.perf_counter() - start
+
+    small, large = min(total_time(2_000) for _ in range(3)), min(total_time(16_000) for _ in range(3))
+    # 8x the lookups: about 8x the time when linear, 64x when quadratic
+    assert large / small < 24
+
+
+def test_section_identity_index():
+    from candejar.candeobj.candeseq import NodesSection
+
+    section = NodesSection([dict(num=num, x=0.0, y=0.0) for num in range(4)])
+    first, last = section[0], section[3]
+    ids = section.identity_index()
+    assert ids == {id(node): idx for idx, node in enumerate(section)}
+    # kept up to date by assignments and appends
+    section[-1] = dict(num=4, x=0.0, y=0.0)
+    section.append(last)
+    assert section.identity_index() is ids and ids[id(last)] == 4 and ids[id(section[3])] == 3
+    # rebuilt after other mutations, or when members are repeated
+    section.insert(0, last)
+    assert section.identity_index()[id(first)] == 1
+    section.append(first)
+    assert section.identity_index()[id(first)] == 1 and section.identity_index()[id(last)] == 0
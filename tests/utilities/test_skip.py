@@ -67,3 +67,35 @@ def test_sk_x(sk_x):
     assert skip.skippable_len(sk_x) == 0  # special len function also ignores items with skippable attribute
     assert list(skip.iter_skippable(sk_x)) == [1, 0]  # special iteration includes skippables
 
+
+def test_sk_x_lazy(SkipAttr_x):
+    """without a cached skip mask the items are checked one at a time, as they are iterated"""
+    from candejar import exc
+    Obj = type("Obj", (), {})
+    first = Obj()
+    first.x = 1
+    items = iter(SkipAttr_x([first, Obj()]))
+    assert next(items) is first
+    with pytest.raises(exc.CandeAttributeError):
+        next(items)
+
+
+
+def test_skip_state_follows_changes():
+    """the cached skip mask of a section follows skip state changes of its members"""
+    from candejar.candeobj.candeseq import NodesSection
+    section = NodesSection([dict(num=n, x=0.0, y=0.0) for n in range(1, 6)])
+    state = section.skip_state()
+    assert state.count == 0 and section.skip_state() is state
+    section[1].num = 7  # not a skip state change
+    assert section.skip_state() is state
+    section[1].num = skip.SkipInt(2)
+    section[3].num = skip.SkipInt(4)
+    assert section.skip_state().mask.tolist() == [False, True, False, True, False]
+    assert skip.skippable_len(section) == 3
+    assert [n.num for n in section] == [1, 3, 5]
+    assert [n.num for n in section[::-2]] == [5, 3, 1]
+    section[1].num = 2
+    assert skip.skippable_len(section) == 4
+    del section[0]
+    assert [n.num for n in section] == [2, 3, 5]